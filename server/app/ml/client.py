@@ -1,97 +1,170 @@
 import requests
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
 class HealthcareGANClient:
-    """Client for Healthcare GAN API v2.0.0"""
-    
-    def __init__(self, base_url: str = "http://localhost:8001"):
-        self.base_url = base_url.rstrip('/')
+    """Client for Healthcare GAN API v2.0.0
+
+    All calls go through one pooled requests.Session, so gateway requests reuse
+    keep-alive connections to the ML service instead of opening a new one each
+    time. The session is configured once in __init__ and never modified after,
+    so one client can be shared by all request threads (urllib3's connection
+    pool is thread-safe).
+    """
+
+    # Read timeouts in seconds, per endpoint (the connect timeout is shared)
+    TIMEOUTS = {
+        "health": 10,
+        "models/status": 30,
+        "validate": 30,
+        "train/gan": 60,
+        "predict": 30,
+        "generate": 60,
+        "explain-stats": 120,  # the insight model may still be loading on first use
+    }
+
+    # Transient upstream failures worth retrying
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = Config.ML_POOL_SIZE,
+                 max_retries: int = Config.ML_MAX_RETRIES, backoff_factor: float = Config.ML_RETRY_BACKOFF,
+                 connect_timeout: float = Config.ML_CONNECT_TIMEOUT):
+        self.base_url = (base_url or Config.ML_SERVICE_URL).rstrip('/')
         self.api_prefix = "/api/v1"  # NEW: API version prefix
-        self.timeout = 60
-    
+        self.connect_timeout = connect_timeout
+        self.session = self._build_session(pool_size, max_retries, backoff_factor)
+
+    @classmethod
+    def _build_session(cls, pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+        """Session with a bounded keep-alive pool and retries with exponential backoff"""
+        # Connection errors are retried for every method (the request never reached
+        # the service). Read errors and 5xx responses are retried only for idempotent
+        # methods, so a POST such as /train/gan is never submitted twice.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=cls.RETRY_STATUSES,
+            raise_on_status=False,  # hand the last response back to the caller
+        )
+        # pool_block: at most pool_size connections; extra threads wait for a free one
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _timeout(self, endpoint: str):
+        """(connect, read) timeout for an endpoint"""
+        return (self.connect_timeout, self.TIMEOUTS[endpoint])
+
     def _get_url(self, endpoint: str) -> str:
         """Helper to construct full URL with API prefix"""
         # Remove leading slash from endpoint if present
         endpoint = endpoint.lstrip('/')
         return f"{self.base_url}{self.api_prefix}/{endpoint}"
-    
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
     def health_check(self) -> Dict[str, Any]:
         """GET /health - Health Check (no /api/v1 prefix)"""
         try:
             # Health check is at root level, not under /api/v1
-            response = requests.get(f"{self.base_url}/health", timeout=10)
+            response = self.session.get(f"{self.base_url}/health", timeout=self._timeout("health"))
             response.raise_for_status()
             return {"status": "healthy", "details": response.json()}
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return {"status": "error", "error": str(e)}
-    
+
     def get_model_status(self) -> Dict[str, Any]:
         """GET /api/v1/models/status - Get Model Status"""
         try:
-            response = requests.get(self._get_url("models/status"), timeout=30)
+            response = self.session.get(self._get_url("models/status"), timeout=self._timeout("models/status"))
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             logger.error(f"Get model status failed: {e}")
             return {"success": False, "error": str(e)}
-    
+
     def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """GET /api/v1/validate - Validate Data"""
         try:
             # Validation might use query params or JSON body
-            response = requests.get(
-                self._get_url("validate"), 
+            response = self.session.get(
+                self._get_url("validate"),
                 params=data,  # Try as query params first
-                timeout=30
+                timeout=self._timeout("validate")
             )
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             logger.error(f"Validate data failed: {e}")
             return {"success": False, "error": str(e)}
-    
+
     def train_models(self, training_data: Dict[str, Any]) -> Dict[str, Any]:
         """POST /api/v1/train - Train Models"""
         try:
-            response = requests.post(
-                self._get_url("train/gan"), 
-                json=training_data, 
-                timeout=self.timeout
+            response = self.session.post(
+                self._get_url("train/gan"),
+                json=training_data,
+                timeout=self._timeout("train/gan")
             )
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             logger.error(f"Train models failed: {e}")
             return {"success": False, "error": str(e)}
-    
+
     def predict_diabetes(self, prediction_data: Dict[str, Any]) -> Dict[str, Any]:
         """POST /api/v1/predict - Predict Diabetes"""
         try:
-            response = requests.post(
-                self._get_url("predict"), 
-                json=prediction_data, 
-                timeout=30
+            response = self.session.post(
+                self._get_url("predict"),
+                json=prediction_data,
+                timeout=self._timeout("predict")
             )
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             logger.error(f"Predict diabetes failed: {e}")
             return {"success": False, "error": str(e)}
-    
+
     def generate_synthetic_data(self, generation_params: Dict[str, Any]) -> Dict[str, Any]:
         """POST /api/v1/generate - Generate Synthetic Data"""
         try:
-            response = requests.post(
-                self._get_url("generate"), 
-                json=generation_params, 
-                timeout=self.timeout
+            response = self.session.post(
+                self._get_url("generate"),
+                json=generation_params,
+                timeout=self._timeout("generate")
             )
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except Exception as e:
             logger.error(f"Generate synthetic data failed: {e}")
             return {"success": False, "error": str(e)}
+
+    def explain_stats(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /explain-stats - Explain Dataset Statistics (no /api/v1 prefix)
+
+        The ML service's response body and status code are returned as-is
+        ("data" and "status_code"), so the gateway can pass them through.
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/explain-stats",
+                json=stats,
+                timeout=self._timeout("explain-stats")
+            )
+            return {"success": response.ok, "status_code": response.status_code, "data": response.json()}
+        except Exception as e:
+            logger.error(f"Explain stats failed: {e}")
+            return {"success": False, "error": str(e)}
@@ -1,7 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app
 import uuid
 import logging
-import requests
 try:
     from app.ml.client import HealthcareGANClient
 except ImportError:
@@ -15,7 +14,7 @@ logger = logging.getLogger(__name__)
 # Create Healthcare GAN blueprint
 healthcare_gan_bp = Blueprint('healthcare_gan', __name__, url_prefix='/api/healthcare-gan')
 
-# Create client instance
+# Create client instance (one pooled session shared by every request thread)
 gan_client = HealthcareGANClient()
 
 @healthcare_gan_bp.route('/health', methods=['GET'])
@@ -163,7 +162,8 @@ def service_status():
                 "train": "/api/healthcare-gan/train",
                 "predict": "/api/healthcare-gan/predict",
                 "generate": "/api/healthcare-gan/generate",
-                "status": "/api/healthcare-gan/status"
+                "status": "/api/healthcare-gan/status",
+                "explain_stats": "/api/healthcare-gan/explain-stats"
             }
         }), 200
         
@@ -199,12 +199,15 @@ def explain_stats():
     try:
         stats = request.get_json()
 
-        response = requests.post(
-            "http://localhost:8001/explain-stats",
-            json=stats
-        )
+        result = gan_client.explain_stats(stats)
+        if "status_code" in result:
+            # Pass the ML service's answer through unchanged
+            return jsonify(result["data"]), result["status_code"]
 
-        return jsonify(response.json()), response.status_code
+        return jsonify({
+            "status": "error",
+            "message": result["error"]
+        }), 502
 
     except Exception as e:
         return jsonify({
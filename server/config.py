@@ -52,6 +52,13 @@ class Config:
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
     LOG_FILE = os.environ.get('LOG_FILE') or 'app.log'
     
+    # ML Service (Healthcare GAN) Client Configuration
+    ML_SERVICE_URL = os.environ.get('ML_SERVICE_URL') or 'http://localhost:8001'
+    ML_POOL_SIZE = int(os.environ.get('ML_POOL_SIZE') or 10)  # keep-alive connections to the ML service
+    ML_MAX_RETRIES = int(os.environ.get('ML_MAX_RETRIES') or 3)
+    ML_RETRY_BACKOFF = float(os.environ.get('ML_RETRY_BACKOFF') or 0.5)  # seconds, doubled per retry
+    ML_CONNECT_TIMEOUT = float(os.environ.get('ML_CONNECT_TIMEOUT') or 3)
+    
     # Application Configuration
     TIMEZONE = os.environ.get('TIMEZONE') or 'UTC'
     PAGINATION_PER_PAGE = int(os.environ.get('PAGINATION_PER_PAGE') or 20)
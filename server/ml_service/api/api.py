@@ -555,19 +555,26 @@
 #             diversity_scores.append(entropy / max_entropy)
     
 #     return round(np.mean(diversity_scores), 4)
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+import json
 import logging
+import threading
 import traceback
 from datetime import datetime
+from typing import List
 
 from schemas import (
-    GANTrainingRequest, GANTrainingResponse,
-    DataGenerationRequest, GenerationResponse
+    GANTrainingRequest, TrainingJobResponse, TrainingJobMetricsResponse,
+    DataGenerationRequest, GenerationResponse,
+    StreamingGenerationRequest, StreamFormatEnum
 )
-from gan_trainer import GANTrainer
-from generate import DiabetesDataGenerator
-from config import DEFAULT_TIME_SERIES_PATH, DEFAULT_TABULAR_PATH
+from training_jobs import TrainingJobManager, QueueFullError
+from config import DEFAULT_TIME_SERIES_PATH, DEFAULT_TABULAR_PATH, GENERATE_MAX_CONCURRENT, STREAM_MAX_CONCURRENT, \
+    TRAINING_MAX_QUEUED_JOBS, TRAINING_MAX_FINISHED_JOBS, RETRY_AFTER_SECONDS, TRAINING_RETRY_AFTER_SECONDS
+from executors import EndpointLimiter, run_inference, iterate_in_inference_pool
+import lifecycle
 
 logger = logging.getLogger(__name__)
 
@@ -575,61 +582,117 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Global instances
-gan_trainer_instance = GANTrainer()
-generator = DiabetesDataGenerator()
+def _build_generator():
+    # Imported here: generate pulls in torch, which alone takes longer than the rest of startup
+    from generate import DiabetesDataGenerator
+    return DiabetesDataGenerator()
+
+# Built on first use or by the background warm-up (see lifecycle)
+generator_component = lifecycle.register("gan_generator", _build_generator)
+training_jobs = TrainingJobManager(max_pending=TRAINING_MAX_QUEUED_JOBS, max_finished=TRAINING_MAX_FINISHED_JOBS)
+
+# Concurrent requests admitted per heavy endpoint (see executors); the rest get 429
+generation_limiter = EndpointLimiter("generation", GENERATE_MAX_CONCURRENT, RETRY_AFTER_SECONDS)
+stream_limiter = EndpointLimiter("streaming generation", STREAM_MAX_CONCURRENT, RETRY_AFTER_SECONDS)
+
+def _reload_after_training(job: dict) -> None:
+    # Hot-swap freshly trained weights into the serving generator once a job completes;
+    # a generator that is not built yet loads them on first use anyway. The reload
+    # (load, compile, quantize, warm-up) runs on its own thread: this callback is
+    # called on the training dispatcher, which should start the next job right away.
+    if generator_component.loaded:
+        threading.Thread(
+            target=generator_component.get().reload_models, name="model-reload", daemon=True
+        ).start()
+
+training_jobs.add_completion_callback(_reload_after_training)
 
 # ==================== GAN TRAINING (ONLY ENDPOINT) ====================
-@router.post("/train/gan", response_model=GANTrainingResponse)
+def _job_response(job: dict) -> TrainingJobResponse:
+    return TrainingJobResponse(training_metrics=job.get("history"), **job)
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job not found: {job_id}")
+    return job
+
+@router.post("/train/gan", response_model=TrainingJobResponse, status_code=202)
 async def train_gan_models(request: GANTrainingRequest):
     """
-    Train GAN models for synthetic data generation using GitHub datasets.
-    This is the ONLY training endpoint available.
+    Queue GAN training on the GitHub datasets. This is the ONLY training endpoint available.
+
+    Training runs in a background worker process, one job at a time; poll
+    /train/jobs/{job_id} for progress. Dataset fetch failures surface as a
+    failed job with the error message.
     """
+    if request.parallel_families and request.world_size > 1:
+        raise HTTPException(status_code=400, detail="parallel_families cannot be combined with world_size > 1")
+    if request.compile_models and (request.parallel_families or request.world_size > 1):
+        raise HTTPException(status_code=400, detail="compile_models is only supported for sequential training")
+
     try:
         logger.info("=" * 80)
-        logger.info("Starting GAN model training...")
-        logger.info(f"Epochs: {request.epochs} | Batch size: {request.batch_size}")
+        logger.info("Queueing GAN model training...")
+        logger.info(f"Epochs: {request.epochs} | Batch size: {request.batch_size} | "
+                    f"Parallel families: {request.parallel_families} | World size: {request.world_size}")
         logger.info(f"Using GitHub dataset URLs (no local fallback)")
         logger.info("=" * 80)
 
         # ALWAYS use GitHub URLs (no local override)
-        ts_path = DEFAULT_TIME_SERIES_PATH
-        tab_path = DEFAULT_TABULAR_PATH
-
-        # Train GAN models
-        history = gan_trainer_instance.train_gan(
-            time_series_path=ts_path,
-            tabular_path=tab_path,
-            epochs=request.epochs
-        )
-
-        return GANTrainingResponse(
-            status="success",
-            message="GAN model training completed successfully",
-            epochs_completed=request.epochs,
-            training_metrics=history,
-            model_timestamp=datetime.now().isoformat()
+        job = training_jobs.submit({
+            "time_series_path": DEFAULT_TIME_SERIES_PATH,
+            "tabular_path": DEFAULT_TABULAR_PATH,
+            "epochs": request.epochs,
+            "batch_size": request.batch_size,
+            "parallel_families": request.parallel_families,
+            "resume": request.resume,
+            "world_size": request.world_size,
+            "precision": request.precision.value,
+            "compile_mode": "compile" if request.compile_models else "eager"
+        })
+        return _job_response(job)
+
+    except QueueFullError as e:
+        logger.warning(f"[WARNING] Rejecting GAN training request: {str(e)}")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Training queue is full ({str(e)}); retry later",
+            headers={"Retry-After": str(TRAINING_RETRY_AFTER_SECONDS)}
         )
-
-    except RuntimeError as e:
-        # Dataset loading error (GitHub fetch failed)
-        error_msg = str(e)
-        if "Failed to load dataset from GitHub" in error_msg:
-            logger.error(f"Dataset fetch error: {error_msg}")
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "status": "error",
-                    "message": "Failed to load dataset from GitHub",
-                    "url": ts_path if "time series" in error_msg.lower() else tab_path
-                }
-            )
-        raise HTTPException(status_code=500, detail=f"Training failed: {error_msg}")
-    
     except Exception as e:
-        logger.error(f"GAN training failed: {str(e)}")
+        logger.error(f"Failed to queue GAN training: {str(e)}")
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"GAN training failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue GAN training: {str(e)}")
+
+@router.get("/train/jobs", response_model=List[TrainingJobResponse])
+async def list_training_jobs():
+    """List all training jobs, oldest first."""
+    return [_job_response(job) for job in training_jobs.list_jobs()]
+
+@router.get("/train/jobs/{job_id}", response_model=TrainingJobResponse)
+async def get_training_job(job_id: str):
+    """Get status and latest losses of a training job."""
+    return _job_response(_get_job_or_404(job_id))
+
+@router.get("/train/jobs/{job_id}/metrics", response_model=TrainingJobMetricsResponse)
+async def get_training_job_metrics(job_id: str, since: int = Query(0, ge=0)):
+    """Per-epoch losses of a training job, optionally only those after epoch `since`."""
+    job = _get_job_or_404(job_id)
+    return TrainingJobMetricsResponse(
+        job_id=job_id,
+        status=job["status"],
+        epochs_completed=job["epochs_completed"],
+        metrics=training_jobs.metrics(job_id, since_epoch=since) or []
+    )
+
+@router.post("/train/jobs/{job_id}/cancel", response_model=TrainingJobResponse)
+async def cancel_training_job(job_id: str):
+    """Cancel a queued job, or stop a running one at its next epoch boundary."""
+    job = training_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job not found: {job_id}")
+    return _job_response(job)
 
 # ==================== REJECT ALL OTHER TRAINING ROUTES ====================
 @router.post("/train")
@@ -654,51 +717,162 @@ async def generate_synthetic_data(request: DataGenerationRequest):
     try:
         logger.info(f"Generating {request.num_samples} synthetic samples...")
 
-        # Check if GAN models are loaded
-        if not generator.models_loaded:
-            logger.error("GAN models not available for generation")
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "status": "error",
-                    "message": "GAN models not available. Please train using /api/v1/train/gan first."
-                }
+        async with generation_limiter.slot():
+            generator = await generator_component.aget()
+
+            # Check if GAN models are loaded
+            if not generator.models_loaded:
+                logger.error("GAN models not available for generation")
+                raise HTTPException(
+                    status_code=503,
+                    detail={
+                        "status": "error",
+                        "message": "GAN models not available. Please train using /api/v1/train/gan first."
+                    }
+                )
+
+            # Generate synthetic data using GAN, on the inference pool so the event loop stays free
+            result = await run_inference(
+                generator.generate_synthetic_data,
+                num_samples=request.num_samples,
+                diabetes_ratio=request.diabetes_ratio,
+                hypertension_ratio=request.hypertension_ratio,
+                seed=request.seed,
+                output_format=request.output_format.value,
+                compression=request.compression,
+                row_group_size=request.row_group_size
             )
 
-        # Generate synthetic data using GAN
-        result = generator.generate_synthetic_data(
-            num_samples=request.num_samples,
-            diabetes_ratio=request.diabetes_ratio,
-            hypertension_ratio=request.hypertension_ratio
-        )
-
         return GenerationResponse(
             status="success",
             message=f"Successfully generated {request.num_samples} synthetic samples using GAN",
             num_generated=request.num_samples,
             timeseries_file=result['timeseries_file'],
             tabular_file=result['tabular_file'],
+            output_format=result['output_format'],
             preview=result['preview']
         )
 
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.error(f"Invalid generation options: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid generation options: {str(e)}")
     except Exception as e:
         logger.error(f"Data generation failed: {str(e)}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Data generation failed: {str(e)}")
 
+# ==================== STREAMING DATA GENERATION ====================
+@router.post("/generate/stream")
+async def stream_synthetic_data(request: StreamingGenerationRequest):
+    """
+    Stream synthetic diabetes data as it is generated (NDJSON or CSV).
+    Memory is bounded by one batch, so cohorts of millions of patients are supported.
+    """
+    logger.info(f"Streaming {request.num_samples} synthetic samples "
+                f"({request.format.value}, batch size {request.batch_size})...")
+
+    # Held until the stream finishes (or the client goes away), not just until the response starts
+    release = stream_limiter.acquire()
+    try:
+        generator = await generator_component.aget()
+    except BaseException:
+        release()
+        raise
+    if not generator.models_loaded:
+        release()
+        logger.error("GAN models not available for generation")
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "status": "error",
+                "message": "GAN models not available. Please train using /api/v1/train/gan first."
+            }
+        )
+
+    batches = generator.iter_synthetic_batches(
+        num_samples=request.num_samples,
+        diabetes_ratio=request.diabetes_ratio,
+        hypertension_ratio=request.hypertension_ratio,
+        seed=request.seed,
+        batch_size=request.batch_size
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if request.format == StreamFormatEnum.csv:
+        body = _csv_chunks(batches, request.table.value)
+        media_type = "text/csv"
+        filename = f"synthetic_{request.table.value}_GAN_{timestamp}_{request.num_samples}.csv"
+    else:
+        body = _ndjson_chunks(batches)
+        media_type = "application/x-ndjson"
+        filename = f"synthetic_GAN_{timestamp}_{request.num_samples}.ndjson"
+
+    # Each chunk is produced on the inference pool; the slot is released when the
+    # body finishes or is closed, or at the latest once the response is done
+    return StreamingResponse(
+        _release_when_done(iterate_in_inference_pool(_log_stream_errors(body, request.num_samples)), release),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(release)
+    )
+
+async def _release_when_done(chunks, release):
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        release()
+
+def _ndjson_chunks(batches):
+    """One JSON object per patient: tabular fields plus its time series readings."""
+    for tabular_df, timeseries_df in batches:
+        seq_len = len(timeseries_df) // len(tabular_df)
+        timestamps = timeseries_df['timestamp'].iloc[:seq_len].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+        rbs_values = timeseries_df['rbs_value'].to_numpy().reshape(len(tabular_df), seq_len).tolist()
+
+        lines = []
+        for record, readings in zip(tabular_df.to_dict('records'), rbs_values):
+            record['timeseries'] = [
+                {'timestamp': ts, 'rbs_value': value} for ts, value in zip(timestamps, readings)
+            ]
+            lines.append(json.dumps(record))
+        yield '\n'.join(lines) + '\n'
+
+def _csv_chunks(batches, table: str):
+    """The requested table in the same CSV layout as /generate, header on the first chunk only."""
+    header = True
+    for tabular_df, timeseries_df in batches:
+        df = tabular_df if table == 'tabular' else timeseries_df
+        yield df.to_csv(index=False, header=header)
+        header = False
+
+def _log_stream_errors(chunks, num_samples: int):
+    """Log failures that happen after the response headers were already sent."""
+    try:
+        yield from chunks
+        logger.info(f"[OK] Streamed {num_samples} synthetic samples using GAN")
+    except Exception as e:
+        logger.error(f"Streaming generation failed: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise
+
 # ==================== MODEL STATUS ====================
 @router.get("/models/status")
 async def get_model_status():
-    """Get current GAN model training status."""
-    try:
-        gan_models_loaded = generator.models_loaded
+    """
+    Get current GAN model training status.
 
-        return {
-            "status": "success",
-            "gan_models_loaded": gan_models_loaded,
-            "generation_method": "GAN" if gan_models_loaded else "Not Available",
+    Never triggers the generator load: on a replica that is still warming up it
+    reports the component as not loaded (as /ready does) and returns at once.
+    """
+    try:
+        common = {
+            "component": generator_component.status(),
+            "request_limits": {
+                limiter.name: limiter.stats() for limiter in (generation_limiter, stream_limiter)
+            },
             "training_endpoint": "/api/v1/train/gan",
             "last_updated": datetime.now().isoformat(),
             "dataset_paths": {
@@ -706,14 +880,75 @@ async def get_model_status():
                 "tabular": DEFAULT_TABULAR_PATH
             }
         }
+        if not generator_component.loaded:
+            return {
+                "status": "loading" if generator_component.loading else "not_loaded",
+                "gan_models_loaded": False,
+                "generation_method": "Not Available",
+                **common
+            }
+
+        generator = await generator_component.aget()
+        gan_models_loaded = generator.models_loaded
+
+        return {
+            "status": "success",
+            "gan_models_loaded": gan_models_loaded,
+            "generation_method": "GAN" if gan_models_loaded else "Not Available",
+            "model_version": generator.model_version,
+            "models_loaded_at": generator.models_loaded_at,
+            "model_set": generator.model_set,
+            "models_current": generator.models_current,
+            "reloading": generator.reloading,
+            "inference_backend": generator.backend,
+            "precision": generator.precision,
+            "compile_mode": generator.compile_mode,
+            "compiled_generators": sorted(generator.gan_trainer.inference_modules),
+            "quantization": generator.quantization if generator.quantized else "none",
+            **common
+        }
     except Exception as e:
         logger.error(f"Status check failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Status check failed: {str(e)}")
 
+@router.post("/models/reload", status_code=202)
+async def reload_models(background_tasks: BackgroundTasks):
+    """
+    Reload generator weights from disk without a restart.
+
+    The checkpoint is loaded and warmed up in the background and then swapped in;
+    generation keeps using the current weights until the swap. If the published
+    model set on disk is already being served, nothing is reloaded (200).
+    """
+    generator = await generator_component.aget()
+    if generator.reloading:
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
+    if generator.models_current:
+        return JSONResponse(status_code=200, content={
+            "status": "current",
+            "message": "Models are already current; nothing to reload",
+            "current_model_version": generator.model_version,
+            "model_set": generator.model_set
+        })
+
+    background_tasks.add_task(generator.reload_models)
+    return {
+        "status": "accepted",
+        "message": "Model reload started",
+        "current_model_version": generator.model_version
+    }
+
 # ==================== HEALTH CHECK ====================
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness: the process is up and serving. Never waits on model loading."""
     return {"status": "healthy"}
 
+@router.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once the required components are loaded, 503 while they are still loading."""
+    report = lifecycle.readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503,
+                        content={"status": "ready" if report["ready"] else "loading", **report})
+
 
@@ -0,0 +1,544 @@
+"""
+Micro-benchmarks for the ML service hot paths.
+
+Run from the ml_service directory:
+
+    python benchmark.py denormalize --sizes 1000 10000 100000
+    python benchmark.py conditions --sizes 1000 10000 100000
+    python benchmark.py writers --samples 100000
+    python benchmark.py preprocess --sizes 1000 10000 100000
+    python benchmark.py batching --batch-sizes 32 256 1024
+    python benchmark.py train-step --batch-sizes 16 32 128
+    python benchmark.py precision --batch-sizes 32 256 1024
+    python benchmark.py compile --batch-sizes 1 100 1000
+    python benchmark.py quantize --batch-sizes 100 1000
+    python benchmark.py load --repeats 5
+    python benchmark.py explain --concurrency 1 4 16
+
+Each benchmark compares the current implementation against the per-patient
+reference it replaced (tests/reference.py, shared with the equivalence tests),
+so the speedup can be re-measured on any host.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from config import SEQ_LENGTH, LATENT_DIM, COND_FEATURES
+from data_utils import DiabetesDataPreprocessor, TensorBatchIterator
+from gan_trainer import GANTrainer
+from generate import DiabetesDataGenerator, get_writer
+from tests.reference import (
+    reference_conditions, reference_denormalize, reference_preprocess, merged_training_frame, vectorized_denormalize
+)
+
+
+def _timed(fn, *args, **kwargs):
+    """Run fn once and return (result, elapsed_seconds)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# ==================== DENORMALIZATION ====================
+def bench_denormalize(sizes, seed: int = 0):
+    """Compare per-patient vs vectorized denormalization of raw generator outputs."""
+    # Denormalization does not touch the networks, so skip model loading
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+
+    print(f"{'patients':>10} {'loop (s)':>10} {'vector (s)':>11} {'speedup':>9} {'max |diff|':>11} {'label mismatches':>17}")
+    for n in sizes:
+        rng = np.random.default_rng(seed)
+        tabular = rng.random((n, 9), dtype=np.float32)
+        timeseries = rng.random((n, SEQ_LENGTH, 1), dtype=np.float32)
+        conditions = rng.random((n, 3))
+
+        np.random.seed(seed)
+        (ref_tab, ref_ts), loop_time = _timed(reference_denormalize, tabular, timeseries, conditions)
+        np.random.seed(seed)
+        (vec_tab, vec_ts), vec_time = _timed(vectorized_denormalize, generator, tabular, timeseries, conditions)
+
+        # Values only differ where np.round and round() break .x5 ties differently
+        numeric = ['age', 'bmi', 'average_rbs', 'hba1c', 'respiratory_rate', 'heart_rate', 'spo2']
+        max_diff = max(
+            np.abs(ref_tab[numeric].to_numpy() - vec_tab[numeric].to_numpy()).max(),
+            np.abs(ref_ts['rbs_value'].to_numpy() - vec_ts['rbs_value'].to_numpy()).max()
+        )
+        mismatches = int((ref_tab[['diabetes', 'bp_status']].to_numpy() != vec_tab[['diabetes', 'bp_status']].to_numpy()).sum())
+        print(f"{n:>10} {loop_time:>10.3f} {vec_time:>11.3f} {loop_time / vec_time:>8.1f}x {max_diff:>11.3f} {mismatches:>17}")
+
+
+# ==================== CONDITION SAMPLING ====================
+def bench_conditions(sizes, seed: int = 0, batch_size: int = 100):
+    """Compare per-row vs vectorized condition sampling over a batched cohort."""
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+
+    print(f"{'patients':>10} {'loop (s)':>10} {'vector (s)':>11} {'speedup':>9}")
+    for n in sizes:
+        def loop():
+            for start in range(0, n, batch_size):
+                reference_conditions(min(batch_size, n - start), 0.5)
+
+        def vectorized():
+            rng = np.random.default_rng(seed)
+            buffer = torch.empty((n, len(COND_FEATURES)), dtype=torch.float32)
+            for start in range(0, n, batch_size):
+                current = min(batch_size, n - start)
+                generator._generate_conditions(current, 0.5, rng, out=buffer[start:start + current])
+
+        _, loop_time = _timed(loop)
+        _, vec_time = _timed(vectorized)
+        print(f"{n:>10} {loop_time:>10.3f} {vec_time:>11.3f} {loop_time / vec_time:>8.1f}x")
+
+
+# ==================== OUTPUT WRITERS ====================
+WRITER_CONFIGS = [
+    ('csv', None),
+    ('csv', 'gzip'),
+    ('parquet', 'snappy'),
+    ('parquet', 'zstd'),
+    ('feather', 'lz4'),
+    ('feather', 'zstd'),
+    ('npz', 'none'),
+    ('npz', 'zip'),
+]
+
+
+def bench_writers(num_samples: int, seed: int = 0, row_group_size=None):
+    """Write time and on-disk size of each output format for one synthetic cohort."""
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+    rng = np.random.default_rng(seed)
+    tabular_df, timeseries_df = vectorized_denormalize(
+        generator,
+        rng.random((num_samples, 9), dtype=np.float32),
+        rng.random((num_samples, SEQ_LENGTH, 1), dtype=np.float32),
+        rng.random((num_samples, 3))
+    )
+
+    print(f"{num_samples} patients ({len(timeseries_df)} readings)")
+    print(f"{'format':>10} {'codec':>8} {'write (s)':>10} {'size (MB)':>10} {'time vs csv':>12} {'size vs csv':>12}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for output_format, compression in WRITER_CONFIGS:
+            try:
+                writer = get_writer(output_format, compression, row_group_size)
+            except RuntimeError as e:
+                print(f"{output_format:>10} {str(compression):>8}  skipped: {e}")
+                continue
+
+            tab_path = os.path.join(tmpdir, f"tabular_{output_format}_{compression}{writer.suffix}")
+            ts_path = os.path.join(tmpdir, f"timeseries_{output_format}_{compression}{writer.suffix}")
+            start = time.perf_counter()
+            writer.write(tabular_df, tab_path)
+            writer.write(timeseries_df, ts_path)
+            elapsed = time.perf_counter() - start
+
+            size = os.path.getsize(tab_path) + os.path.getsize(ts_path)
+            baseline = baseline or (elapsed, size)
+            print(f"{output_format:>10} {str(compression):>8} {elapsed:>10.3f} {size / 1e6:>10.2f} "
+                  f"{elapsed / baseline[0]:>11.2f}x {size / baseline[1]:>11.2f}x")
+
+
+# ==================== TRAINING PREPROCESSING ====================
+def bench_preprocess(sizes, seed: int = 0):
+    """Compare the groupby loop vs the vectorized preprocess_for_model."""
+    preprocessor = DiabetesDataPreprocessor.__new__(DiabetesDataPreprocessor)
+
+    print(f"{'patients':>10} {'readings':>10} {'loop (s)':>10} {'vector (s)':>11} {'speedup':>9} {'identical':>10}")
+    for n in sizes:
+        data = merged_training_frame(n, seed)
+        reference, loop_time = _timed(reference_preprocess, data)
+        vectorized, vec_time = _timed(preprocessor.preprocess_for_model, data)
+        identical = all(torch.equal(a, b) for a, b in zip(reference, vectorized))
+        print(f"{n:>10} {len(data):>10} {loop_time:>10.3f} {vec_time:>11.3f} "
+              f"{loop_time / vec_time:>8.1f}x {str(identical):>10}")
+
+
+# ==================== TRAINING BATCHES ====================
+def bench_batching(batch_sizes, num_patients: int = 10000, epochs: int = 5, seed: int = 0):
+    """Per-epoch batching cost: DataLoader over a TensorDataset vs TensorBatchIterator."""
+    torch.manual_seed(seed)
+    time_series = torch.rand(num_patients, SEQ_LENGTH, 1)
+    tabular = torch.rand(num_patients, 9)
+    conditions = torch.rand(num_patients, len(COND_FEATURES))
+    preprocessor = DiabetesDataPreprocessor.__new__(DiabetesDataPreprocessor)
+
+    def run(batches):
+        for _ in range(epochs):
+            for _ in batches:
+                pass
+
+    print(f"{num_patients} patients, {epochs} epochs")
+    print(f"{'batch':>8} {'loader (ms/ep)':>15} {'iterator (ms/ep)':>17} {'speedup':>9}")
+    for batch_size in batch_sizes:
+        loader = preprocessor.create_dataloader(time_series, tabular, conditions, conditions, batch_size)
+        iterator = TensorBatchIterator(time_series, tabular, conditions, batch_size=batch_size)
+        _, loader_time = _timed(run, loader)
+        _, iterator_time = _timed(run, iterator)
+        print(f"{batch_size:>8} {loader_time / epochs * 1000:>15.2f} {iterator_time / epochs * 1000:>17.2f} "
+              f"{loader_time / iterator_time:>8.1f}x")
+
+
+# ==================== TRAINING STEP ====================
+def bench_train_step(batch_sizes, steps: int = 20, log_interval: int = 10, seed: int = 0):
+    """
+    Step time with per-step host reads vs on-device loss accumulation.
+
+    The reference reads every loss back with .item() after each step (12 reads
+    with n_critic=5) and recomputes the 10-step progress means in Python, as the
+    loop did before. On CPU this matches the old cost; on CUDA the old reads also
+    stalled the stream mid-step, so the real gain there is larger.
+    """
+    torch.manual_seed(seed)
+    trainer = GANTrainer()
+    optimizers = trainer.make_optimizers()
+    losses_per_step = torch.tensor([trainer.n_critic, 1, trainer.n_critic, 1, 1], dtype=torch.float64)
+
+    def per_step_sync(batch):
+        lists = [[] for _ in GANTrainer.LOSS_NAMES]
+        for _ in range(steps):
+            step_losses = trainer._train_step(*batch, optimizers)
+            for values, loss, count in zip(lists, step_losses, (trainer.n_critic, 1, trainer.n_critic, 1, 1)):
+                values.extend(loss.item() / count for _ in range(count))
+            {label: f'{np.mean(values[-10:]):.4f}' for label, values in zip(GANTrainer.LOSS_LABELS, lists)}
+
+    def accumulated(batch):
+        window_sums = torch.zeros(len(GANTrainer.LOSS_NAMES), dtype=torch.float64)
+        epoch_sums = torch.zeros_like(window_sums)
+        for step in range(1, steps + 1):
+            step_losses = trainer._train_step(*batch, optimizers)
+            epoch_sums += step_losses
+            window_sums += step_losses
+            if step % log_interval == 0:
+                (window_sums / (losses_per_step * log_interval)).tolist()
+                window_sums.zero_()
+        (epoch_sums / (losses_per_step * steps)).tolist()
+
+    print(f"{steps} steps per run, log interval {log_interval}")
+    print(f"{'batch':>8} {'per-step (ms)':>14} {'accumulated (ms)':>17} {'speedup':>9}")
+    for batch_size in batch_sizes:
+        batch = (torch.rand(batch_size, SEQ_LENGTH, 1), torch.rand(batch_size, 9),
+                 torch.rand(batch_size, len(COND_FEATURES)))
+        trainer._train_step(*batch, optimizers)  # warm-up
+        _, sync_time = _timed(per_step_sync, batch)
+        _, accumulated_time = _timed(accumulated, batch)
+        print(f"{batch_size:>8} {sync_time / steps * 1000:>14.2f} {accumulated_time / steps * 1000:>17.2f} "
+              f"{sync_time / accumulated_time:>8.2f}x")
+
+
+# ==================== PRECISION ====================
+def bench_precision(batch_sizes, steps: int = 10, samples: int = 4096, seed: int = 0):
+    """
+    bf16 autocast vs fp32: output quality, generation throughput and training step time.
+
+    Uses the trained models if present, otherwise freshly initialized ones (the
+    timings are the same; the quality numbers are only meaningful for trained weights).
+    """
+    from scipy import stats
+
+    torch.manual_seed(seed)
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+    generator.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    generator.gan_trainer = GANTrainer()
+    if not generator.gan_trainer.load_models():
+        for model in (generator.gan_trainer.tab_gen, generator.gan_trainer.ts_gen):
+            model.eval()
+    trainer = generator.gan_trainer
+
+    report = generator.precision_report(precision='bf16', samples=samples, seed=seed)
+    conditions = generator._generate_conditions(samples, 0.5, rng=np.random.default_rng(seed))
+    outputs = {}
+    for precision in ('fp32', 'bf16'):
+        tab, ts = generator._run_generators(
+            conditions, torch.Generator(device=generator.device).manual_seed(seed), precision=precision
+        )
+        outputs[precision] = np.concatenate([tab, ts.reshape(samples, -1)], axis=1)
+    max_ks = max(stats.ks_2samp(outputs['fp32'][:, i], outputs['bf16'][:, i]).statistic
+                 for i in range(outputs['fp32'].shape[1]))
+    print(f"Quality over {samples} samples: max mean drift {report['max_mean_drift']:.5f}, "
+          f"max std drift {report['max_std_drift']:.5f}, max |diff| {report['max_abs_error']:.5f}, "
+          f"max KS statistic {max_ks:.4f}")
+
+    print(f"{'batch':>8} {'gen fp32 (/s)':>14} {'gen bf16 (/s)':>14} {'step fp32 (ms)':>15} {'step bf16 (ms)':>15}")
+    for batch_size in batch_sizes:
+        batch_conditions = conditions[:batch_size] if batch_size <= samples else \
+            generator._generate_conditions(batch_size, 0.5)
+        batch = (torch.rand(batch_size, SEQ_LENGTH, 1), torch.rand(batch_size, 9),
+                 torch.rand(batch_size, len(COND_FEATURES)))
+        row = []
+        for kind in ('gen', 'step'):
+            for precision in ('fp32', 'bf16'):
+                if kind == 'gen':
+                    generator._run_generators(batch_conditions, precision=precision)  # warm-up
+                    _, elapsed = _timed(lambda: [generator._run_generators(batch_conditions, precision=precision)
+                                                 for _ in range(steps)])
+                    row.append(batch_size * steps / elapsed)
+                else:
+                    trainer.precision = precision
+                    optimizers = trainer.make_optimizers()
+                    trainer._train_step(*batch, optimizers)  # warm-up
+                    _, elapsed = _timed(lambda: [trainer._train_step(*batch, optimizers) for _ in range(steps)])
+                    row.append(elapsed / steps * 1000)
+        print(f"{batch_size:>8} {row[0]:>14.0f} {row[1]:>14.0f} {row[2]:>15.2f} {row[3]:>15.2f}")
+
+
+# ==================== COMPILATION ====================
+def bench_compile(batch_sizes, repeats: int = 20, seed: int = 0):
+    """Generator inference time: eager vs torch.compile vs TorchScript trace + freeze (fp32)."""
+    torch.manual_seed(seed)
+    trainer = GANTrainer()
+    trainer.tab_gen.eval()
+    trainer.ts_gen.eval()
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+    generator.device = trainer.device
+
+    def run(conditions):
+        for _ in range(repeats):
+            generator._run_generators(conditions, trainer=trainer)
+
+    results, compile_times = {}, {}
+    for mode in ('eager', 'compile', 'script'):
+        generator.compile_mode = mode
+        _, compile_times[mode] = _timed(generator._compile_generators, trainer)
+        compiled = sorted(trainer.inference_modules)
+        for batch_size in batch_sizes:
+            conditions = generator._generate_conditions(batch_size, 0.5)
+            run(conditions)  # warm-up (and any shape specialization)
+            _, elapsed = _timed(run, conditions)
+            results[(mode, batch_size)] = elapsed / repeats * 1000
+        print(f"{mode}: compile + warm-up {compile_times[mode]:.1f}s, compiled: {compiled or 'none'}")
+
+    print(f"{'batch':>8} {'eager (ms)':>11} {'compile (ms)':>13} {'script (ms)':>12}")
+    for batch_size in batch_sizes:
+        print(f"{batch_size:>8} {results[('eager', batch_size)]:>11.2f} {results[('compile', batch_size)]:>13.2f} "
+              f"{results[('script', batch_size)]:>12.2f}")
+
+
+# ==================== QUANTIZATION ====================
+def bench_quantize(batch_sizes, samples: int = 4096, seed: int = 0):
+    """Dynamic int8 vs fp32 generators: size, throughput and cohort fidelity."""
+    torch.manual_seed(seed)
+    generator = DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+    generator.device = torch.device("cpu")
+    generator.gan_trainer = GANTrainer()
+    if not generator.gan_trainer.load_models():
+        for model in (generator.gan_trainer.tab_gen, generator.gan_trainer.ts_gen):
+            model.eval()
+    trainer = generator.gan_trainer
+    quantized, quantize_time = _timed(generator._quantized_trainer, trainer)
+
+    report = {}
+    for batch_size in batch_sizes:
+        report[batch_size] = generator.quantization_report(trainer, quantized, samples, seed, batch_size)
+
+    first = report[batch_sizes[0]]
+    sizes, ratios = first['size_bytes'], first['label_ratios']
+    print(f"Quantized in {quantize_time:.2f}s; generator weights {sizes['fp32'] / 2**20:.2f} MB -> "
+          f"{sizes['int8'] / 2**20:.2f} MB ({sizes['fp32'] / sizes['int8']:.1f}x smaller)")
+    print(f"Fidelity over {samples} samples: max mean drift {first['max_mean_drift']:.5f}, "
+          f"max std drift {first['max_std_drift']:.5f}, diabetes ratio {ratios['fp32']['diabetes']:.3f} -> "
+          f"{ratios['int8']['diabetes']:.3f}, bp_status ratio {ratios['fp32']['bp_status']:.3f} -> "
+          f"{ratios['int8']['bp_status']:.3f}")
+
+    print(f"{'batch':>8} {'fp32 (/s)':>10} {'int8 (/s)':>10} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        throughput = report[batch_size]['samples_per_second']
+        print(f"{batch_size:>8} {throughput['fp32']:>10.0f} {throughput['int8']:>10.0f} "
+              f"{throughput['int8'] / throughput['fp32']:>7.2f}x")
+
+
+# ==================== MODEL LOADING ====================
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS")) / 1024
+
+
+def _cold_load(serving: bool):
+    """Build and load a trainer in this (fresh) process and run one generation batch."""
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    trainer = GANTrainer(serving=serving)
+    loaded = trainer.load_models()
+    elapsed = time.perf_counter() - start
+    if loaded:
+        trainer.run_generators(torch.randn(100, LATENT_DIM, device=trainer.device),
+                               torch.rand(100, len(COND_FEATURES), device=trainer.device))
+    return loaded, elapsed, _rss_mb() - baseline
+
+
+def bench_load(repeats: int = 5):
+    """Cold-start time and resident memory: full trainer load vs generator-only serving load."""
+    context = multiprocessing.get_context("spawn")
+    print(f"{'loader':>8} {'load (ms)':>10} {'RSS after first batch (MB)':>27}")
+    for serving in (False, True):
+        results = []
+        for _ in range(repeats):
+            with context.Pool(1) as pool:
+                results.append(pool.apply(_cold_load, (serving,)))
+        if not all(loaded for loaded, _, _ in results):
+            print(f"{'serving' if serving else 'full':>8} checkpoint incomplete, load failed")
+            continue
+        load_ms = sorted(elapsed for _, elapsed, _ in results)[repeats // 2] * 1000
+        rss = sorted(rss for _, _, rss in results)[repeats // 2]
+        print(f"{'serving' if serving else 'full':>8} {load_ms:>10.1f} {rss:>27.1f}")
+
+
+# ==================== INSIGHT BATCHING ====================
+def _random_stats(rng: np.random.Generator) -> dict:
+    age = sorted(rng.integers(30, 56, 2).tolist())
+    bmi = sorted(np.round(rng.uniform(18.5, 45.0, 2), 1).tolist())
+    return {
+        "age_range": {"min": age[0], "max": age[1]},
+        "bmi_range": {"min": bmi[0], "max": bmi[1]},
+        "diabetes_distribution": {"diabetic_percentage": round(float(rng.uniform(20, 80)), 1)},
+        "diabetic_rbs_mean": round(float(rng.uniform(150, 230)), 1),
+        "non_diabetic_rbs_mean": round(float(rng.uniform(90, 120)), 1),
+        "hba1c_range": {"min": 5.72, "max": round(float(rng.uniform(6.5, 7.0)), 2)}
+    }
+
+
+async def _load_test(batcher, prompts, concurrency: int):
+    """`concurrency` clients sending `prompts` back to back; returns (latencies, wall time)."""
+    pending = iter(prompts)
+    latencies = []
+
+    async def client():
+        for prompt in pending:
+            start = time.perf_counter()
+            await batcher.submit(prompt)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def bench_explain(concurrency_levels, requests: int = 32, batch_size: int = 8, wait_ms: float = 10.0,
+                  stand_in_ms: float = None, stand_in_item_ms: float = 0.0, seed: int = 0):
+    """
+    /explain-stats inference under concurrent load: one prompt per generate call vs micro-batched.
+
+    Every request has distinct statistics, so the insight cache never hits. Uses the
+    real transformer unless --stand-in-ms is given; the stand-in sleeps
+    stand_in_ms + stand_in_item_ms per prompt for each batch, which measures the
+    scheduler rather than the model.
+    """
+    from micro_batching import MicroBatcher
+    from transformer_insight_helper import _build_prompt, _generate_insights
+
+    if stand_in_ms is None:
+        batch_fn = _generate_insights
+        batch_fn([_build_prompt(_random_stats(np.random.default_rng(seed)))])  # load + warm up the model
+    else:
+        def batch_fn(prompts):
+            time.sleep((stand_in_ms + stand_in_item_ms * len(prompts)) / 1000)
+            return ["" for _ in prompts]
+
+    rng = np.random.default_rng(seed)
+    print(f"{'clients':>8} {'scheduler':>10} {'p50 (s)':>8} {'p99 (s)':>8} {'req/s':>7} {'mean batch':>11}")
+    for concurrency in concurrency_levels:
+        prompts = [_build_prompt(_random_stats(rng)) for _ in range(requests)]
+        for label, size, wait in (("single", 1, 0.0), ("batched", batch_size, wait_ms)):
+            batcher = MicroBatcher(batch_fn, size, wait, name=label)
+            latencies, elapsed = asyncio.run(_load_test(batcher, prompts, concurrency))
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{concurrency:>8} {label:>10} {p50:>8.3f} {p99:>8.3f} {requests / elapsed:>7.2f} "
+                  f"{batcher.stats()['mean_batch_size']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML service micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    denorm = subparsers.add_parser("denormalize", help="Per-patient vs vectorized denormalization")
+    denorm.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    denorm.add_argument("--seed", type=int, default=0)
+
+    cond = subparsers.add_parser("conditions", help="Per-row vs vectorized condition sampling")
+    cond.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    cond.add_argument("--seed", type=int, default=0)
+
+    writers = subparsers.add_parser("writers", help="Write time and file size per output format")
+    writers.add_argument("--samples", type=int, default=100000)
+    writers.add_argument("--row-group-size", type=int, default=None)
+    writers.add_argument("--seed", type=int, default=0)
+
+    preprocess = subparsers.add_parser("preprocess", help="Groupby loop vs vectorized training preprocessing")
+    preprocess.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    preprocess.add_argument("--seed", type=int, default=0)
+
+    batching = subparsers.add_parser("batching", help="DataLoader vs on-device batch iterator")
+    batching.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256, 1024])
+    batching.add_argument("--patients", type=int, default=10000)
+    batching.add_argument("--seed", type=int, default=0)
+
+    train_step = subparsers.add_parser("train-step", help="Per-step loss reads vs on-device accumulation")
+    train_step.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 128])
+    train_step.add_argument("--steps", type=int, default=20)
+    train_step.add_argument("--log-interval", type=int, default=10)
+    train_step.add_argument("--seed", type=int, default=0)
+
+    precision = subparsers.add_parser("precision", help="bf16 autocast vs fp32 quality and throughput")
+    precision.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256, 1024])
+    precision.add_argument("--steps", type=int, default=10)
+    precision.add_argument("--samples", type=int, default=4096)
+    precision.add_argument("--seed", type=int, default=0)
+
+    compile_parser = subparsers.add_parser("compile", help="Eager vs compiled generator inference")
+    compile_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000])
+    compile_parser.add_argument("--repeats", type=int, default=20)
+    compile_parser.add_argument("--seed", type=int, default=0)
+
+    quantize = subparsers.add_parser("quantize", help="Dynamic int8 vs fp32 generators")
+    quantize.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    quantize.add_argument("--samples", type=int, default=4096)
+    quantize.add_argument("--seed", type=int, default=0)
+
+    load = subparsers.add_parser("load", help="Full vs generator-only model loading (fresh processes)")
+    load.add_argument("--repeats", type=int, default=5)
+
+    explain = subparsers.add_parser("explain", help="Insight generation latency under concurrency, batched vs not")
+    explain.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    explain.add_argument("--requests", type=int, default=32)
+    explain.add_argument("--batch-size", type=int, default=8)
+    explain.add_argument("--wait-ms", type=float, default=10.0)
+    explain.add_argument("--stand-in-ms", type=float, default=None,
+                         help="Replace the transformer with a sleep of this many ms per batch")
+    explain.add_argument("--stand-in-item-ms", type=float, default=0.0,
+                         help="Extra stand-in sleep per prompt in the batch")
+    explain.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.benchmark == "denormalize":
+        bench_denormalize(args.sizes, args.seed)
+    elif args.benchmark == "conditions":
+        bench_conditions(args.sizes, args.seed)
+    elif args.benchmark == "writers":
+        bench_writers(args.samples, args.seed, args.row_group_size)
+    elif args.benchmark == "preprocess":
+        bench_preprocess(args.sizes, args.seed)
+    elif args.benchmark == "batching":
+        bench_batching(args.batch_sizes, args.patients, seed=args.seed)
+    elif args.benchmark == "train-step":
+        bench_train_step(args.batch_sizes, args.steps, args.log_interval, args.seed)
+    elif args.benchmark == "precision":
+        bench_precision(args.batch_sizes, args.steps, args.samples, args.seed)
+    elif args.benchmark == "compile":
+        bench_compile(args.batch_sizes, args.repeats, args.seed)
+    elif args.benchmark == "quantize":
+        bench_quantize(args.batch_sizes, args.samples, args.seed)
+    elif args.benchmark == "load":
+        bench_load(args.repeats)
+    elif args.benchmark == "explain":
+        bench_explain(args.concurrency, args.requests, args.batch_size, args.wait_ms,
+                      args.stand_in_ms, args.stand_in_item_ms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,67 @@ LATENT_DIM = 100
 HIDDEN_DIM = 128
 BATCH_SIZE = 32
 EPOCHS = 100
+LOG_INTERVAL = 10  # Training steps between progress-bar loss updates
+CHECKPOINT_INTERVAL = 5  # Epochs between resumable training checkpoints (0 = only on stop)
+MODEL_SETS_TO_KEEP = 3  # Published model sets kept under trained_models/releases (see publish_model_set)
+
+# Generator precision for serving: "fp32", or "bf16" (autocast) on CPUs with native
+# bfloat16 (AVX512-BF16/AMX). bf16 is only used if its output stays within
+# BF16_MAX_DRIFT of fp32 (per-feature mean/std, normalized scale); otherwise fp32.
+INFERENCE_PRECISION = "fp32"
+BF16_MAX_DRIFT = 0.02
+
+# Generator execution for serving: "eager", "compile" (torch.compile) or "script"
+# (TorchScript trace + freeze). Compilation and warm-up happen when models are
+# loaded; failures fall back to eager.
+INFERENCE_COMPILE_MODE = "eager"
+
+# Generator weight quantization for serving: "none" or "dynamic_int8" (int8
+# Linear/LSTM weights, CPU only, fp32 activations). Like bf16, int8 is only used
+# if its cohort stays within INT8_MAX_DRIFT of fp32 (per-feature mean/std on the
+# normalized scale, and diabetes / bp_status label ratios); otherwise fp32.
+INFERENCE_QUANTIZATION = "none"
+INT8_MAX_DRIFT = 0.02
+
+# Load the serving models (GAN generator, insight transformer) in a background
+# thread as soon as the app starts. Either way nothing heavy loads at import, and
+# a model still loading when a request needs it is loaded by that request.
+WARM_UP_ON_STARTUP = True
+
+# /explain-stats insight cache: LRU size (0 disables) and the JSON file it is
+# persisted to across restarts (None keeps it in memory only)
+INSIGHT_CACHE_SIZE = 256
+INSIGHT_CACHE_PATH = str(PROJECT_ROOT / "cache" / "insights.json")
+
+# /explain-stats micro-batching: concurrent cache misses are generated together,
+# up to INSIGHT_BATCH_SIZE prompts, waiting at most INSIGHT_BATCH_WAIT_MS for a
+# batch to fill (1 and 0 generate each request on its own)
+INSIGHT_BATCH_SIZE = 8
+INSIGHT_BATCH_WAIT_MS = 10
+
+# Request execution (see executors): threads running blocking GAN generation off
+# the event loop (insight batches have their own thread), and how many requests
+# each heavy endpoint works on at once. Requests beyond a limit get 429 with
+# Retry-After instead of queueing.
+INFERENCE_WORKERS = 2
+GENERATE_MAX_CONCURRENT = 2
+STREAM_MAX_CONCURRENT = 4
+EXPLAIN_MAX_CONCURRENT = 32  # insight requests mostly wait on shared batches
+TRAINING_MAX_QUEUED_JOBS = 4
+TRAINING_MAX_FINISHED_JOBS = 50  # finished training jobs kept for /train/jobs; older ones are dropped
+RETRY_AFTER_SECONDS = 5
+TRAINING_RETRY_AFTER_SECONDS = 300
+
+# Generator backend for serving: "torch" (the GANTrainer modules) or "onnx"
+# (ONNX Runtime on CPU over the graph written by `python onnx_backend.py export`,
+# which loads only the two generators and needs neither discriminators nor the
+# cross-modal model). The current model set is re-exported (and parity checked
+# against ONNX_PARITY_ATOL) on load and reload when the export is from an older set.
+# INFERENCE_PRECISION and INFERENCE_COMPILE_MODE are torch-only.
+INFERENCE_BACKEND = "torch"
+ONNX_MODEL_DIR = str(PROJECT_ROOT / "trained_models" / "onnx")
+ONNX_OPSET = 17
+ONNX_PARITY_ATOL = 1e-4
 
 # Updated features for diabetes prediction
 FEATURES = ['rbs_value']  # Time series feature - RBS values
@@ -101,6 +162,15 @@ GITHUB_BRANCH = "main"
 DEFAULT_TIME_SERIES_PATH = f"https://raw.githubusercontent.com/{GITHUB_OWNER}/{GITHUB_REPO}/{GITHUB_BRANCH}/ml_service/datasets/enhanced_diabetes_timeseries_dataset.csv"
 DEFAULT_TABULAR_PATH = f"https://raw.githubusercontent.com/{GITHUB_OWNER}/{GITHUB_REPO}/{GITHUB_BRANCH}/ml_service/datasets/enhanced_diabetes_tabular_dataset.csv"
 
+# Local copies of downloaded datasets, revalidated against the remote with
+# ETag/Last-Modified. Copies younger than DATASET_CACHE_MAX_AGE seconds are used
+# without contacting the remote at all.
+DATASET_CACHE_DIR = str(PROJECT_ROOT / "dataset_cache")
+DATASET_CACHE_MAX_AGE = 0
+
+# Preprocessed training tensors, keyed by dataset contents and the config above
+TENSOR_CACHE_DIR = os.path.join(DATASET_CACHE_DIR, "tensors")
+
 # Output directories
 OUTPUT_DIR = PROJECT_ROOT / "synthetic_data"
 MODEL_DIR = PROJECT_ROOT / "trained_models"
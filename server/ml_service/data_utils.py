@@ -236,27 +236,139 @@ from sklearn.preprocessing import MinMaxScaler
 from torch.utils.data import DataLoader, TensorDataset
 from config import *
 import requests
-from io import StringIO
+from dataset_cache import DatasetCache
+from tensor_cache import TensorCache
 
 logger = logging.getLogger(__name__)
 
+# Generator/training column order: hypertension is expanded in place into its
+# systolic/diastolic components
+MODEL_TABULAR_FEATURES = []
+for _feature in TABULAR_FEATURES:
+    if _feature == 'hypertension':
+        MODEL_TABULAR_FEATURES.extend(['hypertension_systolic', 'hypertension_diastolic'])
+    else:
+        MODEL_TABULAR_FEATURES.append(_feature)
+
+
+class InverseScaling:
+    """
+    Vectorized inverse of the fitted MinMax scaling, built from
+    DiabetesDataPreprocessor.get_scaler_params() output.
+
+    Per-column scale and offset are precomputed for each feature group, so
+    inverting a whole batch is a single multiply-add (same result as
+    MinMaxScaler.inverse_transform column by column).
+    """
+
+    def __init__(self, scaler_params: dict):
+        self.tabular = self._affine(scaler_params, MODEL_TABULAR_FEATURES)
+        self.conditions = self._affine(scaler_params, COND_FEATURES)
+        self.rbs = self._affine(scaler_params, ['rbs_value'])
+
+    @staticmethod
+    def _affine(scaler_params: dict, columns: list):
+        scale = np.empty(len(columns))
+        offset = np.empty(len(columns))
+        for i, col in enumerate(columns):
+            params = scaler_params[col]
+            low, high = params['feature_range']
+            data_min = params['data_min'][0]
+            data_range = params['data_max'][0] - data_min
+            # Constant columns are scaled with a unit range, as MinMaxScaler does
+            scale[i] = (data_range if data_range != 0 else 1.0) / (high - low)
+            offset[i] = data_min - low * scale[i]
+        return scale, offset
+
+    @staticmethod
+    def _apply(values: np.ndarray, affine) -> np.ndarray:
+        scale, offset = affine
+        return np.asarray(values, dtype=np.float64) * scale + offset
+
+    def inverse_tabular(self, values: np.ndarray) -> np.ndarray:
+        """(N, len(MODEL_TABULAR_FEATURES)) generator output -> original units."""
+        return self._apply(values, self.tabular)
+
+    def inverse_conditions(self, values: np.ndarray) -> np.ndarray:
+        """(N, len(COND_FEATURES)) normalized conditions -> original units."""
+        return self._apply(values, self.conditions)
+
+    def inverse_rbs(self, values: np.ndarray) -> np.ndarray:
+        """Normalized RBS readings of any shape -> mg/dL."""
+        scale, offset = self.rbs
+        return np.asarray(values, dtype=np.float64) * scale[0] + offset[0]
+
+
 class DiabetesDataPreprocessor:
-    def __init__(self):
+    def __init__(self, dataset_cache: DatasetCache = None, tensor_cache: TensorCache = None):
         self.scalers = {}
         self.label_encoders = {}
+        self.dataset_cache = dataset_cache or DatasetCache()
+        self.tensor_cache = tensor_cache or TensorCache()
+
+    def load_training_tensors(self, time_series_path: str, tabular_path: str, use_cache: bool = True):
+        """
+        Return (time_series, tabular, conditions, targets) ready for training.
+
+        The result of load_and_preprocess_data + preprocess_for_model is cached
+        as a memory-mapped bundle keyed by the dataset contents and config; on a
+        hit pandas is skipped entirely and the fitted scalers are restored from
+        the bundle.
+        """
+        local_paths = [self.dataset_cache.fetch(time_series_path), self.dataset_cache.fetch(tabular_path)]
+        key = self.tensor_cache.key(local_paths) if use_cache else None
+
+        if key:
+            cached = self.tensor_cache.load(key)
+            if cached is not None:
+                tensors, scaler_params = cached
+                self.set_scaler_params(scaler_params)
+                logger.info(f"[OK] Prepared {len(tensors[0])} patient sequences (cached)")
+                return tensors
+
+        merged_data = self.load_and_preprocess_data(*local_paths)
+        tensors = self.preprocess_for_model(merged_data)
+
+        if key:
+            try:
+                self.tensor_cache.store(key, tensors, self.get_scaler_params())
+            except OSError as e:
+                logger.warning(f"[WARNING] Could not cache preprocessed tensors: {str(e)}")
+
+        return tensors
+
+    def get_scaler_params(self) -> dict:
+        """Fitted MinMax scaler parameters as plain JSON-serializable values."""
+        return {
+            col: {
+                "feature_range": list(scaler.feature_range),
+                "data_min": scaler.data_min_.tolist(),
+                "data_max": scaler.data_max_.tolist()
+            }
+            for col, scaler in self.scalers.items()
+        }
+
+    def set_scaler_params(self, params: dict) -> None:
+        """Rebuild fitted MinMax scalers from get_scaler_params() output."""
+        self.scalers = {}
+        for col, p in params.items():
+            scaler = MinMaxScaler(feature_range=tuple(p["feature_range"]))
+            # Fitting on the two extremes reproduces min_/scale_ exactly
+            scaler.fit(np.array([p["data_min"], p["data_max"]], dtype=np.float64))
+            self.scalers[col] = scaler
 
     def load_and_preprocess_data(self, time_series_path: str, tabular_path: str):
-        """Load and preprocess diabetes datasets from GitHub URLs ONLY."""
+        """Load and preprocess diabetes datasets (GitHub URLs, file:// URLs or local paths)."""
         try:
-            # Load time series data (GITHUB ONLY - NO LOCAL FALLBACK)
-            logger.info(f"Loading time series data from GitHub: {time_series_path}")
+            # Load time series data
+            logger.info(f"Loading time series data: {time_series_path}")
             time_series_data = self._load_csv(time_series_path)
             if time_series_data.empty:
                 raise ValueError("Time series data file is empty")
             logger.info(f"[OK] Time series data loaded: {time_series_data.shape[0]} rows, {time_series_data.shape[1]} columns")
 
-            # Load tabular data (GITHUB ONLY - NO LOCAL FALLBACK)
-            logger.info(f"Loading tabular data from GitHub: {tabular_path}")
+            # Load tabular data
+            logger.info(f"Loading tabular data: {tabular_path}")
             tabular_data = self._load_csv(tabular_path)
             if tabular_data.empty:
                 raise ValueError("Tabular data file is empty")
@@ -304,19 +416,21 @@ class DiabetesDataPreprocessor:
             raise
 
     def _load_csv(self, path: str) -> pd.DataFrame:
-        """Load CSV from GitHub URL ONLY - NO LOCAL FALLBACK."""
-        try:
-            if not (path.startswith('http://') or path.startswith('https://')):
-                raise RuntimeError(f"Only GitHub URLs are supported. Invalid path: {path}")
+        """
+        Load a CSV from a GitHub URL, file:// URL or local path.
 
-            # Fetch from GitHub
-            logger.info(f"Fetching dataset from GitHub...")
-            response = requests.get(path, timeout=30)
-            response.raise_for_status()  # Raise HTTPError for bad status codes
-            
-            logger.info(f"[OK] HTTP {response.status_code}: Dataset fetched successfully")
-            return pd.read_csv(StringIO(response.text))
+        Remote files go through the local dataset cache: the body is streamed to
+        disk once and revalidated with ETag/Last-Modified on later runs, and the
+        cached copy is used when the remote is unreachable.
+        """
+        try:
+            local_path = self.dataset_cache.fetch(path)
+            return pd.read_csv(local_path)
 
+        except FileNotFoundError as e:
+            error_msg = f"Dataset file not found: {path}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
         except requests.exceptions.HTTPError as e:
             error_msg = f"Failed to load dataset from GitHub. URL: {path}, HTTP Status: {e.response.status_code}"
             logger.error(error_msg)
@@ -394,51 +508,36 @@ class DiabetesDataPreprocessor:
                 for col in missing:
                     data[col] = 0
 
-        # Create sequences for each patient
-        unique_patients = data['patient_id'].unique()
+        # Patients are indexed in order of first appearance
+        codes, unique_patients = pd.factorize(data['patient_id'], use_na_sentinel=False)
         num_patients = len(unique_patients)
 
-        # Adjust tabular features to include both BP components instead of hypertension string
-        modified_tabular_features = [f for f in TABULAR_FEATURES if f != 'hypertension'] + ['hypertension_systolic', 'hypertension_diastolic']
-
-        # Initialize arrays
-        sequences = np.zeros((num_patients, SEQ_LENGTH, 1))  # Only RBS values
-        tabular_data_array = np.zeros((num_patients, len(modified_tabular_features)))
-        conditions = np.zeros((num_patients, len(COND_FEATURES)))
-        targets = np.zeros((num_patients, len(TARGET_VARIABLES)))
-
-        patient_to_idx = {pid: i for i, pid in enumerate(unique_patients)}
-
-        for patient_id, group in data.groupby('patient_id'):
-            idx = patient_to_idx[patient_id]
-
-            # Extract time series data (RBS values)
-            rbs_sequence = group['rbs_value'].values
-            seq_len = min(SEQ_LENGTH, len(rbs_sequence))
-            sequences[idx, :seq_len, 0] = rbs_sequence[:seq_len]
-
-            # Extract tabular and condition data (use first row for patient)
-            first_row = group.iloc[0]
-
-            # Handle tabular features
-            tabular_values = []
-            for feature in TABULAR_FEATURES:
-                if feature == 'hypertension':
-                    # Use the processed systolic and diastolic values
-                    tabular_values.extend([first_row['hypertension_systolic'], first_row['hypertension_diastolic']])
-                else:
-                    tabular_values.append(first_row[feature])
-
-            tabular_data_array[idx] = tabular_values
-            conditions[idx] = first_row[COND_FEATURES].values
-            targets[idx] = first_row[TARGET_VARIABLES].values
+        # RBS sequences: position of each reading within its patient, scattered into
+        # a zero-padded (patients, SEQ_LENGTH) matrix; readings past SEQ_LENGTH are dropped
+        sequences = np.zeros((num_patients, SEQ_LENGTH, 1), dtype=np.float32)
+        positions = data.groupby(codes, sort=False).cumcount().to_numpy()
+        keep = positions < SEQ_LENGTH
+        sequences[codes[keep], positions[keep], 0] = data['rbs_value'].to_numpy(dtype=np.float64)[keep]
+
+        # Tabular features, conditions and targets come from each patient's first row
+        first_rows = data.loc[~data.duplicated('patient_id')]
+        tabular_data_array = first_rows[MODEL_TABULAR_FEATURES].to_numpy(dtype=np.float32, copy=True)
+        conditions = first_rows[COND_FEATURES].to_numpy(dtype=np.float32, copy=True)
+        targets = first_rows[TARGET_VARIABLES].to_numpy(dtype=np.float32, copy=True)
+
+        # Rows without a patient_id share one slot that stays all zeros, as the
+        # groupby loop this replaced left it (groupby drops NaN keys)
+        missing_id = pd.isna(unique_patients)
+        if missing_id.any():
+            for array in (sequences, tabular_data_array, conditions, targets):
+                array[missing_id] = 0
 
         logger.info(f"[OK] Prepared {num_patients} patient sequences")
 
-        return (torch.from_numpy(sequences).float(),
-                torch.from_numpy(tabular_data_array).float(),
-                torch.from_numpy(conditions).float(),
-                torch.from_numpy(targets).float())
+        return (torch.from_numpy(sequences),
+                torch.from_numpy(tabular_data_array),
+                torch.from_numpy(conditions),
+                torch.from_numpy(targets))
 
     def create_dataloader(self, time_series: torch.Tensor, tabular: torch.Tensor, conditions: torch.Tensor, targets: torch.Tensor, batch_size: int = BATCH_SIZE):
         """Create DataLoader for training with targets."""
@@ -458,3 +557,50 @@ class DiabetesDataPreprocessor:
             num_workers=0,
             pin_memory=use_pin_memory
         )
+
+
+class TensorBatchIterator:
+    """
+    Shuffled mini-batches over in-memory tensors, without DataLoader collation.
+
+    The tensors are moved to `device` once. Each epoch draws one permutation,
+    gathers every tensor in that order, and yields contiguous slices of the
+    result, so a step costs a view instead of a per-sample collate.
+    Iterating again starts a new epoch with a new permutation.
+    """
+
+    def __init__(self, *tensors: torch.Tensor, batch_size: int = BATCH_SIZE,
+                 device: torch.device = None, shuffle: bool = True, drop_last: bool = False,
+                 generator: torch.Generator = None):
+        if not tensors or any(len(t) != len(tensors[0]) for t in tensors):
+            raise ValueError("TensorBatchIterator needs one or more tensors of equal length")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        self.device = torch.device(device) if device is not None else tensors[0].device
+        self.tensors = tuple(t.to(self.device).contiguous() for t in tensors)
+        self.num_samples = len(self.tensors[0])
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.generator = generator
+
+        self.batch_size = min(batch_size, self.num_samples) if self.num_samples else batch_size
+        if self.batch_size < batch_size:
+            logger.warning(f"Dataset size ({self.num_samples}) smaller than batch size ({batch_size}). Using {self.batch_size}")
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        if self.shuffle:
+            # The permutation is drawn on the CPU so a seeded generator behaves the same on every device
+            order = torch.randperm(self.num_samples, generator=self.generator).to(self.device)
+            epoch_tensors = tuple(t.index_select(0, order) for t in self.tensors)
+        else:
+            epoch_tensors = self.tensors
+
+        for i in range(len(self)):
+            start = i * self.batch_size
+            yield tuple(t[start:start + self.batch_size] for t in epoch_tensors)
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+
+from config import DATASET_CACHE_DIR, DATASET_CACHE_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+class DatasetCache:
+    """
+    On-disk cache for remote dataset files.
+
+    Downloads are stored content-addressed (`blobs/<sha256>`) and indexed by URL
+    (`index/<sha256(url)>.json`, holding the ETag/Last-Modified validators).
+    Subsequent fetches send a conditional GET and reuse the local copy on
+    304 Not Modified, so an unchanged dataset costs one header round-trip.
+    If the remote is unreachable the cached copy is used as-is.
+
+    Local paths and file:// URLs are passed through untouched.
+    """
+
+    def __init__(self, cache_dir: str = DATASET_CACHE_DIR, max_age: float = DATASET_CACHE_MAX_AGE,
+                 timeout: float = 30):
+        """
+        Args:
+            cache_dir: Cache root directory (created on first download)
+            max_age: Seconds a cached copy is trusted without revalidation
+            timeout: Connect/read timeout for remote requests
+        """
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_dir = os.path.join(cache_dir, "index")
+        self.max_age = max_age
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+
+    def fetch(self, path: str) -> str:
+        """
+        Resolve `path` to a local file, downloading or revalidating it if remote.
+
+        Raises:
+            FileNotFoundError: Local file does not exist
+            requests.exceptions.RequestException: Remote fetch failed and nothing is cached
+        """
+        if not path.startswith(("http://", "https://")):
+            local_path = self._local_path(path)
+            if not os.path.isfile(local_path):
+                raise FileNotFoundError(f"Dataset file not found: {local_path}")
+            return local_path
+
+        # One fetch per process at a time keeps concurrent training runs from racing on the index
+        with self._lock:
+            return self._fetch_remote(path)
+
+    # ==================== REMOTE ====================
+    def _fetch_remote(self, url: str) -> str:
+        entry = self._read_entry(url)
+        cached_path = self._blob_path(entry["sha256"]) if entry else None
+        if cached_path and not os.path.isfile(cached_path):
+            entry, cached_path = None, None
+
+        if entry and time.time() - entry["validated_at"] < self.max_age:
+            logger.info(f"[OK] Using cached dataset (fresh): {url}")
+            return cached_path
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 304 and entry:
+                    entry["validated_at"] = time.time()
+                    self._write_entry(url, entry)
+                    logger.info(f"[OK] HTTP 304: Cached dataset is current: {url}")
+                    return cached_path
+
+                response.raise_for_status()
+                digest, size = self._download(response)
+                entry = {
+                    "url": url,
+                    "sha256": digest,
+                    "size": size,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": datetime.now().isoformat(),
+                    "validated_at": time.time()
+                }
+                self._write_entry(url, entry)
+                logger.info(f"[OK] HTTP {response.status_code}: Dataset downloaded ({size} bytes) and cached")
+                return self._blob_path(digest)
+
+        except requests.exceptions.RequestException as e:
+            if cached_path:
+                logger.warning(f"[WARNING] Could not revalidate {url} ({str(e)}); using cached copy "
+                               f"from {entry['fetched_at']}")
+                return cached_path
+            raise
+
+    def _download(self, response: requests.Response) -> tuple:
+        """Stream the body to a temp file while hashing it, then move it into place."""
+        os.makedirs(self.blob_dir, exist_ok=True)
+        sha = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    sha.update(chunk)
+                    size += len(chunk)
+            digest = sha.hexdigest()
+            os.replace(tmp_path, self._blob_path(digest))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return digest, size
+
+    # ==================== INDEX ====================
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, f"{digest}.csv")
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.index_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, url: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.index_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._entry_path(url))
+
+    @staticmethod
+    def _local_path(path: str) -> str:
+        if path.startswith("file://"):
+            return url2pathname(urlparse(path).path)
+        return os.path.expanduser(path)
@@ -0,0 +1,314 @@
+"""
+Data-parallel GAN training with torch.distributed (gloo) and DistributedDataParallel.
+
+Local runs are started from GANTrainer.train_gan(world_size=N), which spawns N
+rank processes on this host. Multi-node runs use torchrun with this module as
+the entry point:
+
+    torchrun --nnodes 2 --nproc-per-node 8 --rdzv-backend c10d \\
+        --rdzv-endpoint trainer-0:29500 distributed_training.py --epochs 200
+
+or, on a single host without torchrun:
+
+    python distributed_training.py --world-size 4 --epochs 200
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import queue
+import socket
+import traceback
+from typing import Callable, Dict, Optional, Tuple
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+
+from data_utils import DiabetesDataPreprocessor, TensorBatchIterator
+from gan_trainer import GANTrainer
+from parallel_training import available_cores
+from training_checkpoint import CheckpointWriter, load_checkpoint
+from config import BATCH_SIZE, CHECKPOINT_INTERVAL, DEFAULT_TABULAR_PATH, DEFAULT_TIME_SERIES_PATH, EPOCHS, \
+    LOG_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def ddp_models(trainer: GANTrainer):
+    """
+    Temporarily replace the trainer's models with DDP wrappers.
+
+    The unchanged training step then all-reduces gradients on every backward.
+    Each rank computes the gradient penalty on its own shard; its autograd.grad
+    call only differentiates w.r.t. the interpolated inputs, so the parameter
+    gradients (penalty included) are reduced once, by the final backward.
+    """
+    originals = {name: getattr(trainer, name) for name in GANTrainer.MODEL_FILES}
+    try:
+        for name, model in originals.items():
+            setattr(trainer, name, DistributedDataParallel(model))
+        yield
+    finally:
+        for name, model in originals.items():
+            setattr(trainer, name, model)
+
+
+def shard(tensors: Tuple[torch.Tensor, ...], rank: int, world_size: int, seed: int) -> Tuple[torch.Tensor, ...]:
+    """
+    Equal-sized disjoint shard of the patients for `rank`.
+
+    Every rank draws the same permutation from `seed`; the remainder of
+    len // world_size is dropped so all ranks run the same number of steps.
+    """
+    num_samples = len(tensors[0])
+    per_rank = num_samples // world_size
+    order = torch.randperm(num_samples, generator=torch.Generator().manual_seed(seed))
+    indices = order[rank * per_rank:(rank + 1) * per_rank]
+    return tuple(t[indices] for t in tensors)
+
+
+def _broadcast_int(value: int) -> int:
+    tensor = torch.tensor([value], dtype=torch.int64)
+    dist.broadcast(tensor, src=0)
+    return int(tensor.item())
+
+
+def _train_rank(trainer: GANTrainer, tensors: Tuple[torch.Tensor, ...], epochs: int, batch_size: int,
+                log_interval: int, resume: bool,
+                report: Optional[Callable[[int, Dict[str, float]], bool]] = None) -> Tuple[Dict[str, list], bool]:
+    """
+    Training loop run by every rank of an initialized process group.
+
+    `batch_size` is the global batch; each rank trains on batch_size // world_size
+    samples of its own shard per step. Epoch losses are averaged across ranks.
+    Only rank 0 writes best models and resumable checkpoints, and only rank 0
+    calls `report`, whose verdict (False = stop) is broadcast to all ranks.
+    """
+    rank, world_size = dist.get_rank(), dist.get_world_size()
+    optimizers = trainer.make_optimizers()
+
+    history = {name: [] for name in GANTrainer.LOSS_NAMES}
+    best_gen_loss = float('inf')
+    start_epoch = 0
+
+    # Rank 0 reads the checkpoint and ships it to the others, so nodes need no shared disk
+    state = load_checkpoint(trainer.checkpoint_path()) if resume and rank == 0 else None
+    payload = [state]
+    dist.broadcast_object_list(payload, src=0)
+    state = payload[0]
+    if state is not None and trainer._restore_training_state(state, optimizers, len(tensors[0]), batch_size, epochs,
+                                                             world_size):
+        history, best_gen_loss, start_epoch = state["history"], state["best_gen_loss"], state["epoch"]
+        if rank == 0:
+            logger.info(f"[OK] Resumed training from epoch {start_epoch}/{epochs}")
+
+    # Shared shard order, distinct noise per rank
+    seed = _broadcast_int(int(torch.randint(2 ** 31 - 1, (1,)).item()) if rank == 0 else 0)
+    torch.manual_seed(seed + rank)
+    local_batch_size = max(1, batch_size // world_size)
+    batches = TensorBatchIterator(
+        *shard(tensors, rank, world_size, seed), batch_size=local_batch_size, device=trainer.device
+    )
+    if rank == 0:
+        logger.info(f"[OK] {world_size} ranks x {batches.num_samples} samples, "
+                    f"{local_batch_size} per rank per step")
+
+    writer = CheckpointWriter() if rank == 0 else None
+    try:
+        with ddp_models(trainer):
+            for epoch in range(start_epoch, epochs):
+                local_losses = trainer.train_epoch(
+                    batches, optimizers, f"Epoch {epoch+1}/{epochs}", log_interval, show_progress=rank == 0
+                )
+                losses = torch.tensor([local_losses[name] for name in GANTrainer.LOSS_NAMES], dtype=torch.float64)
+                dist.all_reduce(losses)
+                epoch_losses = dict(zip(GANTrainer.LOSS_NAMES, (losses / world_size).tolist()))
+                for name, value in epoch_losses.items():
+                    history[name].append(value)
+
+                stop = 0
+                if rank == 0:
+                    current_gen_loss = (history['tab_gen_loss'][-1] + history['ts_gen_loss'][-1]) / 2
+                    if current_gen_loss < best_gen_loss:
+                        best_gen_loss = current_gen_loss
+                        states = trainer._model_states()
+                        writer.submit("models", lambda states=states: trainer._write_models(states))
+                        logger.info(f"[OK] Best models saved at epoch {epoch+1} with loss: {best_gen_loss:.4f}")
+
+                    trainer._log_epoch(epoch, epochs, history)
+                    stop = int(report is not None and report(epoch + 1, dict(epoch_losses)) is False)
+
+                    if stop or (CHECKPOINT_INTERVAL and (epoch + 1) % CHECKPOINT_INTERVAL == 0):
+                        trainer._submit_checkpoint(writer, epoch + 1, optimizers, history, best_gen_loss,
+                                                   len(tensors[0]), batch_size, world_size)
+
+                if _broadcast_int(stop):
+                    if rank == 0:
+                        logger.info(f"Training stopped after epoch {epoch+1}/{epochs} on request")
+                    return history, True
+
+        return history, False
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _rank_worker(rank: int, world_size: int, init_method: str, tensors: Tuple[torch.Tensor, ...],
+                 scaler_params: Optional[Dict], initial_states: Dict, config: Dict, events, replies) -> None:
+    """Entry point of a locally spawned rank; rank 0 relays epochs to the parent and returns the weights."""
+    try:
+        cores = available_cores()
+        cores = cores[rank::world_size] or cores
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+
+        dist.init_process_group("gloo", init_method=init_method, rank=rank, world_size=world_size)
+        try:
+            trainer = GANTrainer(precision=config["precision"])
+            trainer._set_scaler_params(scaler_params)
+            if rank == 0:
+                # DDP broadcasts rank 0's weights, so the parent's initialization is kept
+                for name, state in initial_states.items():
+                    getattr(trainer, name).load_state_dict(state)
+
+            def report(epoch: int, losses: Dict[str, float]) -> bool:
+                events.put(("epoch", epoch, losses))
+                return replies.get()
+
+            history, stopped_early = _train_rank(
+                trainer, tensors, config["epochs"], config["batch_size"], config["log_interval"],
+                config["resume"], report if rank == 0 else None
+            )
+
+            if rank == 0:
+                buffer = io.BytesIO()
+                torch.save(trainer._model_states(), buffer)
+                events.put(("done", history, stopped_early, buffer.getvalue()))
+        finally:
+            dist.destroy_process_group()
+    except Exception as e:
+        events.put(("failed", rank, str(e), traceback.format_exc()))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def train_distributed(trainer: GANTrainer, tensors: Tuple[torch.Tensor, ...], epochs: int, batch_size: int,
+                      log_interval: int, epoch_callback: Optional[Callable[[int, Dict[str, float]], bool]] = None,
+                      resume: bool = True, world_size: int = 2) -> Tuple[Dict[str, list], bool]:
+    """
+    Train on `world_size` local rank processes and load the result into `trainer`.
+
+    The training tensors are placed in shared memory once and sharded by the
+    ranks. Rank 0 reports every epoch back here, where `epoch_callback` decides
+    whether to continue, so job cancellation stops all ranks at the same epoch.
+
+    Returns:
+        (history, stopped_early)
+    """
+    ctx = mp.get_context("spawn")
+    events, replies = ctx.Queue(), ctx.Queue()
+    init_method = f"tcp://127.0.0.1:{_free_port()}"
+    shared = tuple(t.cpu().share_memory_() for t in tensors)
+    config = {"epochs": epochs, "batch_size": batch_size, "log_interval": log_interval, "resume": resume,
+              "precision": trainer.precision}
+
+    processes = []
+    for rank in range(world_size):
+        process = ctx.Process(
+            target=_rank_worker,
+            args=(rank, world_size, init_method, shared, trainer.scaler_params, trainer._model_states(), config,
+                  events, replies),
+            name=f"gan-rank-{rank}"
+        )
+        process.start()
+        processes.append(process)
+    logger.info(f"[OK] Started {world_size} training ranks: {[p.pid for p in processes]}")
+
+    result, error = None, None
+    try:
+        while result is None and error is None:
+            try:
+                event = events.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p.name for p in processes if not p.is_alive() and p.exitcode != 0]
+                if dead:
+                    error = f"Training process {dead[0]} exited unexpectedly"
+                continue
+
+            if event[0] == "epoch":
+                replies.put(epoch_callback is None or epoch_callback(event[1], event[2]) is not False)
+            elif event[0] == "done":
+                result = event[1:]
+            elif event[0] == "failed":
+                logger.error(f"Training rank {event[1]} failed: {event[2]}\n{event[3]}")
+                error = f"Training rank {event[1]} failed: {event[2]}"
+    finally:
+        for process in processes:
+            process.join(timeout=30 if error is None else 5)
+            if process.is_alive():
+                process.terminate()
+
+    if error is not None:
+        raise RuntimeError(error)
+
+    history, stopped_early, states = result
+    for name, state in torch.load(io.BytesIO(states), map_location=trainer.device, weights_only=True).items():
+        getattr(trainer, name).load_state_dict(state)
+    return history, stopped_early
+
+
+def _launched_by_torchrun() -> bool:
+    return "RANK" in os.environ and "WORLD_SIZE" in os.environ
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data-parallel GAN training (gloo/DDP)")
+    parser.add_argument("--time-series-path", default=DEFAULT_TIME_SERIES_PATH)
+    parser.add_argument("--tabular-path", default=DEFAULT_TABULAR_PATH)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Global batch size")
+    parser.add_argument("--log-interval", type=int, default=LOG_INTERVAL)
+    parser.add_argument("--world-size", type=int, default=os.cpu_count() or 1,
+                        help="Local rank processes (ignored under torchrun)")
+    parser.add_argument("--no-resume", dest="resume", action="store_false")
+    parser.add_argument("--precision", choices=["fp32", "bf16"], default="fp32")
+    args = parser.parse_args()
+
+    if not _launched_by_torchrun():
+        GANTrainer().train_gan(
+            args.time_series_path, args.tabular_path, epochs=args.epochs, batch_size=args.batch_size,
+            log_interval=args.log_interval, resume=args.resume, world_size=args.world_size,
+            precision=args.precision
+        )
+        return
+
+    # torchrun: every rank loads (or maps from the tensor cache) the data itself
+    dist.init_process_group("gloo")
+    try:
+        trainer = GANTrainer(precision=args.precision)
+        preprocessor = DiabetesDataPreprocessor()
+        time_series, tabular, conditions, _ = preprocessor.load_training_tensors(
+            args.time_series_path, args.tabular_path
+        )
+        trainer._set_scaler_params(preprocessor.get_scaler_params())
+        _, stopped_early = _train_rank(
+            trainer, (time_series, tabular, conditions), args.epochs, args.batch_size, args.log_interval, args.resume
+        )
+        if dist.get_rank() == 0 and not stopped_early:
+            trainer.save_models()
+            trainer._remove_checkpoint()
+    finally:
+        dist.destroy_process_group()
+
+
+if __name__ == "__main__":
+    main()
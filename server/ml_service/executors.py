@@ -0,0 +1,112 @@
+"""
+Where CPU-bound request work runs, and how much of it is admitted.
+
+The event loop only parses requests and awaits results. Blocking GAN
+generation (PyTorch, pandas, file writes) runs on a bounded thread pool,
+insight batches on a thread of their own, and training in
+TrainingJobManager's worker process. Each heavy endpoint holds an
+EndpointLimiter slot while it works; when all slots are taken, further
+requests are rejected with 429 and a Retry-After header instead of queueing
+behind the ones already running.
+"""
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from fastapi import HTTPException
+
+from config import INFERENCE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# GAN generation (/generate and /generate/stream chunks). Small on purpose: each task
+# already runs multi-threaded torch/numpy kernels, so more workers only oversubscribe the cores.
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+# Insight transformer batches. Separate, so slow flan-t5 batches never hold up generation;
+# one thread suffices because the insight batcher runs its batches one at a time.
+insight_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insight")
+
+
+async def run_inference(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call on the inference pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def iterate_in_inference_pool(iterator: Iterator) -> AsyncIterator:
+    """Async iteration over a blocking iterator, each next() running on the inference pool."""
+    done = object()
+    while True:
+        item = await run_inference(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+class EndpointLimiter:
+    """
+    Caps how many requests an endpoint works on at once.
+
+    Excess requests are rejected immediately with 429 and Retry-After rather
+    than waiting, so a burst cannot build a backlog that keeps the pools
+    saturated long after it ended.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, retry_after_seconds: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.retry_after_seconds = retry_after_seconds
+        self.active = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Callable[[], None]:
+        """
+        Take a slot or raise 429. Returns the matching release function, which
+        is safe to call more than once (for responses that finish in a stream).
+        """
+        with self._lock:
+            if self.active >= self.max_concurrent:
+                self.rejected += 1
+                logger.warning(f"[WARNING] {self.name}: {self.active}/{self.max_concurrent} requests in progress, "
+                               f"rejecting with 429")
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Too many concurrent {self.name} requests; retry in {self.retry_after_seconds}s",
+                    headers={"Retry-After": str(self.retry_after_seconds)}
+                )
+            self.active += 1
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with self._lock:
+                if not released:
+                    released = True
+                    self.active -= 1
+
+        return release
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """`async with limiter.slot():` holds a slot for the block (raises 429 on entry if none is free)."""
+        release = self.acquire()
+        try:
+            yield
+        finally:
+            release()
+
+    def stats(self) -> dict:
+        return {"active": self.active, "max_concurrent": self.max_concurrent, "rejected": self.rejected}
+
+
+def shutdown() -> None:
+    """Stop accepting inference work (used on service shutdown); running tasks finish."""
+    for executor in (inference_executor, insight_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -321,43 +321,143 @@
 import logging
 import torch
 import torch.nn as nn
-from typing import Dict
-import numpy as np
+from torch.nn.parallel import DistributedDataParallel
+from typing import Dict, Callable, Optional
+import contextlib
 from tqdm import tqdm
 import os
+import json
 
 from models import (
     TabularGenerator, TabularDiscriminator,
     TimeSeriesGenerator, TimeSeriesDiscriminator,
     CrossModalGenerator
 )
-from data_utils import DiabetesDataPreprocessor
-from config import EPOCHS, LATENT_DIM, BATCH_SIZE, MODEL_DIR
+from data_utils import DiabetesDataPreprocessor, InverseScaling, TensorBatchIterator
+from training_checkpoint import (
+    CheckpointWriter, atomic_torch_save, atomic_write_json, capture_rng_state, cpu_copy, current_model_dir,
+    current_model_set, load_checkpoint, load_weights, model_set_dir, publish_model_set, restore_rng_state
+)
+from model_compiler import compile_for_training, unwrap
+from config import EPOCHS, LATENT_DIM, BATCH_SIZE, MODEL_DIR, LOG_INTERVAL, CHECKPOINT_INTERVAL, MODEL_SETS_TO_KEEP
 
 logger = logging.getLogger(__name__)
 
+FAMILY_ORDER = ('tabular', 'timeseries', 'cross_modal')
+
+# Supported model precisions -> autocast dtype (None = plain float32)
+AUTOCAST_DTYPES = {'fp32': None, 'bf16': torch.bfloat16}
+
+
+def native_bf16_supported() -> bool:
+    """Whether the CPU has bfloat16 instructions (AVX512-BF16 or AMX), where bf16 autocast pays off."""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
 class GANTrainer:
     """Trainer for Conditional Wasserstein GAN with Gradient Penalty."""
+
+    # Keys of the training history, in _train_step order when all families train together
+    LOSS_NAMES = ('tab_disc_loss', 'tab_gen_loss', 'ts_disc_loss', 'ts_gen_loss', 'cross_modal_loss')
+    LOSS_LABELS = ('TabD', 'TabG', 'TsD', 'TsG', 'Cross')
+
+    # Independent sub-problems sharing only the input batch
+    FAMILY_MODELS = {
+        'tabular': ('tab_gen', 'tab_disc'),
+        'timeseries': ('ts_gen', 'ts_disc'),
+        'cross_modal': ('cross_modal',)
+    }
+    FAMILY_LOSSES = {
+        'tabular': ('tab_disc_loss', 'tab_gen_loss'),
+        'timeseries': ('ts_disc_loss', 'ts_gen_loss'),
+        'cross_modal': ('cross_modal_loss',)
+    }
     
-    def __init__(self, lambda_gp: float = 10.0, n_critic: int = 5):
+    def __init__(self, lambda_gp: float = 10.0, n_critic: int = 5, precision: str = 'fp32',
+                 serving: bool = False):
         """
         Args:
             lambda_gp: Gradient penalty coefficient
             n_critic: Number of critic updates per generator update
+            precision: 'fp32', or 'bf16' to run model forwards under bfloat16 autocast
+            serving: Build only the generators, for generation-only processes. Their
+                weights stay unallocated (meta tensors) until load_models() assigns
+                the checkpoint's; there are no discriminators or cross-modal model,
+                so a serving trainer cannot train or save.
         """
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.lambda_gp = lambda_gp
         self.n_critic = n_critic
+        self.precision = precision
+        self.serving = serving
+        self._check_precision(precision)
 
         # Initialize models
-        self.tab_gen = TabularGenerator().to(self.device)
-        self.tab_disc = TabularDiscriminator().to(self.device)
-        self.ts_gen = TimeSeriesGenerator().to(self.device)
-        self.ts_disc = TimeSeriesDiscriminator().to(self.device)
-        self.cross_modal = CrossModalGenerator().to(self.device)
+        if serving:
+            # No allocation or random init: load_models() assigns the loaded tensors directly
+            with torch.device("meta"):
+                self.tab_gen = TabularGenerator()
+                self.ts_gen = TimeSeriesGenerator()
+            self.tab_disc = self.ts_disc = self.cross_modal = None
+        else:
+            self.tab_gen = TabularGenerator().to(self.device)
+            self.tab_disc = TabularDiscriminator().to(self.device)
+            self.ts_gen = TimeSeriesGenerator().to(self.device)
+            self.ts_disc = TimeSeriesDiscriminator().to(self.device)
+            self.cross_modal = CrossModalGenerator().to(self.device)
+
+        # Fitted MinMax parameters of the training data, saved with the checkpoint
+        # so generation can invert the scaling exactly
+        self.scaler_params = None
+        self.inverse_scaling = None
+
+        # Published model set the weights were loaded from (None: flat layout or not loaded)
+        self.model_set = None
+
+        # Compiled generator callables used for serving, keyed by model name
+        # (filled by DiabetesDataGenerator; empty means eager)
+        self.inference_modules = {}
 
         logger.info(f"[OK] GAN Trainer initialized on device: {self.device}")
 
+    def _check_precision(self, precision: str) -> None:
+        if precision not in AUTOCAST_DTYPES:
+            raise ValueError(f"Unsupported precision '{precision}'. Choose one of: {list(AUTOCAST_DTYPES)}")
+        if precision == 'bf16' and self.device.type == 'cpu' and not native_bf16_supported():
+            logger.warning("[WARNING] bf16 requested but this CPU has no native bfloat16 support; "
+                           "expect it to be slower than fp32")
+
+    def autocast(self, precision: Optional[str] = None, cache_enabled: bool = True):
+        """
+        Autocast context for model forwards in `precision` (default: the trainer's); a no-op for fp32.
+
+        cache_enabled=False is required while tracing, so cast weights are not baked in as constants.
+        """
+        dtype = AUTOCAST_DTYPES[precision or self.precision]
+        return torch.autocast(device_type=self.device.type, dtype=dtype or torch.bfloat16, enabled=dtype is not None,
+                              cache_enabled=cache_enabled)
+
+    def run_generators(self, z: torch.Tensor, conditions: torch.Tensor,
+                       precision: Optional[str] = None):
+        """
+        Tabular and time series generator outputs for one batch, as float32 numpy arrays.
+
+        Runs in `precision` (default: the trainer's). The compiled serving modules in
+        `inference_modules` are only used in the trainer's own precision.
+        """
+        compiled = self.inference_modules if precision is None else {}
+        tab_gen = compiled.get('tab_gen', self.tab_gen)
+        ts_gen = compiled.get('ts_gen', self.ts_gen)
+        with torch.no_grad(), self.autocast(precision):
+            fake_tabular = tab_gen(z, conditions)
+            fake_timeseries = ts_gen(z, conditions)
+
+        return fake_tabular.float().cpu().numpy(), fake_timeseries.float().cpu().numpy()
+
     def compute_gradient_penalty(self, discriminator, real_data, fake_data, conditions):
         """Compute gradient penalty for Wasserstein GAN."""
         batch_size = real_data.size(0)
@@ -375,10 +475,12 @@ class GANTrainer:
         interpolates = alpha * real_data + (1 - alpha) * fake_data
         interpolates.requires_grad_(True)
 
-        # Get discriminator output
-        disc_interpolates = discriminator(interpolates, conditions)
+        # Get discriminator output (eagerly: compiled graphs do not support the double backward)
+        with self.autocast():
+            disc_interpolates = unwrap(discriminator)(interpolates, conditions)
 
-        # Compute gradients
+        # Compute gradients. This double-backward runs outside autocast (the AMP
+        # gradient-penalty recipe); the penalty itself is taken in float32
         gradients = torch.autograd.grad(
             outputs=disc_interpolates,
             inputs=interpolates,
@@ -389,249 +491,522 @@ class GANTrainer:
         )[0]
 
         # Flatten gradients
-        gradients = gradients.view(batch_size, -1)
+        gradients = gradients.float().view(batch_size, -1)
 
         # Compute gradient penalty
         gradient_penalty = ((gradients.norm(2, dim=1) - 1) ** 2).mean()
 
         return gradient_penalty
 
-    def train_gan(self, time_series_path: str, tabular_path: str, epochs: int = 100) -> Dict:
-        """Train all GAN models."""
+    def train_gan(self, time_series_path: str, tabular_path: str, epochs: int = 100,
+                  batch_size: int = BATCH_SIZE, log_interval: int = LOG_INTERVAL,
+                  epoch_callback: Optional[Callable[[int, Dict[str, float]], bool]] = None,
+                  parallel_families: bool = False, resume: bool = True, world_size: int = 1,
+                  precision: Optional[str] = None, compile_mode: str = 'eager') -> Dict:
+        """
+        Train all GAN models.
+
+        Args:
+            batch_size: Mini-batch size (capped at the number of patients).
+            log_interval: Steps between progress-bar loss updates (0 = per epoch only).
+                Losses are only read back from the device at this cadence.
+            epoch_callback: Called after every epoch with (epoch_number, epoch_losses).
+                Returning False stops training early; the final save is then skipped
+                so the best checkpoint on disk is kept.
+            parallel_families: Train the tabular, time series and cross-modal models
+                concurrently in separate processes pinned to disjoint CPU cores (see
+                parallel_training). The models are checkpointed once at the end
+                instead of on every improvement, and no resumable state is written.
+            resume: Continue from the resumable checkpoint left by an interrupted or
+                cancelled run, if there is one (sequential mode only). The checkpoint
+                is written every CHECKPOINT_INTERVAL epochs and on early stop, and
+                removed once training completes.
+            world_size: Number of local data-parallel worker processes (DDP over
+                gloo, see distributed_training). 1 trains in this process.
+            precision: Overrides the trainer's precision ('fp32' or 'bf16'). With bf16
+                the forwards run under autocast while weights, optimizer state,
+                losses and the gradient penalty stay float32, so checkpoints are
+                interchangeable with fp32 training.
+            compile_mode: 'compile' runs the model forwards of the training steps
+                through torch.compile (sequential mode only); the gradient penalty
+                stays eager. Falls back to eager per model if compilation fails.
+        """
+        if self.serving:
+            raise RuntimeError("A serving GANTrainer only holds the generators and cannot train")
+        if precision is not None:
+            self._check_precision(precision)
+            self.precision = precision
+        if parallel_families and world_size > 1:
+            raise ValueError("parallel_families and world_size > 1 cannot be combined")
+        if compile_mode != 'eager' and (parallel_families or world_size > 1):
+            raise ValueError("compile_mode is only supported for sequential training")
+
         logger.info("=" * 60)
         logger.info("Starting GAN training...")
-        logger.info(f"Epochs: {epochs} | Device: {self.device}")
+        logger.info(f"Epochs: {epochs} | Batch size: {batch_size} | Device: {self.device} | "
+                    f"Mode: {self._mode_name(parallel_families, world_size)} | Precision: {self.precision}")
         logger.info("=" * 60)
 
         # Load and preprocess data
         preprocessor = DiabetesDataPreprocessor()
-        merged_data = preprocessor.load_and_preprocess_data(time_series_path, tabular_path)
-        time_series, tabular, conditions, _ = preprocessor.preprocess_for_model(merged_data)
+        time_series, tabular, conditions, _ = preprocessor.load_training_tensors(time_series_path, tabular_path)
+        self._set_scaler_params(preprocessor.get_scaler_params())
 
         logger.info(f"[OK] Data loaded - Samples: {len(time_series)}")
         logger.info(f"[OK] Tabular features: {tabular.shape}")
         logger.info(f"[OK] Time series shape: {time_series.shape}")
 
-        # Create dataloader
-        dataloader = preprocessor.create_dataloader(time_series, tabular, conditions, conditions)
+        if world_size > 1:
+            from distributed_training import train_distributed
+            history, stopped_early = train_distributed(
+                self, (time_series, tabular, conditions), epochs, batch_size, log_interval, epoch_callback,
+                resume, world_size
+            )
+        elif parallel_families:
+            from parallel_training import train_families_parallel
+            history, stopped_early = train_families_parallel(
+                self, (time_series, tabular, conditions), epochs, batch_size, log_interval, epoch_callback
+            )
+        else:
+            history, stopped_early = self._train_sequential(
+                (time_series, tabular, conditions), epochs, batch_size, log_interval, epoch_callback, resume,
+                compile_mode
+            )
+
+        if stopped_early:
+            return history
+
+        # Save final models
+        self.save_models()
+        self._remove_checkpoint()
+        logger.info("=" * 60)
+        logger.info("[OK] GAN training completed successfully")
+        logger.info(f"[OK] Models saved to: {current_model_dir(MODEL_DIR)}")
+        logger.info("=" * 60)
+
+        return history
 
-        # Optimizers with recommended hyperparameters for WGAN-GP
-        tab_gen_opt = torch.optim.Adam(self.tab_gen.parameters(), lr=0.0001, betas=(0.5, 0.9))
-        tab_disc_opt = torch.optim.Adam(self.tab_disc.parameters(), lr=0.0001, betas=(0.5, 0.9))
-        ts_gen_opt = torch.optim.Adam(self.ts_gen.parameters(), lr=0.0001, betas=(0.5, 0.9))
-        ts_disc_opt = torch.optim.Adam(self.ts_disc.parameters(), lr=0.0001, betas=(0.5, 0.9))
-        cross_opt = torch.optim.Adam(self.cross_modal.parameters(), lr=0.0001, betas=(0.5, 0.9))
+    def _train_sequential(self, tensors: tuple, epochs: int, batch_size: int, log_interval: int,
+                          epoch_callback: Optional[Callable[[int, Dict[str, float]], bool]],
+                          resume: bool = True, compile_mode: str = 'eager') -> tuple:
+        """Train every family in one loop, saving the best checkpoint as it improves."""
+        # Training tensors live on the device; each epoch is one shuffle plus contiguous slices
+        batches = TensorBatchIterator(*tensors, batch_size=batch_size, device=self.device)
+        optimizers = self.make_optimizers()
 
         # Training history
-        history = {
-            'tab_gen_loss': [], 'tab_disc_loss': [],
-            'ts_gen_loss': [], 'ts_disc_loss': [],
-            'cross_modal_loss': []
+        history = {name: [] for name in self.LOSS_NAMES}
+        best_gen_loss = float('inf')
+        start_epoch = 0
+
+        if resume:
+            state = load_checkpoint(self.checkpoint_path())
+            if state is not None and self._restore_training_state(state, optimizers, len(tensors[0]),
+                                                                  batch_size, epochs):
+                history, best_gen_loss, start_epoch = state["history"], state["best_gen_loss"], state["epoch"]
+                logger.info(f"[OK] Resumed training from epoch {start_epoch}/{epochs}")
+
+        # Model and checkpoint files are written on a background thread from CPU snapshots
+        writer = CheckpointWriter()
+        try:
+            with self._compiled_models(compile_mode, batches):
+                # Training loop
+                for epoch in range(start_epoch, epochs):
+                    epoch_losses = self.train_epoch(batches, optimizers, f"Epoch {epoch+1}/{epochs}", log_interval)
+                    for name, value in epoch_losses.items():
+                        history[name].append(value)
+
+                    # Save best model based on generator loss
+                    current_gen_loss = (history['tab_gen_loss'][-1] + history['ts_gen_loss'][-1]) / 2
+                    if current_gen_loss < best_gen_loss:
+                        best_gen_loss = current_gen_loss
+                        states = self._model_states()
+                        writer.submit("models", lambda states=states: self._write_models(states))
+                        logger.info(f"[OK] Best models saved at epoch {epoch+1} with loss: {best_gen_loss:.4f}")
+
+                    self._log_epoch(epoch, epochs, history)
+
+                    stop = epoch_callback is not None and epoch_callback(epoch + 1, dict(epoch_losses)) is False
+                    if stop or (CHECKPOINT_INTERVAL and (epoch + 1) % CHECKPOINT_INTERVAL == 0):
+                        self._submit_checkpoint(writer, epoch + 1, optimizers, history, best_gen_loss,
+                                                len(tensors[0]), batch_size)
+
+                    if stop:
+                        logger.info(f"Training stopped after epoch {epoch+1}/{epochs} on request")
+                        return history, True
+
+                return history, False
+        finally:
+            writer.close()
+
+    @contextlib.contextmanager
+    def _compiled_models(self, compile_mode: str, batches: TensorBatchIterator):
+        """Swap in compiled versions of all models for the duration of training (no-op for eager)."""
+        if compile_mode == 'eager':
+            yield
+            return
+
+        ts_batch, tab_batch, cond_batch = (t[:batches.batch_size] for t in batches.tensors)
+        z = torch.randn(len(cond_batch), LATENT_DIM, device=self.device)
+        example_inputs = {
+            'tab_gen': (z, cond_batch),
+            'tab_disc': (tab_batch, cond_batch),
+            'ts_gen': (z, cond_batch),
+            'ts_disc': (ts_batch, cond_batch),
+            'cross_modal': (tab_batch, ts_batch, cond_batch)
         }
 
-        best_gen_loss = float('inf')
+        originals = {name: getattr(self, name) for name in self.MODEL_FILES}
+        try:
+            logger.info(f"Compiling models for training ({compile_mode})...")
+            with self.autocast():
+                for name, model in originals.items():
+                    setattr(self, name, compile_for_training(model, compile_mode, example_inputs[name]))
+            yield
+        finally:
+            for name, model in originals.items():
+                setattr(self, name, model)
+
+    # ==================== RESUMABLE CHECKPOINTS ====================
+    def checkpoint_path(self) -> str:
+        return os.path.join(MODEL_DIR, "checkpoints", "training_state.pt")
+
+    def _submit_checkpoint(self, writer: CheckpointWriter, epoch: int, optimizers: Dict[str, torch.optim.Optimizer],
+                           history: Dict[str, list], best_gen_loss: float, num_samples: int, batch_size: int,
+                           world_size: int = 1) -> None:
+        """Snapshot the full training state now and write it atomically in the background."""
+        state = {
+            "epoch": epoch,
+            "models": self._model_states(),
+            "optimizers": {name: cpu_copy(opt.state_dict()) for name, opt in optimizers.items()},
+            "history": {name: list(values) for name, values in history.items()},
+            "best_gen_loss": best_gen_loss,
+            "rng": capture_rng_state(),
+            "num_samples": num_samples,
+            "batch_size": batch_size,
+            "precision": self.precision,
+            "world_size": world_size
+        }
+        path = self.checkpoint_path()
 
-        # Training loop
-        for epoch in range(epochs):
-            tab_gen_losses, tab_disc_losses = [], []
-            ts_gen_losses, ts_disc_losses = [], []
-            cross_losses = []
+        def write():
+            atomic_torch_save(state, path)
+            logger.info(f"[OK] Training checkpoint saved at epoch {epoch}: {path}")
 
-            pbar = tqdm(dataloader, desc=f"Epoch {epoch+1}/{epochs}")
+        writer.submit("checkpoint", write)
 
-            for batch_idx, (ts_batch, tab_batch, cond_batch, _) in enumerate(pbar):
-                ts_batch = ts_batch.to(self.device)
-                tab_batch = tab_batch.to(self.device)
-                cond_batch = cond_batch.to(self.device)
-                batch_size = ts_batch.size(0)
+    def _restore_training_state(self, state: Dict, optimizers: Dict[str, torch.optim.Optimizer],
+                                num_samples: int, batch_size: int, epochs: int, world_size: int = 1) -> bool:
+        """
+        Load a checkpoint into the models and optimizers. Returns False if it does not fit this run.
 
-                # ============ Train Tabular Discriminator ============
-                for _ in range(self.n_critic):
-                    tab_disc_opt.zero_grad()
+        The checkpoint only fits a run with the same data size, batch size,
+        precision and world size, that has epochs left to train; anything else
+        starts from scratch rather than silently continuing a different run.
+        """
+        expected = {"num_samples": num_samples, "batch_size": batch_size, "precision": self.precision,
+                    "world_size": world_size}
+        mismatches = [f"{key} {state.get(key)} (this run: {value})"
+                      for key, value in expected.items() if state.get(key) != value]
+        if mismatches:
+            logger.warning(f"[WARNING] Training checkpoint was taken with {', '.join(mismatches)}; "
+                           f"starting from scratch")
+            return False
+        if state.get("epoch", 0) >= epochs:
+            logger.warning(f"[WARNING] Training checkpoint is already at epoch {state.get('epoch')} of the "
+                           f"{epochs} requested; starting from scratch")
+            return False
 
-                    # Generate fake tabular data
-                    z = torch.randn(batch_size, LATENT_DIM, device=self.device)
-                    fake_tab = self.tab_gen(z, cond_batch)
+        try:
+            for name, model_state in state["models"].items():
+                getattr(self, name).load_state_dict(model_state)
+            for name, opt_state in state["optimizers"].items():
+                optimizers[name].load_state_dict(opt_state)
+            restore_rng_state(state["rng"])
+        except (KeyError, RuntimeError, ValueError) as e:
+            logger.warning(f"[WARNING] Training checkpoint does not match the current models ({str(e)}); "
+                           f"starting from scratch")
+            return False
 
-                    # Discriminator outputs
-                    real_validity = self.tab_disc(tab_batch, cond_batch)
-                    fake_validity = self.tab_disc(fake_tab.detach(), cond_batch)
+        return True
+
+    def _remove_checkpoint(self) -> None:
+        path = self.checkpoint_path()
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"[OK] Removed training checkpoint: {path}")
+
+    @staticmethod
+    def _mode_name(parallel_families: bool, world_size: int) -> str:
+        if world_size > 1:
+            return f"distributed ({world_size} processes)"
+        return 'parallel families' if parallel_families else 'sequential'
+
+    @staticmethod
+    def _log_epoch(epoch: int, epochs: int, history: Dict[str, list]) -> None:
+        # Log progress
+        if (epoch + 1) % 10 == 0:
+            logger.info(f"Epoch {epoch+1}/{epochs} - "
+                       f"TabGenLoss: {history['tab_gen_loss'][-1]:.4f}, "
+                       f"TsGenLoss: {history['ts_gen_loss'][-1]:.4f}, "
+                       f"CrossLoss: {history['cross_modal_loss'][-1]:.4f}")
+
+    def make_optimizers(self, families: tuple = FAMILY_ORDER) -> Dict[str, torch.optim.Optimizer]:
+        """Adam optimizers with recommended hyperparameters for WGAN-GP, keyed by model name."""
+        return {
+            name: torch.optim.Adam(getattr(self, name).parameters(), lr=0.0001, betas=(0.5, 0.9))
+            for family in families for name in self.FAMILY_MODELS[family]
+        }
 
-                    # Gradient penalty
-                    gp = self.compute_gradient_penalty(self.tab_disc, tab_batch, fake_tab, cond_batch)
+    def train_epoch(self, batches, optimizers: Dict[str, torch.optim.Optimizer], desc: str,
+                    log_interval: int = LOG_INTERVAL, families: tuple = FAMILY_ORDER,
+                    show_progress: bool = True) -> Dict[str, float]:
+        """Run one epoch over `batches` for the given families and return their mean losses."""
+        loss_names = [name for family in families for name in self.FAMILY_LOSSES[family]]
+        # Each step adds n_critic discriminator losses and one of every other loss
+        losses_per_step = torch.tensor(
+            [self.n_critic if name.endswith('disc_loss') else 1 for name in loss_names],
+            dtype=torch.float64, device=self.device
+        )
+        labels = [self.LOSS_LABELS[self.LOSS_NAMES.index(name)] for name in loss_names]
+
+        # Losses stay on the device and are only read back every log_interval steps
+        # and once at the end of the epoch
+        epoch_sums = torch.zeros(len(loss_names), dtype=torch.float64, device=self.device)
+        window_sums = torch.zeros_like(epoch_sums)
+        window_steps = 0
+
+        pbar = tqdm(batches, desc=desc, disable=not show_progress)
+
+        for ts_batch, tab_batch, cond_batch in pbar:
+            step_losses = self._train_step(ts_batch, tab_batch, cond_batch, optimizers, families)
+            epoch_sums += step_losses
+            window_sums += step_losses
+            window_steps += 1
+
+            # Update progress bar
+            if log_interval and window_steps == log_interval:
+                window_means = (window_sums / (losses_per_step * window_steps)).tolist()
+                pbar.set_postfix({label: f'{value:.4f}' for label, value in zip(labels, window_means)})
+                window_sums.zero_()
+                window_steps = 0
+
+        epoch_means = (epoch_sums / (losses_per_step * max(len(batches), 1))).tolist()
+        return dict(zip(loss_names, epoch_means))
+
+    def _train_step(self, ts_batch: torch.Tensor, tab_batch: torch.Tensor, cond_batch: torch.Tensor,
+                    optimizers: Dict[str, torch.optim.Optimizer], families: tuple = FAMILY_ORDER) -> torch.Tensor:
+        """
+        One WGAN-GP step for the given model families on a shared batch.
 
-                    # Wasserstein loss
-                    tab_disc_loss = -torch.mean(real_validity) + torch.mean(fake_validity) + self.lambda_gp * gp
+        Returns the detached losses as a float64 tensor on the training device,
+        ordered by family and then FAMILY_LOSSES, with discriminator losses summed
+        over the n_critic updates. Nothing here reads values back to the host.
+        """
+        steps = {
+            'tabular': self._train_tabular_step,
+            'timeseries': self._train_timeseries_step,
+            'cross_modal': self._train_cross_modal_step
+        }
+        return torch.cat([steps[family](ts_batch, tab_batch, cond_batch, optimizers) for family in families]).double()
 
-                    tab_disc_loss.backward()
-                    torch.nn.utils.clip_grad_norm_(self.tab_disc.parameters(), max_norm=1.0)
-                    tab_disc_opt.step()
+    def _train_tabular_step(self, ts_batch, tab_batch, cond_batch, optimizers) -> torch.Tensor:
+        tab_gen_opt, tab_disc_opt = optimizers['tab_gen'], optimizers['tab_disc']
+        current_batch_size = tab_batch.size(0)
+        tab_disc_total = torch.zeros((), device=self.device)
 
-                    tab_disc_losses.append(tab_disc_loss.item())
+        # ============ Train Tabular Discriminator ============
+        for _ in range(self.n_critic):
+            tab_disc_opt.zero_grad()
 
-                # ============ Train Tabular Generator ============
-                tab_gen_opt.zero_grad()
-                z = torch.randn(batch_size, LATENT_DIM, device=self.device)
-                fake_tab = self.tab_gen(z, cond_batch)
-                fake_validity = self.tab_disc(fake_tab, cond_batch)
+            # Generate fake tabular data
+            z = torch.randn(current_batch_size, LATENT_DIM, device=self.device)
+            with self.autocast():
+                fake_tab = self.tab_gen(z, cond_batch).float()
 
-                tab_gen_loss = -torch.mean(fake_validity)
+                # Discriminator outputs
+                real_validity = self.tab_disc(tab_batch, cond_batch).float()
+                fake_validity = self.tab_disc(fake_tab.detach(), cond_batch).float()
 
-                tab_gen_loss.backward()
-                torch.nn.utils.clip_grad_norm_(self.tab_gen.parameters(), max_norm=1.0)
-                tab_gen_opt.step()
+            # Gradient penalty
+            gp = self.compute_gradient_penalty(self.tab_disc, tab_batch, fake_tab, cond_batch)
 
-                tab_gen_losses.append(tab_gen_loss.item())
+            # Wasserstein loss
+            tab_disc_loss = -torch.mean(real_validity) + torch.mean(fake_validity) + self.lambda_gp * gp
 
-                # ============ Train Time Series Discriminator ============
-                for _ in range(self.n_critic):
-                    ts_disc_opt.zero_grad()
+            tab_disc_loss.backward()
+            torch.nn.utils.clip_grad_norm_(self.tab_disc.parameters(), max_norm=1.0)
+            tab_disc_opt.step()
 
-                    z = torch.randn(batch_size, LATENT_DIM, device=self.device)
-                    fake_ts = self.ts_gen(z, cond_batch)
+            tab_disc_total += tab_disc_loss.detach()
 
-                    real_validity = self.ts_disc(ts_batch, cond_batch)
-                    fake_validity = self.ts_disc(fake_ts.detach(), cond_batch)
+        # ============ Train Tabular Generator ============
+        tab_gen_opt.zero_grad()
+        z = torch.randn(current_batch_size, LATENT_DIM, device=self.device)
+        with self.autocast():
+            fake_tab = self.tab_gen(z, cond_batch)
+            fake_validity = self.tab_disc(fake_tab, cond_batch).float()
 
-                    gp = self.compute_gradient_penalty(self.ts_disc, ts_batch, fake_ts, cond_batch)
+        tab_gen_loss = -torch.mean(fake_validity)
 
-                    ts_disc_loss = -torch.mean(real_validity) + torch.mean(fake_validity) + self.lambda_gp * gp
+        tab_gen_loss.backward()
+        torch.nn.utils.clip_grad_norm_(self.tab_gen.parameters(), max_norm=1.0)
+        tab_gen_opt.step()
 
-                    ts_disc_loss.backward()
-                    torch.nn.utils.clip_grad_norm_(self.ts_disc.parameters(), max_norm=1.0)
-                    ts_disc_opt.step()
+        return torch.stack([tab_disc_total, tab_gen_loss.detach()])
 
-                    ts_disc_losses.append(ts_disc_loss.item())
+    def _train_timeseries_step(self, ts_batch, tab_batch, cond_batch, optimizers) -> torch.Tensor:
+        ts_gen_opt, ts_disc_opt = optimizers['ts_gen'], optimizers['ts_disc']
+        current_batch_size = ts_batch.size(0)
+        ts_disc_total = torch.zeros((), device=self.device)
 
-                # ============ Train Time Series Generator ============
-                ts_gen_opt.zero_grad()
-                z = torch.randn(batch_size, LATENT_DIM, device=self.device)
-                fake_ts = self.ts_gen(z, cond_batch)
-                fake_validity = self.ts_disc(fake_ts, cond_batch)
+        # ============ Train Time Series Discriminator ============
+        for _ in range(self.n_critic):
+            ts_disc_opt.zero_grad()
 
-                ts_gen_loss = -torch.mean(fake_validity)
+            z = torch.randn(current_batch_size, LATENT_DIM, device=self.device)
+            with self.autocast():
+                fake_ts = self.ts_gen(z, cond_batch).float()
 
-                ts_gen_loss.backward()
-                torch.nn.utils.clip_grad_norm_(self.ts_gen.parameters(), max_norm=1.0)
-                ts_gen_opt.step()
+                real_validity = self.ts_disc(ts_batch, cond_batch).float()
+                fake_validity = self.ts_disc(fake_ts.detach(), cond_batch).float()
 
-                ts_gen_losses.append(ts_gen_loss.item())
+            gp = self.compute_gradient_penalty(self.ts_disc, ts_batch, fake_ts, cond_batch)
 
-                # ============ Train Cross-Modal Generator ============
-                cross_opt.zero_grad()
+            ts_disc_loss = -torch.mean(real_validity) + torch.mean(fake_validity) + self.lambda_gp * gp
 
-                # Tabular to Time Series
-                fake_ts_from_tab = self.cross_modal.generate_ts_from_tab(tab_batch, cond_batch)
-                ts_reconstruction_loss = nn.MSELoss()(fake_ts_from_tab, ts_batch)
+            ts_disc_loss.backward()
+            torch.nn.utils.clip_grad_norm_(self.ts_disc.parameters(), max_norm=1.0)
+            ts_disc_opt.step()
 
-                # Time Series to Tabular
-                fake_tab_from_ts = self.cross_modal.generate_tab_from_ts(ts_batch, cond_batch)
-                tab_reconstruction_loss = nn.MSELoss()(fake_tab_from_ts, tab_batch)
+            ts_disc_total += ts_disc_loss.detach()
 
-                cross_modal_loss = ts_reconstruction_loss + tab_reconstruction_loss
+        # ============ Train Time Series Generator ============
+        ts_gen_opt.zero_grad()
+        z = torch.randn(current_batch_size, LATENT_DIM, device=self.device)
+        with self.autocast():
+            fake_ts = self.ts_gen(z, cond_batch)
+            fake_validity = self.ts_disc(fake_ts, cond_batch).float()
 
-                cross_modal_loss.backward()
-                torch.nn.utils.clip_grad_norm_(self.cross_modal.parameters(), max_norm=1.0)
-                cross_opt.step()
+        ts_gen_loss = -torch.mean(fake_validity)
 
-                cross_losses.append(cross_modal_loss.item())
+        ts_gen_loss.backward()
+        torch.nn.utils.clip_grad_norm_(self.ts_gen.parameters(), max_norm=1.0)
+        ts_gen_opt.step()
 
-                # Update progress bar
-                pbar.set_postfix({
-                    'TabD': f'{np.mean(tab_disc_losses[-10:]):.4f}',
-                    'TabG': f'{np.mean(tab_gen_losses[-10:]):.4f}',
-                    'TsD': f'{np.mean(ts_disc_losses[-10:]):.4f}',
-                    'TsG': f'{np.mean(ts_gen_losses[-10:]):.4f}',
-                    'Cross': f'{np.mean(cross_losses[-10:]):.4f}'
-                })
+        return torch.stack([ts_disc_total, ts_gen_loss.detach()])
 
-            # Record epoch losses
-            history['tab_gen_loss'].append(np.mean(tab_gen_losses))
-            history['tab_disc_loss'].append(np.mean(tab_disc_losses))
-            history['ts_gen_loss'].append(np.mean(ts_gen_losses))
-            history['ts_disc_loss'].append(np.mean(ts_disc_losses))
-            history['cross_modal_loss'].append(np.mean(cross_losses))
+    def _train_cross_modal_step(self, ts_batch, tab_batch, cond_batch, optimizers) -> torch.Tensor:
+        cross_opt = optimizers['cross_modal']
 
-            # Save best model based on generator loss
-            current_gen_loss = (np.mean(tab_gen_losses) + np.mean(ts_gen_losses)) / 2
-            if current_gen_loss < best_gen_loss:
-                best_gen_loss = current_gen_loss
-                self.save_models()
-                logger.info(f"[OK] Best models saved at epoch {epoch+1} with loss: {best_gen_loss:.4f}")
+        # ============ Train Cross-Modal Generator ============
+        cross_opt.zero_grad()
 
-            # Log progress
-            if (epoch + 1) % 10 == 0:
-                logger.info(f"Epoch {epoch+1}/{epochs} - "
-                           f"TabGenLoss: {history['tab_gen_loss'][-1]:.4f}, "
-                           f"TsGenLoss: {history['ts_gen_loss'][-1]:.4f}, "
-                           f"CrossLoss: {history['cross_modal_loss'][-1]:.4f}")
+        # Tabular to Time Series and Time Series to Tabular (one forward, so DDP can track it)
+        with self.autocast():
+            fake_ts_from_tab, fake_tab_from_ts = self.cross_modal(tab_batch, ts_batch, cond_batch)
+        ts_reconstruction_loss = nn.MSELoss()(fake_ts_from_tab.float(), ts_batch)
+        tab_reconstruction_loss = nn.MSELoss()(fake_tab_from_ts.float(), tab_batch)
 
-        # Save final models
-        self.save_models()
-        logger.info("=" * 60)
-        logger.info("[OK] GAN training completed successfully")
-        logger.info(f"[OK] Models saved to: {MODEL_DIR}")
-        logger.info("=" * 60)
+        cross_modal_loss = ts_reconstruction_loss + tab_reconstruction_loss
 
-        return history
+        cross_modal_loss.backward()
+        torch.nn.utils.clip_grad_norm_(self.cross_modal.parameters(), max_norm=1.0)
+        cross_opt.step()
+
+        return cross_modal_loss.detach().reshape(1)
+
+    # Model attribute -> weights file
+    MODEL_FILES = {
+        "tab_gen": "tabular_generator.pth",
+        "tab_disc": "tabular_discriminator.pth",
+        "ts_gen": "timeseries_generator.pth",
+        "ts_disc": "timeseries_discriminator.pth",
+        "cross_modal": "cross_modal_generator.pth"
+    }
 
     def save_models(self):
         """Save all GAN models with detailed logging."""
-        os.makedirs(MODEL_DIR, exist_ok=True)
-        
-        model_files = {
-            "tabular_generator.pth": self.tab_gen.state_dict(),
-            "tabular_discriminator.pth": self.tab_disc.state_dict(),
-            "timeseries_generator.pth": self.ts_gen.state_dict(),
-            "timeseries_discriminator.pth": self.ts_disc.state_dict(),
-            "cross_modal_generator.pth": self.cross_modal.state_dict()
-        }
-        
-        for filename, state_dict in model_files.items():
-            filepath = os.path.join(MODEL_DIR, filename)
-            torch.save(state_dict, filepath)
-            logger.info(f"[OK] Saved: {filepath}")
+        self._write_models(self._model_states())
+
+    def _model_states(self) -> Dict[str, Dict[str, torch.Tensor]]:
+        """CPU snapshot of every model's state_dict (unwrapped if training under DDP or torch.compile)."""
+        states = {}
+        for name in self.MODEL_FILES:
+            model = getattr(self, name)
+            if isinstance(model, DistributedDataParallel):
+                model = model.module
+            states[name] = cpu_copy(unwrap(model).state_dict())
+        return states
+
+    def _write_models(self, states: Dict[str, Dict[str, torch.Tensor]]):
+        # Weights and scalers are published as one set (see publish_model_set), so a
+        # concurrent reload, even from another process, never loads a partial or mixed set
+        def write(directory: str):
+            for name, filename in self.MODEL_FILES.items():
+                atomic_torch_save(states[name], os.path.join(directory, filename))
+            if self.scaler_params:
+                atomic_write_json(self.scaler_params, os.path.join(directory, "scalers.json"))
+
+        path = publish_model_set(MODEL_DIR, write, keep=MODEL_SETS_TO_KEEP)
+        logger.info(f"[OK] Saved models: {path}")
+
+    def _set_scaler_params(self, scaler_params: Optional[dict]):
+        self.scaler_params = scaler_params or None
+        self.inverse_scaling = None
+        if self.scaler_params:
+            try:
+                self.inverse_scaling = InverseScaling(self.scaler_params)
+            except (KeyError, IndexError, TypeError, ZeroDivisionError) as e:
+                logger.warning(f"[WARNING] Incomplete scaler parameters ({str(e)}); "
+                               f"falling back to heuristic denormalization")
+
+    # Models a serving trainer builds and loads
+    SERVING_MODELS = ("tab_gen", "ts_gen")
 
     def load_models(self):
-        """Load all GAN models with proper device mapping and detailed logging."""
+        """
+        Load the GAN models with proper device mapping and detailed logging.
+
+        A serving trainer loads only the generators. Weights are loaded with
+        weights_only=True and memory-mapped (see load_weights); the serving
+        generators take the loaded tensors as-is instead of copying them.
+        """
         try:
             # Check if model files exist
-            model_files = [
-                f"{MODEL_DIR}/tabular_generator.pth",
-                f"{MODEL_DIR}/timeseries_generator.pth",
-                f"{MODEL_DIR}/cross_modal_generator.pth"
-            ]
+            # Resolved once, so every file comes from the same published set
+            model_set = current_model_set(MODEL_DIR)
+            model_dir = model_set_dir(MODEL_DIR, model_set)
+            names = self.SERVING_MODELS if self.serving else tuple(self.MODEL_FILES)
+            model_files = {name: os.path.join(model_dir, self.MODEL_FILES[name]) for name in names}
 
-            missing_files = [f for f in model_files if not os.path.exists(f)]
+            missing_files = [f for f in model_files.values() if not os.path.exists(f)]
             if missing_files:
                 logger.warning(f"[WARNING] GAN model files not found: {missing_files}")
                 return False
 
             # Load with proper device mapping
-            logger.info(f"Loading GAN models from: {MODEL_DIR}")
-            
-            self.tab_gen.load_state_dict(
-                torch.load(f"{MODEL_DIR}/tabular_generator.pth", map_location=self.device)
-            )
-            self.tab_disc.load_state_dict(
-                torch.load(f"{MODEL_DIR}/tabular_discriminator.pth", map_location=self.device)
-            )
-            self.ts_gen.load_state_dict(
-                torch.load(f"{MODEL_DIR}/timeseries_generator.pth", map_location=self.device)
-            )
-            self.ts_disc.load_state_dict(
-                torch.load(f"{MODEL_DIR}/timeseries_discriminator.pth", map_location=self.device)
-            )
-            self.cross_modal.load_state_dict(
-                torch.load(f"{MODEL_DIR}/cross_modal_generator.pth", map_location=self.device)
-            )
+            logger.info(f"Loading GAN models from: {model_dir}")
+
+            for name, path in model_files.items():
+                getattr(self, name).load_state_dict(load_weights(path, self.device), assign=self.serving)
+
+            # Fitted scalers (absent in checkpoints saved before they were persisted)
+            scaler_path = os.path.join(model_dir, "scalers.json")
+            if os.path.exists(scaler_path):
+                with open(scaler_path, "r", encoding="utf-8") as f:
+                    self._set_scaler_params(json.load(f))
+            else:
+                self._set_scaler_params(None)
+                logger.warning("[WARNING] Checkpoint has no scalers.json; using heuristic denormalization")
 
             # Set to evaluation mode
-            self.tab_gen.eval()
-            self.ts_gen.eval()
-            self.cross_modal.eval()
+            for model in (self.tab_gen, self.ts_gen, self.cross_modal):
+                if model is not None:
+                    model.eval()
 
-            logger.info(f"[OK] GAN models loaded successfully from {MODEL_DIR}")
+            self.model_set = model_set
+            logger.info(f"[OK] GAN models loaded successfully from {model_dir}")
             return True
 
         except Exception as e:
@@ -379,43 +379,479 @@
 #         return preview
 # import os
 import logging
+import threading
+import time
+import copy
 import numpy as np
 import pandas as pd
 import torch
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Iterator, Tuple
 import os
 from gan_trainer import GANTrainer
-from config import OUTPUT_DIR, SEQ_LENGTH, LATENT_DIM
+from training_checkpoint import current_model_set
+from data_utils import MODEL_TABULAR_FEATURES, InverseScaling
+from model_compiler import compile_for_inference, quantize_dynamic_int8, state_dict_bytes
+from config import OUTPUT_DIR, MODEL_DIR, SEQ_LENGTH, LATENT_DIM, COND_FEATURES, INFERENCE_PRECISION, \
+    BF16_MAX_DRIFT, INFERENCE_COMPILE_MODE, INFERENCE_BACKEND, INFERENCE_QUANTIZATION, INT8_MAX_DRIFT
+
+# Serving backends: each provides load_models(), run_generators(z, conditions, precision),
+# inverse_scaling and the precision / inference_modules attributes
+INFERENCE_BACKENDS = ('torch', 'onnx')
+QUANTIZATION_MODES = ('none', 'dynamic_int8')
 
 logger = logging.getLogger(__name__)
 
+# ==================== DATASET WRITERS ====================
+# Storage types used by the columnar writers. CSV keeps the legacy text layout
+# (including the "systolic/diastolic" hypertension string) for compatibility.
+COLUMNAR_DTYPES = {
+    'age': np.int8,
+    'bmi': np.float32,
+    'average_rbs': np.float32,
+    'hba1c': np.float32,
+    'systolic': np.int16,
+    'diastolic': np.int16,
+    'respiratory_rate': np.int8,
+    'heart_rate': np.int16,
+    'spo2': np.float32,
+    'diabetes': np.int8,
+    'bp_status': np.int8,
+    'rbs_value': np.float32
+}
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a generated table to typed columns (split BP integers, narrow numeric types)."""
+    df = df.copy()
+    if 'hypertension' in df.columns:
+        position = df.columns.get_loc('hypertension')
+        blood_pressure = df.pop('hypertension').str.split('/', n=1, expand=True)
+        df.insert(position, 'systolic', blood_pressure[0])
+        df.insert(position + 1, 'diastolic', blood_pressure[1])
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.astype({col: dtype for col, dtype in COLUMNAR_DTYPES.items() if col in df.columns})
+
+
+def _require_pyarrow(output_format: str):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(f"Output format '{output_format}' requires pyarrow. Install it with: pip install pyarrow") from e
+
+
+class DatasetWriter:
+    """Base class for synthetic dataset writers. Subclasses implement one file format."""
+    extension = ''
+    compressions = (None,)
+
+    def __init__(self, compression: Optional[str] = None, row_group_size: Optional[int] = None):
+        if compression not in self.compressions:
+            raise ValueError(
+                f"Unsupported compression '{compression}' for {self.extension}. "
+                f"Choose one of: {[c for c in self.compressions if c is not None] or 'none'}"
+            )
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @property
+    def suffix(self) -> str:
+        """File suffix including the leading dot."""
+        return f".{self.extension}"
+
+    def write(self, df: pd.DataFrame, path: str) -> None:
+        raise NotImplementedError
+
+
+class CSVWriter(DatasetWriter):
+    """Plain CSV in the legacy layout, optionally compressed."""
+    extension = 'csv'
+    compressions = (None, 'gzip', 'bz2', 'zip', 'xz', 'zstd')
+    _compression_suffixes = {'gzip': '.gz', 'bz2': '.bz2', 'zip': '.zip', 'xz': '.xz', 'zstd': '.zst'}
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.extension}{self._compression_suffixes.get(self.compression, '')}"
+
+    def write(self, df: pd.DataFrame, path: str) -> None:
+        df.to_csv(path, index=False, compression=self.compression)
+
+
+class ParquetWriter(DatasetWriter):
+    """Typed Parquet with configurable codec and row-group size."""
+    extension = 'parquet'
+    compressions = ('zstd', 'snappy', 'gzip', 'brotli', 'lz4', None)
+
+    def __init__(self, compression: Optional[str] = 'zstd', row_group_size: Optional[int] = None):
+        _require_pyarrow(self.extension)
+        super().__init__(compression, row_group_size)
+
+    def write(self, df: pd.DataFrame, path: str) -> None:
+        to_columnar(df).to_parquet(
+            path, engine='pyarrow', index=False,
+            compression=self.compression, row_group_size=self.row_group_size
+        )
+
+
+class ArrowWriter(DatasetWriter):
+    """Typed Arrow IPC (Feather v2) file; row_group_size sets the record batch length."""
+    extension = 'feather'
+    compressions = ('zstd', 'lz4', None)
+
+    def __init__(self, compression: Optional[str] = 'zstd', row_group_size: Optional[int] = None):
+        _require_pyarrow(self.extension)
+        super().__init__(compression, row_group_size)
+
+    def write(self, df: pd.DataFrame, path: str) -> None:
+        options = {'compression': self.compression or 'uncompressed'}
+        if self.row_group_size:
+            options['chunksize'] = self.row_group_size
+        to_columnar(df).reset_index(drop=True).to_feather(path, **options)
+
+
+class NPZWriter(DatasetWriter):
+    """Typed NumPy archive with one array per column (timestamps as datetime64)."""
+    extension = 'npz'
+    compressions = ('zip', None)
+
+    def __init__(self, compression: Optional[str] = 'zip', row_group_size: Optional[int] = None):
+        super().__init__(compression, row_group_size)
+
+    def write(self, df: pd.DataFrame, path: str) -> None:
+        columns = {}
+        for col, series in to_columnar(df).items():
+            values = series.to_numpy()
+            if values.dtype == object or pd.api.types.is_string_dtype(series):
+                values = values.astype(str)
+            columns[col] = values
+        save = np.savez_compressed if self.compression == 'zip' else np.savez
+        save(path, **columns)
+
+
+WRITERS = {
+    'csv': CSVWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowWriter,
+    'feather': ArrowWriter,
+    'npz': NPZWriter
+}
+
+
+def register_writer(output_format: str, writer_cls: type) -> None:
+    """Make a DatasetWriter subclass available under `output_format`."""
+    WRITERS[output_format] = writer_cls
+
+
+def get_writer(output_format: str = 'csv', compression: Optional[str] = None,
+               row_group_size: Optional[int] = None) -> DatasetWriter:
+    """Instantiate the writer for `output_format`, keeping its default compression if none is given."""
+    if output_format not in WRITERS:
+        raise ValueError(f"Unsupported output format '{output_format}'. Choose one of: {sorted(WRITERS)}")
+    writer_cls = WRITERS[output_format]
+    options = {'row_group_size': row_group_size}
+    if compression is not None:
+        options['compression'] = None if compression == 'none' else compression
+    return writer_cls(**options)
+
+
 class DiabetesDataGenerator:
     """GAN-based generator for synthetic diabetes data (NO STATISTICAL FALLBACK)."""
     
-    def __init__(self):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.gan_trainer = GANTrainer()
+    # Patients pushed through freshly loaded weights before they go live
+    WARMUP_SAMPLES = 8
+
+    def __init__(self, precision: str = INFERENCE_PRECISION, compile_mode: str = INFERENCE_COMPILE_MODE,
+                 backend: str = INFERENCE_BACKEND, quantization: str = INFERENCE_QUANTIZATION):
+        """
+        Args:
+            precision: Requested generator precision ('fp32' or 'bf16'). bf16 is
+                validated against fp32 whenever models are loaded (see
+                precision_report) and falls back to fp32 if it drifts too far.
+            compile_mode: 'eager', 'compile' or 'script' (see model_compiler). The
+                generators are compiled and warmed up whenever models are loaded,
+                so requests never pay compilation latency.
+            backend: 'torch' (GANTrainer) or 'onnx' (ONNX Runtime over the exported
+                generators, see onnx_backend). precision and compile_mode only
+                apply to 'torch'; the onnx backend always serves fp32.
+            quantization: 'none' or 'dynamic_int8' (int8 Linear/LSTM weights in the
+                serving generators, torch backend on CPU). Checked against fp32
+                whenever models are loaded (see quantization_report) and dropped
+                if the cohort drifts too far. Requires precision 'fp32'.
+        """
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unsupported inference backend '{backend}'. Choose one of: {list(INFERENCE_BACKENDS)}")
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization '{quantization}'. Choose one of: {list(QUANTIZATION_MODES)}")
+        if quantization != 'none' and precision != 'fp32':
+            raise ValueError("int8 quantization serves fp32 activations; use precision 'fp32'")
+        self.backend = backend
+        self.quantization = quantization
+        self.device = torch.device("cuda" if torch.cuda.is_available() and backend == 'torch' else "cpu")
+        self.requested_precision = precision
+        self.compile_mode = compile_mode
+        self.gan_trainer = self._new_backend()
         
         # Try to load pretrained models
-        self.models_loaded = self.gan_trainer.load_models()
+        self.models_loaded = self._load_backend(self.gan_trainer)
+        self.model_version = 1 if self.models_loaded else 0
+        self.models_loaded_at = datetime.now().isoformat() if self.models_loaded else None
+        self._reload_lock = threading.Lock()
         
         if self.models_loaded:
+            self.gan_trainer.precision = self._select_precision(self.gan_trainer)
+            self.gan_trainer = self._quantize_generators(self.gan_trainer)
+            self._compile_generators(self.gan_trainer)
             logger.info("[OK] Using pretrained GAN models for generation")
         else:
             logger.warning("[WARNING] GAN models not found. Train models using /api/v1/train/gan first.")
 
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    @property
+    def model_set(self) -> Optional[str]:
+        """Published model set being served (see training_checkpoint.current_model_set)."""
+        return getattr(self.gan_trainer, 'model_set', None)
+
+    @property
+    def models_current(self) -> bool:
+        """Whether the served models are the currently published set on disk."""
+        return self.models_loaded and self.model_set == current_model_set(MODEL_DIR)
+
+    def _new_backend(self):
+        """An empty (unloaded) trainer or ONNX Runtime backend, per self.backend."""
+        if self.backend == 'onnx':
+            from onnx_backend import OnnxGeneratorBackend
+            return OnnxGeneratorBackend()
+        return GANTrainer(serving=True)
+
+    def _load_backend(self, trainer) -> bool:
+        """Load the current model set into `trainer`, exporting it to ONNX first for the onnx backend."""
+        if self.backend == 'onnx':
+            from onnx_backend import export_current_models
+            if not export_current_models():
+                logger.warning("[WARNING] Could not export the current model set to ONNX")
+        return trainer.load_models()
+
+    @property
+    def precision(self) -> str:
+        """Precision the live generators run in."""
+        return self.gan_trainer.precision
+
+    # Batch sizes run while compiling: the warm-up size and the generation batch
+    COMPILE_WARMUP_BATCHES = (WARMUP_SAMPLES, 100)
+
+    def _compile_generators(self, trainer: GANTrainer) -> None:
+        """Compile and warm up the serving generators in the trainer's precision."""
+        trainer.inference_modules = {}
+        if self.compile_mode == 'eager' or not isinstance(trainer, GANTrainer):
+            return
+
+        example_inputs = []
+        for batch_size in self.COMPILE_WARMUP_BATCHES:
+            conditions = self._generate_conditions(batch_size, 0.5).to(self.device)
+            example_inputs.append((torch.randn(batch_size, LATENT_DIM, device=self.device), conditions))
+
+        # Compiled kernels round differently; allow for bf16's 8-bit mantissa
+        atol = 1e-4 if trainer.precision == 'fp32' else 2e-2
+        for name in ('tab_gen', 'ts_gen'):
+            compiled, mode = compile_for_inference(
+                getattr(trainer, name), self.compile_mode, example_inputs,
+                autocast=lambda: trainer.autocast(cache_enabled=False), atol=atol
+            )
+            if mode != 'eager':
+                trainer.inference_modules[name] = compiled
+        logger.info(f"[OK] Generators ready ({self.compile_mode}: {sorted(trainer.inference_modules) or 'none'})")
+
+    def _select_precision(self, trainer: GANTrainer) -> str:
+        """Requested precision if its output matches fp32 closely enough for these weights, else fp32."""
+        if self.requested_precision == 'fp32':
+            return 'fp32'
+        if not isinstance(trainer, GANTrainer):
+            logger.warning(f"[WARNING] The {self.backend} backend only serves fp32; "
+                           f"ignoring precision '{self.requested_precision}'")
+            return 'fp32'
+
+        report = self.precision_report(trainer=trainer, precision=self.requested_precision)
+        drift = max(report['max_mean_drift'], report['max_std_drift'])
+        if drift > BF16_MAX_DRIFT:
+            logger.warning(f"[WARNING] {self.requested_precision} generation drifts {drift:.4f} from fp32 "
+                           f"(limit {BF16_MAX_DRIFT}); serving in fp32")
+            return 'fp32'
+
+        logger.info(f"[OK] Serving in {self.requested_precision} (drift from fp32: {drift:.4f})")
+        return self.requested_precision
+
+    def precision_report(self, trainer: Optional[GANTrainer] = None, precision: str = 'bf16',
+                         samples: int = 1024, seed: int = 0) -> Dict[str, Any]:
+        """
+        Compare generator output in `precision` against fp32 on identical inputs.
+
+        Both runs use the same conditions and latent noise. Drifts are the largest
+        per-feature differences of the mean and standard deviation over all
+        tabular and time series outputs, on the generators' normalized [0, 1] scale.
+        """
+        trainer = trainer or self.gan_trainer
+        conditions = self._generate_conditions(samples, 0.5, rng=np.random.default_rng(seed))
+
+        outputs = {}
+        for name in ('fp32', precision):
+            z_generator = torch.Generator(device=self.device).manual_seed(seed)
+            fake_tabular, fake_timeseries = self._run_generators(conditions, z_generator, trainer, precision=name)
+            outputs[name] = np.concatenate([fake_tabular, fake_timeseries.reshape(samples, -1)], axis=1)
+
+        reference, candidate = outputs['fp32'], outputs[precision]
+        return {
+            'precision': precision,
+            'samples': samples,
+            'max_mean_drift': float(np.abs(reference.mean(axis=0) - candidate.mean(axis=0)).max()),
+            'max_std_drift': float(np.abs(reference.std(axis=0) - candidate.std(axis=0)).max()),
+            'max_abs_error': float(np.abs(reference - candidate).max())
+        }
+
+    @property
+    def quantized(self) -> bool:
+        """Whether the live generators are int8-quantized."""
+        return getattr(self.gan_trainer, 'quantized', False)
+
+    @staticmethod
+    def _quantized_trainer(trainer: GANTrainer) -> GANTrainer:
+        """Shallow copy of the trainer whose generators are dynamically int8-quantized copies."""
+        quantized = copy.copy(trainer)
+        quantized.tab_gen = quantize_dynamic_int8(trainer.tab_gen)
+        quantized.ts_gen = quantize_dynamic_int8(trainer.ts_gen)
+        quantized.inference_modules = {}
+        quantized.quantized = True
+        return quantized
+
+    def _quantize_generators(self, trainer: GANTrainer) -> GANTrainer:
+        """The trainer to serve: an int8 copy if requested and faithful enough, else `trainer` itself."""
+        if self.quantization == 'none':
+            return trainer
+        if not isinstance(trainer, GANTrainer) or self.device.type != 'cpu':
+            logger.warning(f"[WARNING] {self.quantization} quantization needs the torch backend on CPU; "
+                           "serving unquantized generators")
+            return trainer
+
+        quantized = self._quantized_trainer(trainer)
+        report = self.quantization_report(trainer=trainer, quantized=quantized)
+        drift = max(report['max_mean_drift'], report['max_std_drift'], report['max_label_ratio_drift'])
+        if drift > INT8_MAX_DRIFT:
+            logger.warning(f"[WARNING] int8 generation drifts {drift:.4f} from fp32 "
+                           f"(limit {INT8_MAX_DRIFT}); serving unquantized generators")
+            return trainer
+
+        sizes, throughput = report['size_bytes'], report['samples_per_second']
+        logger.info(f"[OK] Serving int8 generators: {sizes['fp32'] / 2**20:.1f} MB -> {sizes['int8'] / 2**20:.1f} MB, "
+                    f"{throughput['fp32']:.0f} -> {throughput['int8']:.0f} samples/s "
+                    f"(drift from fp32: {drift:.4f})")
+        return quantized
+
+    def quantization_report(self, trainer: Optional[GANTrainer] = None, quantized: Optional[GANTrainer] = None,
+                            samples: int = 2048, seed: int = 0, batch_size: int = 100) -> Dict[str, Any]:
+        """
+        Compare dynamically int8-quantized generators against fp32 on identical inputs.
+
+        Reports the generators' serialized size and generation throughput (in
+        `batch_size` batches, as served) for both, the per-feature mean/std drift
+        of the normalized outputs as in precision_report, and the diabetes and
+        bp_status label ratios of the denormalized cohorts.
+        """
+        trainer = trainer or self.gan_trainer
+        quantized = quantized or self._quantized_trainer(trainer)
+        conditions = self._generate_conditions(samples, 0.5, rng=np.random.default_rng(seed))
+
+        report = {'samples': samples, 'size_bytes': {}, 'samples_per_second': {}, 'label_ratios': {}}
+        outputs = {}
+        for name, candidate in (('fp32', trainer), ('int8', quantized)):
+            report['size_bytes'][name] = state_dict_bytes(candidate.tab_gen) + state_dict_bytes(candidate.ts_gen)
+
+            self._run_generators(conditions[:batch_size], trainer=candidate, precision='fp32')  # warm-up
+            z_generator = torch.Generator(device=self.device).manual_seed(seed)
+            start = time.perf_counter()
+            batches = [self._run_generators(conditions[i:i + batch_size], z_generator, candidate, precision='fp32')
+                       for i in range(0, samples, batch_size)]
+            report['samples_per_second'][name] = samples / (time.perf_counter() - start)
+
+            fake_tabular = np.concatenate([tabular for tabular, _ in batches])
+            fake_timeseries = np.concatenate([timeseries for _, timeseries in batches])
+            outputs[name] = np.concatenate([fake_tabular, fake_timeseries.reshape(samples, -1)], axis=1)
+            columns = self._denormalize_tabular(
+                fake_tabular, conditions.numpy(), np.random.default_rng(seed), candidate.inverse_scaling
+            )
+            report['label_ratios'][name] = {label: float(columns[label].mean()) for label in ('diabetes', 'bp_status')}
+
+        reference, candidate = outputs['fp32'], outputs['int8']
+        ratios = report['label_ratios']
+        report.update({
+            'max_mean_drift': float(np.abs(reference.mean(axis=0) - candidate.mean(axis=0)).max()),
+            'max_std_drift': float(np.abs(reference.std(axis=0) - candidate.std(axis=0)).max()),
+            'max_label_ratio_drift': max(abs(ratios['fp32'][label] - ratios['int8'][label])
+                                         for label in ratios['fp32'])
+        })
+        return report
+
+    def reload_models(self) -> bool:
+        """
+        Load the checkpoint on disk into a fresh trainer and swap it in.
+
+        The new weights are loaded and warmed up off to the side; serving then
+        switches with a single reference assignment. Requests read
+        `self.gan_trainer` once when they start, so in-flight generation finishes
+        on the old weights and nothing on the request path takes a lock. Only
+        concurrent reloads are serialized. On failure the current models stay live.
+
+        If the published model set on disk is the one already served, nothing is
+        reloaded and model_version is unchanged; returns True in that case too.
+        """
+        with self._reload_lock:
+            if self.models_current:
+                logger.info(f"[OK] GAN models already current (set {self.model_set or 'flat'}); nothing to reload")
+                return True
+
+            logger.info("Reloading GAN models from disk...")
+            trainer = self._new_backend()
+            if not self._load_backend(trainer):
+                logger.warning("[WARNING] Model reload failed; keeping current models")
+                return False
+
+            try:
+                trainer.precision = self._select_precision(trainer)
+                trainer = self._quantize_generators(trainer)
+                self._compile_generators(trainer)
+                conditions = self._generate_conditions(self.WARMUP_SAMPLES, 0.5)
+                self._run_generators(conditions, trainer=trainer)
+            except Exception as e:
+                logger.error(f"Warm-up of reloaded models failed, keeping current models: {str(e)}")
+                return False
+
+            self.gan_trainer = trainer
+            self.models_loaded = True
+            self.model_version += 1
+            self.models_loaded_at = datetime.now().isoformat()
+
+        logger.info(f"[OK] Swapped in reloaded GAN models (version {self.model_version}, "
+                    f"set {self.model_set or 'flat'})")
+        return True
+
     def generate_synthetic_data(self, num_samples: int, diabetes_ratio: float = 0.5,
-                               hypertension_ratio: float = 0.7) -> Dict[str, Any]:
+                               hypertension_ratio: float = 0.7, seed: Optional[int] = None,
+                               output_format: str = 'csv', compression: Optional[str] = None,
+                               row_group_size: Optional[int] = None) -> Dict[str, Any]:
         """Generate synthetic diabetes data using GAN ONLY (no fallback)."""
         logger.info(f"Generating {num_samples} synthetic diabetes samples...")
 
         if not self.models_loaded:
             raise RuntimeError("GAN models not available. Please train using /api/v1/train/gan first.")
 
+        # Resolve the writer up front so bad format options fail before generation
+        writer = get_writer(output_format, compression, row_group_size)
+
         # Use GAN models
         tabular_data, timeseries_data = self._generate_with_gan(
-            num_samples, diabetes_ratio, hypertension_ratio
+            num_samples, diabetes_ratio, hypertension_ratio, seed
         )
 
         # Validate generated data
@@ -423,8 +859,8 @@ class DiabetesDataGenerator:
         if not is_valid:
             logger.warning("Generated data contains medical inconsistencies")
 
-        # Save to CSV files
-        ts_file, tab_file = self._save_to_csv(timeseries_data, tabular_data, num_samples)
+        # Save in the requested format
+        ts_file, tab_file = self._save_dataset(timeseries_data, tabular_data, num_samples, writer)
 
         # Create preview
         preview = self._create_preview(timeseries_data, tabular_data)
@@ -432,79 +868,59 @@ class DiabetesDataGenerator:
         return {
             'timeseries_file': ts_file,
             'tabular_file': tab_file,
+            'output_format': output_format,
             'preview': preview
         }
 
     def _generate_with_gan(self, num_samples: int, diabetes_ratio: float,
-                          hypertension_ratio: float) -> tuple:
+                          hypertension_ratio: float, seed: Optional[int] = None) -> tuple:
         """Generate data using trained GAN models with medical consistency."""
         logger.info("Generating data with GAN models...")
-        
-        self.gan_trainer.tab_gen.eval()
-        self.gan_trainer.ts_gen.eval()
-        self.gan_trainer.cross_modal.eval()
-
-        all_tabular_data = []
-        all_timeseries_data = []
-
-        with torch.no_grad():
-            # Generate in batches
-            batch_size = 100
-            num_batches = (num_samples + batch_size - 1) // batch_size
-
-            for batch_idx in range(num_batches):
-                current_batch_size = min(batch_size, num_samples - batch_idx * batch_size)
-
-                # Generate condition features with medical realism
-                conditions = self._generate_conditions(current_batch_size, diabetes_ratio)
-                conditions_tensor = torch.FloatTensor(conditions).to(self.device)
-
-                # Generate latent noise
-                z = torch.randn(current_batch_size, LATENT_DIM, device=self.device)
-
-                # Generate tabular data
-                fake_tabular = self.gan_trainer.tab_gen(z, conditions_tensor)
-
-                # Generate time series data
-                fake_timeseries = self.gan_trainer.ts_gen(z, conditions_tensor)
-
-                # Convert to numpy and denormalize
-                fake_tabular_np = fake_tabular.cpu().numpy()
-                fake_timeseries_np = fake_timeseries.cpu().numpy()
 
-                # Process each sample
-                for i in range(current_batch_size):
-                    patient_id = f'P{batch_idx * batch_size + i + 1:05d}'
-
-                    # Denormalize tabular data with medical accuracy
-                    tab_sample = self._denormalize_tabular(fake_tabular_np[i], conditions[i])
-                    tab_sample['patient_id'] = patient_id
-
-                    # === MEDICAL RULE-BASED CLASSIFICATION ===
-                    # Diabetes: HbA1c >= 6.5% OR average RBS >= 140
-                    if tab_sample['hba1c'] >= 6.5 or tab_sample['average_rbs'] >= 140:
-                        tab_sample['diabetes'] = 1
-                    else:
-                        tab_sample['diabetes'] = 0
-
-                    # BP status: systolic > 130 OR diastolic > 85
-                    systolic, diastolic = map(int, tab_sample['hypertension'].split('/'))
-                    if systolic > 130 or diastolic > 85:
-                        tab_sample['bp_status'] = 1
-                    else:
-                        tab_sample['bp_status'] = 0
-
-                    all_tabular_data.append(tab_sample)
-
-                    # Denormalize time series data
-                    ts_samples = self._denormalize_timeseries(
-                        fake_timeseries_np[i], patient_id, tab_sample['average_rbs'],
-                        tab_sample['diabetes']
-                    )
-                    all_timeseries_data.extend(ts_samples)
+        # Pin the models for the whole request so a concurrent hot-swap cannot mix weights
+        trainer = self.gan_trainer
+
+        # Seeded requests draw conditions, latent noise and RBS noise from their own
+        # generators so they are reproducible regardless of other traffic
+        rng = np.random.default_rng(seed)
+        z_generator = torch.Generator(device=self.device).manual_seed(seed) if seed is not None else None
+
+        # Conditions for the whole cohort live in one preallocated float32 buffer;
+        # each batch is sampled straight into its slice
+        conditions = torch.empty((num_samples, len(COND_FEATURES)), dtype=torch.float32)
+        tabular_batches = []
+        timeseries_batches = []
+
+        # Generate in batches
+        batch_size = 100
+        num_batches = (num_samples + batch_size - 1) // batch_size
+
+        for batch_idx in range(num_batches):
+            start = batch_idx * batch_size
+            current_batch_size = min(batch_size, num_samples - start)
+
+            # Generate condition features with medical realism
+            batch_conditions = self._generate_conditions(
+                current_batch_size, diabetes_ratio, rng,
+                out=conditions[start:start + current_batch_size]
+            )
+            fake_tabular, fake_timeseries = self._run_generators(batch_conditions, z_generator, trainer)
+
+            tabular_batches.append(fake_tabular)
+            timeseries_batches.append(fake_timeseries)
+
+        # Denormalize the whole cohort at once (no per-patient Python loop)
+        patient_ids = self._patient_ids(0, num_samples)
+        tabular_columns = self._denormalize_tabular(
+            np.concatenate(tabular_batches), conditions.numpy(), rng, trainer.inverse_scaling
+        )
+        timeseries_columns = self._denormalize_timeseries(
+            np.concatenate(timeseries_batches), patient_ids,
+            tabular_columns['average_rbs'], tabular_columns['diabetes'], trainer.inverse_scaling
+        )
 
-        tabular_df = pd.DataFrame(all_tabular_data)
-        timeseries_df = pd.DataFrame(all_timeseries_data)
+        tabular_df = self._tabular_frame(tabular_columns, patient_ids)
+        timeseries_df = pd.DataFrame(timeseries_columns)
 
         logger.info(f"[OK] Generated {len(tabular_df)} patients using GAN")
         logger.info(f"[OK] Diabetes distribution: {tabular_df['diabetes'].value_counts().to_dict()}")
@@ -517,163 +933,298 @@ class DiabetesDataGenerator:
 
         return tabular_df, timeseries_df
 
-    def _generate_conditions(self, num_samples: int, diabetes_ratio: float):
-        """Generate REALISTIC condition features for conditional GAN."""
-        conditions = []
-        for _ in range(num_samples):
-            is_diabetic = np.random.random() < diabetes_ratio
-
-            if is_diabetic:
-                # Diabetic patients: higher age, BMI, HbA1c
-                age = np.random.uniform(0.6, 1.0)  # 43-55 years (normalized)
-                bmi = np.random.uniform(0.65, 0.95)  # 28-40 BMI (normalized)
-                hba1c = np.random.uniform(0.85, 1.0)  # 6.5-7.0% HbA1c (normalized)
-            else:
-                # Non-diabetic: younger, lower BMI and HbA1c
-                age = np.random.uniform(0.0, 0.5)  # 30-40 years (normalized)
-                bmi = np.random.uniform(0.1, 0.5)  # 20-28 BMI (normalized)
-                hba1c = np.random.uniform(0.0, 0.5)  # 5.72-6.0% HbA1c (normalized)
-
-            conditions.append([age, bmi, hba1c])
-
-        return conditions
-
-    def _denormalize_tabular(self, normalized_data, condition):
-        """Denormalize with MEDICAL REALISM and proper scaling."""
-        # Extract condition features (already normalized [0,1])
-        age = int(condition[0] * 25 + 30)  # 30-55 years
-        age = max(30, min(55, age))
+    def iter_synthetic_batches(self, num_samples: int, diabetes_ratio: float = 0.5,
+                               hypertension_ratio: float = 0.7, seed: Optional[int] = None,
+                               batch_size: int = 1000) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Lazily generate a cohort as (tabular_df, timeseries_df) batches.
 
-        bmi = condition[1] * 26.5 + 18.5  # 18.5-45.0
-        bmi = max(18.5, min(45.0, bmi))
+        Each batch is run through the generators, denormalized and yielded before
+        the next one is produced, so memory stays bounded by `batch_size` no matter
+        how large `num_samples` is. Patient IDs continue across batches.
+        """
+        if not self.models_loaded:
+            raise RuntimeError("GAN models not available. Please train using /api/v1/train/gan first.")
 
-        hba1c = condition[2] * 1.28 + 5.72  # 5.72-7.0%
-        hba1c = max(5.72, min(7.0, hba1c))
+        # Pin the models for the whole stream so a concurrent hot-swap cannot mix weights
+        trainer = self.gan_trainer
+
+        rng = np.random.default_rng(seed)
+        z_generator = torch.Generator(device=self.device).manual_seed(seed) if seed is not None else None
+
+        # One condition buffer reused for every batch
+        conditions = torch.empty((min(batch_size, num_samples), len(COND_FEATURES)), dtype=torch.float32)
+
+        for start in range(0, num_samples, batch_size):
+            current_batch_size = min(batch_size, num_samples - start)
+            batch_conditions = self._generate_conditions(
+                current_batch_size, diabetes_ratio, rng, out=conditions[:current_batch_size]
+            )
+            fake_tabular, fake_timeseries = self._run_generators(batch_conditions, z_generator, trainer)
+
+            patient_ids = self._patient_ids(start, current_batch_size)
+            tabular_columns = self._denormalize_tabular(
+                fake_tabular, batch_conditions.numpy(), rng, trainer.inverse_scaling
+            )
+            timeseries_columns = self._denormalize_timeseries(
+                fake_timeseries, patient_ids,
+                tabular_columns['average_rbs'], tabular_columns['diabetes'], trainer.inverse_scaling
+            )
+
+            yield self._tabular_frame(tabular_columns, patient_ids), pd.DataFrame(timeseries_columns)
+
+    def _run_generators(self, conditions: torch.Tensor,
+                        z_generator: Optional[torch.Generator] = None,
+                        trainer: Optional[GANTrainer] = None,
+                        precision: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the tabular and time series generators on one batch of conditions.
+
+        Runs in `precision`, defaulting to the trainer's; outputs are always float32.
+        Latent noise is drawn here with torch for every backend, so a seeded request
+        gets the same noise whether it is served by PyTorch or ONNX Runtime.
+        """
+        trainer = trainer or self.gan_trainer
+        conditions_tensor = conditions.to(self.device)
+
+        # Generate latent noise
+        z = torch.randn(len(conditions), LATENT_DIM, device=self.device, generator=z_generator)
+
+        # Generate tabular and time series data
+        return trainer.run_generators(z, conditions_tensor, precision)
+
+    # Normalized [low, high) ranges for the condition features (age, bmi, hba1c)
+    # Diabetic patients: higher age, BMI, HbA1c (43-55 years, 28-40 BMI, 6.5-7.0%)
+    DIABETIC_CONDITION_RANGES = np.array([[0.6, 1.0], [0.65, 0.95], [0.85, 1.0]], dtype=np.float32)
+    # Non-diabetic: younger, lower BMI and HbA1c (30-40 years, 20-28 BMI, 5.72-6.0%)
+    NON_DIABETIC_CONDITION_RANGES = np.array([[0.0, 0.5], [0.1, 0.5], [0.0, 0.5]], dtype=np.float32)
+
+    def _generate_conditions(self, num_samples: int, diabetes_ratio: float,
+                             rng: Optional[np.random.Generator] = None,
+                             out: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Generate REALISTIC condition features for conditional GAN.
+
+        Draws the whole (num_samples, len(COND_FEATURES)) block in one vectorized
+        call. If `out` is given (a contiguous float32 CPU tensor, e.g. a slice of a
+        preallocated cohort buffer) it is filled in place and returned, so callers
+        can reuse the same storage across batches.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        if out is None:
+            out = torch.empty((num_samples, len(COND_FEATURES)), dtype=torch.float32)
+
+        block = out.numpy()
+        is_diabetic = (rng.random(num_samples) < diabetes_ratio)[:, None]
+        low = np.where(is_diabetic, self.DIABETIC_CONDITION_RANGES[:, 0], self.NON_DIABETIC_CONDITION_RANGES[:, 0])
+        high = np.where(is_diabetic, self.DIABETIC_CONDITION_RANGES[:, 1], self.NON_DIABETIC_CONDITION_RANGES[:, 1])
+
+        # Uniform draw in [0, 1) scaled into each patient's range, written in place
+        rng.random(dtype=np.float32, out=block)
+        block *= high - low
+        block += low
+
+        return out
+
+    @staticmethod
+    def _patient_ids(start: int, count: int) -> np.ndarray:
+        """Sequential patient IDs (P00001, P00002, ...) for rows start..start+count."""
+        numbers = np.arange(start + 1, start + count + 1).astype(str)
+        return np.char.add('P', np.char.zfill(numbers, 5))
+
+    def _denormalize_tabular(self, normalized_data: np.ndarray, conditions: np.ndarray,
+                             rng: Optional[np.random.Generator] = None,
+                             inverse_scaling: Optional[InverseScaling] = None) -> Dict[str, np.ndarray]:
+        """
+        Denormalize a whole batch of generator outputs with MEDICAL REALISM.
+
+        Works column-wise on the (N, 9) generator output and (N, 3) conditions,
+        so the cost is a handful of NumPy ops regardless of N. Returns a dict of
+        equal-length column arrays, including the derived `diabetes` and
+        `bp_status` labels and the split `systolic`/`diastolic` integers.
+
+        With `inverse_scaling` (the checkpoint's fitted scalers) the outputs are
+        mapped back exactly; otherwise the heuristic ranges below are used.
+        """
+        normalized_data = np.asarray(normalized_data)
+        conditions = np.asarray(conditions, dtype=np.float64)
+        n = len(conditions)
+
+        if inverse_scaling is not None and normalized_data.ndim == 2 \
+                and normalized_data.shape[1] == len(MODEL_TABULAR_FEATURES):
+            return self._inverse_tabular(normalized_data, conditions, inverse_scaling)
+
+        # Extract condition features (already normalized [0,1])
+        age = np.clip(np.trunc(conditions[:, 0] * 25 + 30), 30, 55).astype(np.int64)  # 30-55 years
+        bmi = np.clip(conditions[:, 1] * 26.5 + 18.5, 18.5, 45.0)  # 18.5-45.0
+        hba1c = np.clip(conditions[:, 2] * 1.28 + 5.72, 5.72, 7.0)  # 5.72-7.0%
 
         # Determine diabetes probability based on medical criteria
-        is_likely_diabetic = (hba1c >= 6.5 or bmi > 30)
+        is_likely_diabetic = (hba1c >= 6.5) | (bmi > 30)
+
+        if normalized_data.ndim != 2 or normalized_data.shape[1] < 6:
+            logger.error(f"Denormalization error: unexpected data shape {normalized_data.shape}")
+            # Return medically plausible defaults
+            average_rbs = np.where(is_likely_diabetic, 180.0, 100.0)
+            respiratory_rate = np.full(n, 14, dtype=np.int64)
+            heart_rate = np.full(n, 75, dtype=np.int64)
+            spo2 = np.full(n, 97.0)
+            systolic = np.where(is_likely_diabetic, 135, 115).astype(np.int64)
+            diastolic = np.where(is_likely_diabetic, 85, 75).astype(np.int64)
+        else:
+            gan = normalized_data - 0.5
 
-        try:
             # === CRITICAL FIX: Realistic RBS ranges ===
-            if is_likely_diabetic:
-                # Diabetic RBS: 140-280 mg/dL (mostly 160-220)
-                base_rbs = np.random.normal(190, 35)  # Mean 190, SD 35
-                gan_variation = (normalized_data[0] - 0.5) * 60  # GAN adds ±30
-                average_rbs = base_rbs + gan_variation
-                average_rbs = max(140.0, min(280.0, average_rbs))
-            else:
-                # Non-diabetic RBS: 80-125 mg/dL (mostly 90-110)
-                base_rbs = np.random.normal(100, 12)  # Mean 100, SD 12
-                gan_variation = (normalized_data[0] - 0.5) * 24  # GAN adds ±12
-                average_rbs = base_rbs + gan_variation
-                average_rbs = max(80.0, min(125.0, average_rbs))
+            # Diabetic RBS: 140-280 mg/dL (mean 190, SD 35, GAN adds ±30)
+            # Non-diabetic RBS: 80-125 mg/dL (mean 100, SD 12, GAN adds ±12)
+            noise = (rng if rng is not None else np.random).standard_normal(n)
+            average_rbs = np.where(
+                is_likely_diabetic,
+                np.clip(190 + 35 * noise + gan[:, 0] * 60, 140.0, 280.0),
+                np.clip(100 + 12 * noise + gan[:, 0] * 24, 80.0, 125.0)
+            )
 
             # Vital signs with realistic variation
-            # Respiratory rate: 12-18 breaths/min
-            resp_base = 14 + (normalized_data[1] - 0.5) * 6
-            respiratory_rate = int(np.clip(resp_base, 12, 18))
-
-            # Heart rate: 60-100 bpm
-            hr_base = 75 + (normalized_data[2] - 0.5) * 30
-            heart_rate = int(np.clip(hr_base, 60, 100))
-
-            # SpO2: 93-100%
-            spo2_base = 97 + (normalized_data[3] - 0.5) * 6
-            spo2 = np.clip(spo2_base, 93.0, 100.0)
-
-            # Blood pressure based on diabetes/age with realistic ranges
-            if is_likely_diabetic or age > 45:
-                # Elevated BP for high-risk patients
-                systolic_base = 135 + (normalized_data[4] - 0.5) * 40  # 115-155
-                diastolic_base = 85 + (normalized_data[5] - 0.5) * 30   # 70-100
-            else:
-                # Normal BP for low-risk patients
-                systolic_base = 115 + (normalized_data[4] - 0.5) * 30  # 100-130
-                diastolic_base = 75 + (normalized_data[5] - 0.5) * 20   # 65-85
-
-            systolic = int(np.clip(systolic_base, 100, 180))
-            diastolic = int(np.clip(diastolic_base, 60, 120))
+            respiratory_rate = np.clip(14 + gan[:, 1] * 6, 12, 18).astype(np.int64)  # 12-18 breaths/min
+            heart_rate = np.clip(75 + gan[:, 2] * 30, 60, 100).astype(np.int64)  # 60-100 bpm
+            spo2 = np.clip(97 + gan[:, 3] * 6, 93.0, 100.0).astype(np.float64)  # 93-100%
+
+            # Blood pressure: elevated for high-risk patients, normal otherwise
+            high_risk = is_likely_diabetic | (age > 45)
+            systolic_base = np.where(high_risk, 135 + gan[:, 4] * 40, 115 + gan[:, 4] * 30)
+            diastolic_base = np.where(high_risk, 85 + gan[:, 5] * 30, 75 + gan[:, 5] * 20)
+
+            systolic = np.clip(systolic_base, 100, 180).astype(np.int64)
+            diastolic = np.clip(diastolic_base, 60, 120).astype(np.int64)
 
             # Ensure pulse pressure is reasonable (systolic - diastolic = 30-60)
             pulse_pressure = systolic - diastolic
-            if pulse_pressure < 25:
-                diastolic = max(60, systolic - 35)
-            elif pulse_pressure > 70:
-                systolic = min(180, diastolic + 55)
-
-            hypertension = f"{systolic}/{diastolic}"
+            narrow = pulse_pressure < 25
+            wide = pulse_pressure > 70
+            diastolic = np.where(narrow, np.maximum(60, systolic - 35), diastolic)
+            systolic = np.where(wide, np.minimum(180, diastolic + 55), systolic)
+
+        columns = {
+            'age': age,
+            'bmi': np.round(bmi, 1),
+            'average_rbs': np.round(average_rbs, 1),
+            'hba1c': np.round(hba1c, 2),
+            'systolic': systolic,
+            'diastolic': diastolic,
+            'respiratory_rate': respiratory_rate,
+            'heart_rate': heart_rate,
+            'spo2': np.round(spo2, 1)
+        }
 
+        # === MEDICAL RULE-BASED CLASSIFICATION ===
+        # Diabetes: HbA1c >= 6.5% OR average RBS >= 140
+        columns['diabetes'] = ((columns['hba1c'] >= 6.5) | (columns['average_rbs'] >= 140)).astype(np.int64)
+        # BP status: systolic > 130 OR diastolic > 85
+        columns['bp_status'] = ((systolic > 130) | (diastolic > 85)).astype(np.int64)
+
+        return columns
+
+    @staticmethod
+    def _inverse_tabular(normalized_data: np.ndarray, conditions: np.ndarray,
+                         inverse_scaling: InverseScaling) -> Dict[str, np.ndarray]:
+        """Exact inverse of the training scaling: one multiply-add per feature group."""
+        values = dict(zip(MODEL_TABULAR_FEATURES, inverse_scaling.inverse_tabular(normalized_data).T))
+        # Conditioning features report the requested conditions, not the generator's echo of them
+        values.update(zip(COND_FEATURES, inverse_scaling.inverse_conditions(conditions).T))
+
+        systolic = np.rint(values['hypertension_systolic']).astype(np.int64)
+        diastolic = np.rint(values['hypertension_diastolic']).astype(np.int64)
+        columns = {
+            'age': np.rint(values['age']).astype(np.int64),
+            'bmi': np.round(values['bmi'], 1),
+            'average_rbs': np.round(values['average_rbs'], 1),
+            'hba1c': np.round(values['hba1c'], 2),
+            'systolic': systolic,
+            'diastolic': diastolic,
+            'respiratory_rate': np.rint(values['respiratory_rate']).astype(np.int64),
+            'heart_rate': np.rint(values['heart_rate']).astype(np.int64),
+            'spo2': np.round(values['spo2'], 1)
+        }
+        columns['diabetes'] = ((columns['hba1c'] >= 6.5) | (columns['average_rbs'] >= 140)).astype(np.int64)
+        columns['bp_status'] = ((systolic > 130) | (diastolic > 85)).astype(np.int64)
+        return columns
+
+    @staticmethod
+    def _tabular_frame(columns: Dict[str, np.ndarray], patient_ids: np.ndarray) -> pd.DataFrame:
+        """Assemble the tabular DataFrame (legacy column layout) from denormalized columns."""
+        hypertension = np.char.add(
+            np.char.add(columns['systolic'].astype(str), '/'), columns['diastolic'].astype(str)
+        )
+        return pd.DataFrame({
+            'age': columns['age'],
+            'bmi': columns['bmi'],
+            'average_rbs': columns['average_rbs'],
+            'hba1c': columns['hba1c'],
+            'hypertension': hypertension,
+            'respiratory_rate': columns['respiratory_rate'],
+            'heart_rate': columns['heart_rate'],
+            'spo2': columns['spo2'],
+            'patient_id': patient_ids,
+            'diabetes': columns['diabetes'],
+            'bp_status': columns['bp_status']
+        })
+
+    def _denormalize_timeseries(self, normalized_sequences: np.ndarray, patient_ids: np.ndarray,
+                                avg_rbs: np.ndarray, is_diabetic: np.ndarray,
+                                inverse_scaling: Optional[InverseScaling] = None) -> Dict[str, np.ndarray]:
+        """
+        Denormalize a (N, SEQ_LENGTH, 1) batch into long-format columns with
+        realistic RBS fluctuations. Rows are ordered patient-major, hour-minor.
+
+        With `inverse_scaling` the readings are the exact inverse of the
+        training scaling and `avg_rbs`/`is_diabetic` are not used.
+        """
+        normalized_sequences = np.asarray(normalized_sequences, dtype=np.float64)
+        seq_len = min(SEQ_LENGTH, normalized_sequences.shape[1])
+        hours = 6 + np.arange(seq_len)
+        base_date = np.datetime64(datetime.now().date(), 'h')
+        timestamps = base_date + hours.astype('timedelta64[h]')
+
+        if inverse_scaling is not None:
+            rbs_values = inverse_scaling.inverse_rbs(normalized_sequences[:, :seq_len, 0])
             return {
-                'age': age,
-                'bmi': round(float(bmi), 1),
-                'average_rbs': round(float(average_rbs), 1),
-                'hba1c': round(float(hba1c), 2),
-                'hypertension': hypertension,
-                'respiratory_rate': respiratory_rate,
-                'heart_rate': heart_rate,
-                'spo2': round(float(spo2), 1)
+                'patient_id': np.repeat(patient_ids, seq_len),
+                'timestamp': np.tile(timestamps, len(patient_ids)).astype('datetime64[us]'),
+                'rbs_value': np.round(rbs_values, 1).ravel()
             }
+        diabetic = np.asarray(is_diabetic).astype(bool)[:, None]
 
-        except (IndexError, ValueError) as e:
-            logger.error(f"Denormalization error: {e}. Data shape: {normalized_data.shape}")
-            # Return medically plausible defaults
-            return {
-                'age': age,
-                'bmi': round(float(bmi), 1),
-                'average_rbs': 180.0 if is_likely_diabetic else 100.0,
-                'hba1c': round(float(hba1c), 2),
-                'hypertension': "135/85" if is_likely_diabetic else "115/75",
-                'respiratory_rate': 14,
-                'heart_rate': 75,
-                'spo2': 97.0
-            }
+        # Diabetic patients have higher variability (±30-50 mg/dL),
+        # non-diabetic patients lower (±15-25 mg/dL)
+        variation_range = np.where(diabetic, 40.0, 20.0)
 
-    def _denormalize_timeseries(self, normalized_sequence, patient_id, avg_rbs, is_diabetic):
-        """Denormalize time series data with realistic RBS fluctuations."""
-        base_date = datetime.now().date()
-        timeseries_samples = []
+        # Time-of-day effects: morning fasting, post-lunch peak, post-dinner peak
+        diabetic_adjustment = np.select(
+            [(hours >= 6) & (hours <= 8), (hours >= 11) & (hours <= 13), (hours >= 17) & (hours <= 19)],
+            [-10.0, 20.0, 15.0], default=0.0
+        )
+        non_diabetic_adjustment = np.select(
+            [(hours >= 6) & (hours <= 8), (hours >= 11) & (hours <= 13), (hours >= 17) & (hours <= 19)],
+            [-5.0, 10.0, 8.0], default=0.0
+        )
+        time_adjustment = np.where(diabetic, diabetic_adjustment, non_diabetic_adjustment)
 
-        # Determine realistic daily RBS variation range
-        if is_diabetic:
-            # Diabetic patients have higher variability (±30-50 mg/dL)
-            variation_range = 40
-        else:
-            # Non-diabetic patients have lower variability (±15-25 mg/dL)
-            variation_range = 20
-
-        for hour_offset in range(min(SEQ_LENGTH, len(normalized_sequence))):
-            current_hour = 6 + hour_offset
-            timestamp = datetime.combine(base_date, datetime.min.time().replace(hour=current_hour))
-
-            # Use GAN output to create variation around the patient's average RBS
-            gan_deviation = (float(normalized_sequence[hour_offset][0]) - 0.5) * 2  # [-1, 1]
-            rbs_variation = gan_deviation * variation_range
-
-            # Add time-of-day effects
-            if 6 <= current_hour <= 8:  # Morning fasting
-                time_adjustment = -10 if is_diabetic else -5
-            elif 11 <= current_hour <= 13:  # Post-lunch peak
-                time_adjustment = 20 if is_diabetic else 10
-            elif 17 <= current_hour <= 19:  # Post-dinner peak
-                time_adjustment = 15 if is_diabetic else 8
-            else:
-                time_adjustment = 0
-
-            rbs_value = avg_rbs + rbs_variation + time_adjustment
-
-            # Ensure values stay in medically valid range
-            if is_diabetic:
-                rbs_value = max(110.0, min(320.0, rbs_value))
-            else:
-                rbs_value = max(70.0, min(140.0, rbs_value))
-
-            timeseries_samples.append({
-                'patient_id': patient_id,
-                'timestamp': timestamp,
-                'rbs_value': round(rbs_value, 1)
-            })
+        # Use GAN output to create variation around the patient's average RBS
+        gan_deviation = (normalized_sequences[:, :seq_len, 0] - 0.5) * 2  # [-1, 1]
+        rbs_values = np.asarray(avg_rbs, dtype=np.float64)[:, None] + gan_deviation * variation_range + time_adjustment
 
-        return timeseries_samples
+        # Ensure values stay in medically valid range
+        rbs_values = np.where(
+            diabetic,
+            np.clip(rbs_values, 110.0, 320.0),
+            np.clip(rbs_values, 70.0, 140.0)
+        )
+
+        return {
+            'patient_id': np.repeat(patient_ids, seq_len),
+            'timestamp': np.tile(timestamps, len(patient_ids)).astype('datetime64[us]'),
+            'rbs_value': np.round(rbs_values, 1).ravel()
+        }
 
     def validate_generated_data(self, tabular_df: pd.DataFrame) -> bool:
         """Validate medical consistency of generated data."""
@@ -709,19 +1260,20 @@ class DiabetesDataGenerator:
         logger.info("[OK] Generated data passed medical consistency validation")
         return True
 
-    def _save_to_csv(self, timeseries_df: pd.DataFrame, tabular_df: pd.DataFrame,
-                    num_samples: int) -> tuple:
-        """Save data to CSV files."""
+    def _save_dataset(self, timeseries_df: pd.DataFrame, tabular_df: pd.DataFrame,
+                      num_samples: int, writer: Optional[DatasetWriter] = None) -> tuple:
+        """Save both tables with the given writer (CSV by default)."""
+        writer = writer or CSVWriter()
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        ts_file = os.path.join(OUTPUT_DIR, f"synthetic_timeseries_GAN_{timestamp}_{num_samples}.csv")
-        tab_file = os.path.join(OUTPUT_DIR, f"synthetic_tabular_GAN_{timestamp}_{num_samples}.csv")
+        ts_file = os.path.join(OUTPUT_DIR, f"synthetic_timeseries_GAN_{timestamp}_{num_samples}{writer.suffix}")
+        tab_file = os.path.join(OUTPUT_DIR, f"synthetic_tabular_GAN_{timestamp}_{num_samples}{writer.suffix}")
 
-        timeseries_df.to_csv(ts_file, index=False)
-        tabular_df.to_csv(tab_file, index=False)
+        writer.write(timeseries_df, ts_file)
+        writer.write(tabular_df, tab_file)
 
-        logger.info(f"[OK] Synthetic data saved using GAN method")
+        logger.info(f"[OK] Synthetic data saved using GAN method ({writer.extension})")
         logger.info(f"[OK] Files: {ts_file}, {tab_file}")
 
         return ts_file, tab_file
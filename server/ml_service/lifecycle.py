@@ -0,0 +1,166 @@
+"""
+Lazy initialization of the service's heavy components.
+
+Nothing expensive happens at import. Each component (the GAN generator, the
+insight transformer) is built on first use, or earlier by the background
+warm-up the app starts once it is serving. Liveness (/api/v1/health) never
+waits on them; readiness (/api/v1/ready) reports whether the required ones
+are loaded.
+
+Time a cold start (importing the app, then loading each component) with:
+
+    python lifecycle.py             # phase timings
+    python lifecycle.py --profile   # plus the cProfile hot spots
+"""
+import argparse
+import asyncio
+import cProfile
+import logging
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyComponent:
+    """
+    A component built exactly once, by the first get() or by warm_up().
+
+    Concurrent callers wait for the one build in progress. A failed build is
+    logged and retried on the next get().
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], required: bool = True):
+        """
+        Args:
+            name: Name reported by readiness() and in logs.
+            factory: Builds the component; its return value is what get() returns.
+            required: Whether the service is only ready once this component is loaded.
+        """
+        self.name = name
+        self.required = required
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loading(self) -> bool:
+        return self._lock.locked() and not self.loaded
+
+    def get(self) -> Any:
+        if self.loaded:
+            return self._value
+
+        with self._lock:
+            if not self.loaded:
+                logger.info(f"Loading {self.name}...")
+                start = time.perf_counter()
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.error = str(e)
+                    logger.error(f"Failed to load {self.name}: {str(e)}")
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self.error = None
+                self.loaded = True
+                logger.info(f"[OK] {self.name} loaded in {self.load_seconds:.2f}s")
+        return self._value
+
+    async def aget(self) -> Any:
+        """get() for async endpoints: a pending load runs in a worker thread, off the event loop."""
+        if self.loaded:
+            return self._value
+        return await asyncio.to_thread(self.get)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "loading": self.loading,
+            "required": self.required,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error
+        }
+
+
+# Registered components, in warm-up order
+_components: Dict[str, LazyComponent] = {}
+
+
+def register(name: str, factory: Callable[[], Any], required: bool = True) -> LazyComponent:
+    """Declare a lazily built component; nothing is built until it is used or warmed up."""
+    component = LazyComponent(name, factory, required)
+    _components[name] = component
+    return component
+
+
+def warm_up() -> None:
+    """Build every registered component in registration order; failures are logged, not raised."""
+    start = time.perf_counter()
+    for component in list(_components.values()):
+        try:
+            component.get()
+        except Exception:
+            pass  # already logged; retried on first use
+    logger.info(f"[OK] Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+
+def start_warm_up() -> threading.Thread:
+    """Run warm_up() in a background thread so startup (and port binding) does not wait for it."""
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> Dict[str, Any]:
+    """Ready once every required component is loaded, plus the status of each component."""
+    return {
+        "ready": all(component.loaded for component in _components.values() if component.required),
+        "components": {name: component.status() for name, component in _components.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the ML service cold start")
+    parser.add_argument("--profile", action="store_true", help="Also print the cProfile hot spots")
+    parser.add_argument("--top", type=int, default=25, help="Number of functions to list with --profile")
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile()
+    phases = {}
+
+    start = time.perf_counter()
+    profiler.enable()
+    import main as service  # noqa: F401  (registers the components, as uvicorn's import would)
+    profiler.disable()
+    phases["import app"] = time.perf_counter() - start
+
+    for name, component in _components.items():
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            component.get()
+        except Exception as e:
+            name = f"{name} (failed: {str(e).splitlines()[0] if str(e) else type(e).__name__})"
+        finally:
+            profiler.disable()
+        phases[f"load {name}"] = time.perf_counter() - start
+
+    print(f"{'phase':<60} {'seconds':>8}")
+    for phase, seconds in phases.items():
+        print(f"{phase:<60} {seconds:>8.3f}")
+
+    if args.profile:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    # Run the importable module's main(), so the components the app registers
+    # land in the same registry this function reads
+    import lifecycle
+    lifecycle.main()
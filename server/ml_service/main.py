@@ -80,23 +80,40 @@ from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from typing import Dict, Any
-from api.api import router
+from contextlib import asynccontextmanager
+from api.api import router, training_jobs
 import logging
 import traceback
-from config import logger
-from transformer_insight_helper import generate_dataset_insight
+from config import logger, WARM_UP_ON_STARTUP, EXPLAIN_MAX_CONCURRENT, RETRY_AFTER_SECONDS
+from transformer_insight_helper import explain_dataset_insight, insight_cache, insight_batcher
+from executors import EndpointLimiter
+import executors
+import lifecycle
 import time
 
 # Force UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models load in the background while the server starts accepting requests;
+    # /api/v1/ready turns 200 once the required ones are up
+    if WARM_UP_ON_STARTUP:
+        lifecycle.start_warm_up()
+    yield
+    # Stop the training worker so it does not outlive the service
+    training_jobs.shutdown()
+    executors.shutdown()
+    insight_cache.flush()
+
 app = FastAPI(
     title="Diabetes Prediction ML Service",
     description="Diabetes and Blood Pressure Prediction Microservice - GAN-Only Mode",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware for frontend integration
@@ -117,7 +134,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "status": "error",
             "message": exc.detail,
             "details": str(exc)
-        }
+        },
+        headers=getattr(exc, "headers", None)  # keeps Retry-After on 429s
     )
 
 @app.exception_handler(Exception)
@@ -133,6 +151,9 @@ async def general_exception_handler(request: Request, exc: Exception):
         }
     )
 
+# Requests /explain-stats works on at once (queued in the insight batcher); the rest get 429
+explain_limiter = EndpointLimiter("insight", EXPLAIN_MAX_CONCURRENT, RETRY_AFTER_SECONDS)
+
 # Include API router
 app.include_router(router, prefix="/api/v1", tags=["ML Service"])
 
@@ -145,9 +166,13 @@ async def root():
         "mode": "GAN-Only (GitHub Datasets)",
         "endpoints": {
             "health": "/api/v1/health",
+            "ready": "/api/v1/ready",
             "train": "/api/v1/train/gan",
+            "training_jobs": "/api/v1/train/jobs",
             "generate": "/api/v1/generate",
+            "generate_stream": "/api/v1/generate/stream",
             "status": "/api/v1/models/status",
+            "reload_models": "/api/v1/models/reload",
             "docs": "/docs"
         }
     }
@@ -158,17 +183,23 @@ async def explain_dataset_stats(stats: Dict[str, Any]):
         logger.info("Received request to explain dataset statistics")
         
         start = time.time()  # ← start timer
-        explanation = generate_dataset_insight(stats)
-        elapsed = round(time.time() - start, 2)  # ← stop timer
+        async with explain_limiter.slot():
+            explanation, cache_hit = await explain_dataset_insight(stats)
+        elapsed = round(time.time() - start, 4)  # ← stop timer (cache hits take milliseconds)
         
-        logger.info(f"Dataset statistics explanation generated successfully in {elapsed}s")  # ← log it
+        logger.info(f"Dataset statistics explanation {'served from cache' if cache_hit else 'generated'} "
+                    f"successfully in {elapsed}s")  # ← log it
         
         return {
             "status": "success",
             "explanation": explanation,
-            "inference_time_seconds": elapsed  # ← optional, helps frontend too
+            "inference_time_seconds": elapsed,  # ← optional, helps frontend too
+            "cache": {"hit": cache_hit, **insight_cache.stats()},
+            "batching": insight_batcher.stats()
         }
     
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Invalid statistics provided: {str(e)}")
         raise HTTPException(
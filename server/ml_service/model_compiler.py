@@ -0,0 +1,121 @@
+import contextlib
+import copy
+import io
+import logging
+import warnings
+from typing import Callable, Sequence, Tuple
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+# eager:   plain nn.Module calls
+# compile: torch.compile (dynamic shapes), inference and training
+# script:  TorchScript trace + freeze, inference only
+COMPILE_MODES = ('eager', 'compile', 'script')
+
+# Layer types swapped for int8-weight versions by dynamic quantization
+QUANTIZABLE_LAYERS = {nn.Linear, nn.LSTM}
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in COMPILE_MODES:
+        raise ValueError(f"Unsupported compile mode '{mode}'. Choose one of: {list(COMPILE_MODES)}")
+
+
+def compile_for_inference(model: nn.Module, mode: str, example_inputs: Sequence[Sequence[torch.Tensor]],
+                          autocast=None, atol: float = 1e-4) -> Tuple[Callable, str]:
+    """
+    Compile an eval-mode module for no-grad inference and warm it up.
+
+    Every input tuple in `example_inputs` is run once, so compilation (and any
+    shape specialization) happens here rather than on the first request, and
+    the compiled output is checked against eager on the first tuple. Any
+    failure falls back to the eager module.
+
+    Args:
+        autocast: Optional autocast context factory the module will be served under.
+
+    Returns:
+        (callable, mode actually used)
+    """
+    _check_mode(mode)
+    if mode == 'eager':
+        return model, 'eager'
+
+    autocast = autocast or contextlib.nullcontext
+    try:
+        with torch.no_grad(), autocast(), warnings.catch_warnings():
+            # TorchScript is deprecated in recent torch releases but still supported
+            warnings.simplefilter("ignore", FutureWarning)
+            if mode == 'script':
+                # The parity check below replaces trace's own (exact) check, which bf16 would trip
+                traced = torch.jit.trace(model.eval(), tuple(example_inputs[0]), check_trace=False)
+                compiled = torch.jit.freeze(traced)
+            else:
+                compiled = torch.compile(model.eval(), dynamic=True)
+
+            for inputs in example_inputs:
+                compiled(*inputs)
+
+            expected, actual = model(*example_inputs[0]), compiled(*example_inputs[0])
+            if not torch.allclose(expected.float(), actual.float(), atol=atol):
+                raise RuntimeError(f"output mismatch (max |diff| {(expected - actual).abs().max().item():.2e})")
+    except Exception as e:
+        reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+        logger.warning(f"[WARNING] {mode} compilation of {type(model).__name__} failed, using eager: {reason}")
+        return model, 'eager'
+
+    return compiled, mode
+
+
+def compile_for_training(model: nn.Module, mode: str, example_inputs: Sequence[torch.Tensor]) -> nn.Module:
+    """
+    torch.compile a module for training and warm it up, or return it unchanged.
+
+    The warm-up forward runs with autograd enabled (its output is discarded), so
+    the forward and backward graphs are compiled before the first real step.
+    The compiled module shares parameters with `model`. 'script' is inference
+    only and is treated as eager here.
+    """
+    _check_mode(mode)
+    if mode != 'compile':
+        return model
+
+    try:
+        compiled = torch.compile(model, dynamic=True)
+        compiled(*example_inputs)
+    except Exception as e:
+        logger.warning(f"[WARNING] torch.compile of {type(model).__name__} failed, training eagerly: {str(e)}")
+        return model
+
+    return compiled
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """
+    Copy of a module with its Linear and LSTM weights quantized to int8.
+
+    Activations are quantized per batch at run time, so no calibration data is
+    needed. The copy is CPU-only, takes fp32 inputs and is for no-grad inference.
+    """
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao but still supported
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(unwrap(model)).cpu().eval(), QUANTIZABLE_LAYERS, dtype=torch.qint8
+        )
+
+
+def state_dict_bytes(model: nn.Module) -> int:
+    """Serialized size of a module's state dict, i.e. what it takes on disk and to load."""
+    buffer = io.BytesIO()
+    torch.save(unwrap(model).state_dict(), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def unwrap(model: nn.Module) -> nn.Module:
+    """The plain module behind torch.compile wrappers."""
+    return getattr(model, "_orig_mod", model)
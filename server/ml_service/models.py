@@ -601,3 +601,7 @@ class CrossModalGenerator(nn.Module):
         x = h_n[-1]
         x = torch.cat([x, cond], dim=1)
         return self.ts_to_tab(x)
+
+    def forward(self, tab, ts, cond):
+        """Both translations: (time series from tabular, tabular from time series)."""
+        return self.generate_ts_from_tab(tab, cond), self.generate_tab_from_ts(ts, cond)
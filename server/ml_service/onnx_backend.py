@@ -0,0 +1,287 @@
+"""
+ONNX export of the generators and an ONNX Runtime serving backend.
+
+Generation-only replicas do not need the discriminators, the cross-modal
+generator or the training stack. Export the trained generators once:
+
+    python onnx_backend.py export
+
+which writes ONNX_MODEL_DIR/generators.onnx (tabular and time series generator
+in one graph, dynamic batch axis) plus a copy of scalers.json, and checks the
+ONNX Runtime output against PyTorch. Serving with INFERENCE_BACKEND = "onnx"
+then loads only that graph. Re-run the check at any time with:
+
+    python onnx_backend.py parity
+
+Each export records which published model set it came from (export.json). The
+backend refuses an export that is not from the current set; DiabetesDataGenerator
+calls export_current_models before loading, so a newly trained set is exported
+(and parity checked) before it is served.
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from data_utils import InverseScaling
+from gan_trainer import GANTrainer
+from training_checkpoint import atomic_write_json, current_model_set
+from config import MODEL_DIR, LATENT_DIM, COND_FEATURES, ONNX_MODEL_DIR, ONNX_OPSET, ONNX_PARITY_ATOL
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILE = "generators.onnx"
+EXPORT_MARKER = "export.json"
+INPUT_NAMES = ["z", "conditions"]
+OUTPUT_NAMES = ["tabular", "timeseries"]
+
+
+def _require_onnx():
+    try:
+        import onnx  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("ONNX export requires onnx. Install it with: pip install onnx") from e
+
+
+def _require_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise RuntimeError("The onnx inference backend requires onnxruntime. "
+                           "Install it with: pip install onnxruntime") from e
+    return onnxruntime
+
+
+class _Generators(nn.Module):
+    """Both generators behind one forward, so serving needs a single session run per batch."""
+
+    def __init__(self, tab_gen: nn.Module, ts_gen: nn.Module):
+        super().__init__()
+        self.tab_gen = tab_gen
+        self.ts_gen = ts_gen
+
+    def forward(self, z, conditions):
+        return self.tab_gen(z, conditions), self.ts_gen(z, conditions)
+
+
+def export_generators(trainer: GANTrainer, output_dir: str = ONNX_MODEL_DIR, opset: int = ONNX_OPSET) -> str:
+    """
+    Export the trainer's tabular and time series generators to `output_dir`.
+
+    The graph is exported in fp32 from CPU copies of the eval-mode generators,
+    with the batch dimension of every input and output left dynamic. The
+    trainer's scaler parameters are written next to it, then the export marker
+    naming the trainer's model set. Returns the graph path.
+    """
+    _require_onnx()
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = _Generators(copy.deepcopy(trainer.tab_gen), copy.deepcopy(trainer.ts_gen)).cpu().eval()
+    example_inputs = (torch.randn(2, LATENT_DIM), torch.rand(2, len(COND_FEATURES)))
+    dynamic_axes = {name: {0: "batch"} for name in INPUT_NAMES + OUTPUT_NAMES}
+
+    path = os.path.join(output_dir, ONNX_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        with torch.no_grad():
+            # TorchScript-based exporter: the generators are static graphs and this
+            # path needs no extra dependencies beyond onnx itself
+            torch.onnx.export(
+                model, example_inputs, tmp_path, input_names=INPUT_NAMES, output_names=OUTPUT_NAMES,
+                dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True, dynamo=False
+            )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    atomic_write_json(trainer.scaler_params, os.path.join(output_dir, "scalers.json"))
+    # Written last: a partial export still names the previous set and is redone
+    atomic_write_json({"model_set": getattr(trainer, 'model_set', None), "opset": opset},
+                      os.path.join(output_dir, EXPORT_MARKER))
+
+    logger.info(f"[OK] Exported generators to {path} (opset {opset})")
+    return path
+
+
+def exported_model_set(model_dir: str) -> Optional[str]:
+    """Published model set the export in `model_dir` came from (None for the flat layout or no marker)."""
+    try:
+        with open(os.path.join(model_dir, EXPORT_MARKER), "r", encoding="utf-8") as f:
+            return json.load(f).get("model_set")
+    except (FileNotFoundError, ValueError, AttributeError):
+        return None
+
+
+def export_current_models(output_dir: Optional[str] = None, atol: float = ONNX_PARITY_ATOL) -> bool:
+    """
+    Export the current published model set to `output_dir` unless it already is.
+
+    The set is exported to a staging directory and checked against PyTorch
+    first; only an export within `atol` replaces the served graph. Returns
+    whether `output_dir` now holds an export of the current set.
+    """
+    output_dir = output_dir or ONNX_MODEL_DIR
+    if (os.path.exists(os.path.join(output_dir, ONNX_FILE))
+            and exported_model_set(output_dir) == current_model_set(MODEL_DIR)):
+        return True
+
+    trainer = GANTrainer(serving=True)
+    if not trainer.load_models():
+        logger.warning(f"[WARNING] No trained models in {MODEL_DIR} to export to ONNX")
+        return False
+
+    os.makedirs(output_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=output_dir, prefix=".export-")
+    try:
+        export_generators(trainer, staging_dir)
+        backend = OnnxGeneratorBackend(staging_dir)
+        if not backend.load_models():
+            return False
+        error = max(check_parity(trainer, backend).values())
+        if error > atol:
+            logger.error(f"[ERROR] ONNX export of model set {trainer.model_set or 'flat'} differs from "
+                         f"PyTorch by {error:.2e} (> {atol}); keeping the previous export")
+            return False
+        for name in (ONNX_FILE, "scalers.json", EXPORT_MARKER):
+            os.replace(os.path.join(staging_dir, name), os.path.join(output_dir, name))
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    logger.info(f"[OK] Exported model set {trainer.model_set or 'flat'} to ONNX (parity {error:.2e})")
+    return True
+
+
+class OnnxGeneratorBackend:
+    """
+    Serves the generators through ONNX Runtime on the CPU.
+
+    A drop-in for GANTrainer on the generation path: it provides load_models,
+    run_generators, inverse_scaling and the precision / inference_modules
+    attributes DiabetesDataGenerator reads, and nothing else. Always fp32.
+    """
+
+    precision = 'fp32'
+
+    def __init__(self, model_dir: Optional[str] = None):
+        self.model_dir = model_dir or ONNX_MODEL_DIR
+        self.device = torch.device("cpu")
+        self.inference_modules = {}
+        self.session = None
+        self.scaler_params = None
+        self.inverse_scaling = None
+        self.model_set = None
+
+    def load_models(self) -> bool:
+        """Open the exported graph and its scaler parameters, if exported from the current model set."""
+        path = os.path.join(self.model_dir, ONNX_FILE)
+        if not os.path.exists(path):
+            logger.warning(f"[WARNING] ONNX generators not found at {path}. Run: python onnx_backend.py export")
+            return False
+
+        model_set = exported_model_set(self.model_dir)
+        if model_set != current_model_set(MODEL_DIR):
+            logger.warning(f"[WARNING] ONNX generators in {self.model_dir} were exported from model set "
+                           f"{model_set or 'flat'}, not the current one. Run: python onnx_backend.py export")
+            return False
+
+        try:
+            ort = _require_onnxruntime()
+            logger.info(f"Loading ONNX generators from: {path}")
+            self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+
+            scaler_path = os.path.join(self.model_dir, "scalers.json")
+            scaler_params = None
+            if os.path.exists(scaler_path):
+                with open(scaler_path, "r", encoding="utf-8") as f:
+                    scaler_params = json.load(f)
+            self._set_scaler_params(scaler_params)
+        except Exception as e:
+            logger.error(f"[ERROR] Failed to load ONNX generators: {str(e)}")
+            return False
+
+        self.model_set = model_set
+        logger.info(f"[OK] ONNX generators loaded from {self.model_dir}")
+        return True
+
+    def _set_scaler_params(self, scaler_params: Optional[dict]):
+        self.scaler_params = scaler_params or None
+        self.inverse_scaling = None
+        if self.scaler_params:
+            try:
+                self.inverse_scaling = InverseScaling(self.scaler_params)
+            except (KeyError, IndexError, TypeError, ZeroDivisionError) as e:
+                logger.warning(f"[WARNING] Incomplete scaler parameters ({str(e)}); "
+                               "using heuristic denormalization")
+        else:
+            logger.warning("[WARNING] ONNX export has no scalers.json; using heuristic denormalization")
+
+    def run_generators(self, z: torch.Tensor, conditions: torch.Tensor,
+                       precision: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Tabular and time series generator outputs for one batch, as float32 numpy arrays."""
+        if precision not in (None, 'fp32'):
+            raise ValueError(f"The onnx backend only runs in fp32, not '{precision}'")
+
+        fake_tabular, fake_timeseries = self.session.run(OUTPUT_NAMES, {
+            "z": z.detach().cpu().numpy().astype(np.float32, copy=False),
+            "conditions": conditions.detach().cpu().numpy().astype(np.float32, copy=False)
+        })
+        return fake_tabular, fake_timeseries
+
+
+def check_parity(trainer: GANTrainer, backend: OnnxGeneratorBackend,
+                 batch_sizes: Sequence[int] = (1, 7, 100, 1000), seed: int = 0) -> Dict[int, float]:
+    """Largest |PyTorch - ONNX Runtime| over both outputs, per batch size, on identical fp32 inputs."""
+    generator = torch.Generator().manual_seed(seed)
+    errors = {}
+    for batch_size in batch_sizes:
+        z = torch.randn(batch_size, LATENT_DIM, generator=generator)
+        conditions = torch.rand(batch_size, len(COND_FEATURES), generator=generator)
+        expected = trainer.run_generators(z.to(trainer.device), conditions.to(trainer.device), precision='fp32')
+        actual = backend.run_generators(z, conditions)
+        errors[batch_size] = max(float(np.abs(e - a).max()) for e, a in zip(expected, actual))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the GAN generators to ONNX and check ONNX Runtime parity")
+    parser.add_argument("command", choices=["export", "parity"])
+    parser.add_argument("--output-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--opset", type=int, default=ONNX_OPSET)
+    parser.add_argument("--atol", type=float, default=ONNX_PARITY_ATOL)
+    parser.add_argument("--no-check", dest="check", action="store_false", help="Skip the parity check after export")
+    args = parser.parse_args()
+
+    trainer = GANTrainer(serving=True)
+    if not trainer.load_models():
+        sys.exit(f"No trained models in {MODEL_DIR}; train first")
+
+    if args.command == "export":
+        export_generators(trainer, args.output_dir, args.opset)
+        if not args.check:
+            return
+
+    backend = OnnxGeneratorBackend(args.output_dir)
+    if not backend.load_models():
+        sys.exit(f"Could not load ONNX generators from {args.output_dir}")
+
+    errors = check_parity(trainer, backend)
+    for batch_size, error in errors.items():
+        print(f"batch {batch_size:>5}: max |diff| {error:.2e}")
+    if max(errors.values()) > args.atol:
+        sys.exit(f"ONNX Runtime output differs from PyTorch by more than {args.atol}")
+    print(f"[OK] ONNX Runtime matches PyTorch within {args.atol}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import io
+import logging
+import os
+import queue
+import traceback
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import torch
+import torch.multiprocessing as mp
+
+from data_utils import TensorBatchIterator
+from gan_trainer import FAMILY_ORDER, GANTrainer
+
+logger = logging.getLogger(__name__)
+
+# Relative compute cost per step: each GAN family runs n_critic discriminator
+# updates plus a generator update, cross-modal is a single reconstruction update
+FAMILY_WEIGHTS = {'tabular': 2, 'timeseries': 2, 'cross_modal': 1}
+
+
+def available_cores() -> List[int]:
+    """CPU cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cores(cores: Sequence[int], families: Sequence[str] = FAMILY_ORDER) -> Dict[str, List[int]]:
+    """
+    Split `cores` into disjoint subsets proportional to FAMILY_WEIGHTS.
+
+    Every family gets at least one core; with fewer cores than families the
+    families share them round-robin.
+    """
+    cores = list(cores)
+    if len(cores) < len(families):
+        return {family: [cores[i % len(cores)]] for i, family in enumerate(families)}
+
+    total_weight = sum(FAMILY_WEIGHTS[family] for family in families)
+    counts = {family: max(1, len(cores) * FAMILY_WEIGHTS[family] // total_weight) for family in families}
+    # Hand leftover cores to the heaviest families first
+    leftover = len(cores) - sum(counts.values())
+    for family in sorted(families, key=lambda f: -FAMILY_WEIGHTS[f]):
+        if leftover <= 0:
+            break
+        counts[family] += 1
+        leftover -= 1
+
+    assignment, start = {}, 0
+    for family in families:
+        assignment[family] = cores[start:start + counts[family]]
+        start += counts[family]
+    return assignment
+
+
+def _serialize_state(trainer: GANTrainer, family: str) -> bytes:
+    buffer = io.BytesIO()
+    torch.save(
+        {name: getattr(trainer, name).state_dict() for name in GANTrainer.FAMILY_MODELS[family]},
+        buffer
+    )
+    return buffer.getvalue()
+
+
+def _load_state(trainer: GANTrainer, payload: bytes) -> None:
+    states = torch.load(io.BytesIO(payload), map_location=trainer.device, weights_only=True)
+    for name, state in states.items():
+        getattr(trainer, name).load_state_dict(state)
+
+
+def _family_worker(family: str, cores: List[int], initial_state: bytes, tensors: Tuple[torch.Tensor, ...],
+                   epochs: int, batch_size: int, log_interval: int, precision: str, events, stop_event) -> None:
+    """
+    Entry point of one family's training process.
+
+    Trains only `family`'s models with their own optimizers and batch iterator,
+    reports per-epoch losses through `events` and finally sends back the trained
+    weights. Stops early at an epoch boundary once `stop_event` is set.
+    """
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+
+        trainer = GANTrainer(precision=precision)
+        _load_state(trainer, initial_state)
+        batches = TensorBatchIterator(*tensors, batch_size=batch_size, device=trainer.device)
+        optimizers = trainer.make_optimizers((family,))
+
+        for epoch in range(epochs):
+            losses = trainer.train_epoch(
+                batches, optimizers, f"{family} {epoch+1}/{epochs}", log_interval, (family,)
+            )
+            events.put(("epoch", family, epoch + 1, losses))
+            if stop_event.is_set():
+                break
+
+        events.put(("done", family, _serialize_state(trainer, family)))
+    except Exception as e:
+        events.put(("failed", family, str(e), traceback.format_exc()))
+
+
+def train_families_parallel(trainer: GANTrainer, tensors: Tuple[torch.Tensor, ...], epochs: int,
+                            batch_size: int, log_interval: int,
+                            epoch_callback: Optional[Callable[[int, Dict[str, float]], bool]] = None
+                            ) -> Tuple[Dict[str, list], bool]:
+    """
+    Train the tabular, time series and cross-modal models concurrently.
+
+    The three families share no parameters, only the input batches, so each is
+    trained in its own spawned process pinned to a disjoint core subset (see
+    partition_cores). Per-epoch losses are merged into one history and passed to
+    `epoch_callback` once every family has finished that epoch; returning False
+    stops all workers at their next epoch boundary. The trained weights are
+    loaded back into `trainer`.
+
+    Each family draws its own batch order, so results differ from sequential
+    training for the same seed. There is no per-epoch best checkpoint: the
+    caller saves once at the end.
+
+    Returns:
+        (history, stopped_early)
+    """
+    ctx = mp.get_context("spawn")
+    events = ctx.Queue()
+    stop_event = ctx.Event()
+    assignment = partition_cores(available_cores())
+    shared = tuple(t.cpu().share_memory_() for t in tensors)
+
+    processes = []
+    for family in FAMILY_ORDER:
+        process = ctx.Process(
+            target=_family_worker,
+            args=(family, assignment[family], _serialize_state(trainer, family), shared,
+                  epochs, batch_size, log_interval, trainer.precision, events, stop_event),
+            name=f"gan-{family}"
+        )
+        process.start()
+        processes.append(process)
+        logger.info(f"[OK] {family} training started in process {process.pid} on cores {assignment[family]}")
+
+    history = {name: [] for name in GANTrainer.LOSS_NAMES}
+    pending_epochs: Dict[int, Dict[str, float]] = {}
+    reported: Dict[int, set] = {}
+    next_epoch = 1
+    finished = set()
+    stopped_early = False
+    error = None
+
+    try:
+        while len(finished) < len(FAMILY_ORDER) and error is None:
+            try:
+                event = events.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p.name for p in processes if not p.is_alive() and p.exitcode != 0]
+                if dead:
+                    error = f"Training process {dead[0]} exited unexpectedly"
+                continue
+
+            kind, family = event[0], event[1]
+            if kind == "failed":
+                logger.error(f"{family} training failed: {event[2]}\n{event[3]}")
+                error = f"{family} training failed: {event[2]}"
+            elif kind == "done":
+                _load_state(trainer, event[2])
+                finished.add(family)
+            elif kind == "epoch":
+                epoch = event[2]
+                pending_epochs.setdefault(epoch, {}).update(event[3])
+                reported.setdefault(epoch, set()).add(family)
+
+                # Report epochs in order once every family has finished them
+                # (epochs that workers finish after a stop request are dropped)
+                while not stopped_early and len(reported.get(next_epoch, ())) == len(FAMILY_ORDER):
+                    epoch_losses = {name: pending_epochs[next_epoch][name] for name in GANTrainer.LOSS_NAMES}
+                    for name, value in epoch_losses.items():
+                        history[name].append(value)
+                    trainer._log_epoch(next_epoch - 1, epochs, history)
+
+                    if (epoch_callback is not None
+                            and epoch_callback(next_epoch, dict(epoch_losses)) is False):
+                        logger.info(f"Training stopped after epoch {next_epoch}/{epochs} on request")
+                        stopped_early = True
+                        stop_event.set()
+
+                    del pending_epochs[next_epoch], reported[next_epoch]
+                    next_epoch += 1
+    finally:
+        if error is not None:
+            stop_event.set()
+        for process in processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+
+    if error is not None:
+        raise RuntimeError(error)
+
+    return history, stopped_early
@@ -380,6 +380,37 @@ class BPStatusEnum(str, Enum):
     normal = "Normal"
     hypertensive = "Hypertensive"
 
+class OutputFormatEnum(str, Enum):
+    """File format for generated datasets."""
+    csv = "csv"
+    parquet = "parquet"
+    arrow = "arrow"
+    feather = "feather"
+    npz = "npz"
+
+class StreamFormatEnum(str, Enum):
+    """Wire format for streamed generation."""
+    ndjson = "ndjson"
+    csv = "csv"
+
+class StreamTableEnum(str, Enum):
+    """Which table a CSV stream carries."""
+    tabular = "tabular"
+    timeseries = "timeseries"
+
+class PrecisionEnum(str, Enum):
+    fp32 = "fp32"
+    bf16 = "bf16"
+
+class TrainingJobStatusEnum(str, Enum):
+    """Lifecycle state of a background training job."""
+    queued = "queued"
+    running = "running"
+    cancelling = "cancelling"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
 # ==================== GAN TRAINING SCHEMAS ====================
 class GANTrainingRequest(BaseModel):
     """
@@ -407,11 +438,49 @@ class GANTrainingRequest(BaseModel):
     batch_size: int = Field(
         default=32,
         ge=8,
-        le=128,
-        description="Batch size (8-128). Recommended: 32",
+        le=2048,
+        description="Batch size (8-2048). Recommended: 32; larger batches raise throughput on big CPU/GPU hosts",
         example=32
     )
     
+    parallel_families: bool = Field(
+        default=False,
+        description="Train the tabular, time series and cross-modal GANs concurrently in separate processes "
+                    "pinned to disjoint CPU cores. Checkpoints once at the end instead of on every improvement",
+        example=False
+    )
+    
+    resume: bool = Field(
+        default=False,
+        description="Continue from the checkpoint left by an interrupted or cancelled run, if any. "
+                    "Only used if that run had the same batch_size, precision and world_size and "
+                    "fewer epochs than requested; otherwise training starts from scratch",
+        example=False
+    )
+    
+    world_size: int = Field(
+        default=1,
+        ge=1,
+        le=64,
+        description="Data-parallel worker processes (DDP over gloo); batch_size is split across them. "
+                    "Cannot be combined with parallel_families",
+        example=1
+    )
+    
+    precision: PrecisionEnum = Field(
+        default=PrecisionEnum.fp32,
+        description="bf16 runs model forwards under bfloat16 autocast (weights stay float32). "
+                    "Only faster on CPUs with native bfloat16 support",
+        example="fp32"
+    )
+    
+    compile_models: bool = Field(
+        default=False,
+        description="Run the training step forwards through torch.compile (sequential training only). "
+                    "Adds compilation time at the start of the job",
+        example=False
+    )
+    
     @validator('epochs')
     def validate_epochs(cls, v):
         if not 1 <= v <= 500:
@@ -420,8 +489,8 @@ class GANTrainingRequest(BaseModel):
     
     @validator('batch_size')
     def validate_batch_size(cls, v):
-        if not 8 <= v <= 128:
-            raise ValueError('Batch size must be between 8 and 128')
+        if not 8 <= v <= 2048:
+            raise ValueError('Batch size must be between 8 and 2048')
         return v
 
 # ==================== DATA GENERATION SCHEMAS ====================
@@ -461,12 +530,107 @@ class DataGenerationRequest(BaseModel):
         example=0.7
     )
     
+    seed: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Random seed for reproducible generation (omit for a fresh cohort)",
+        example=42
+    )
+    
+    output_format: OutputFormatEnum = Field(
+        default=OutputFormatEnum.csv,
+        description="File format: csv (legacy text layout) or typed parquet, arrow/feather, npz",
+        example="parquet"
+    )
+    
+    compression: Optional[str] = Field(
+        default=None,
+        description="Codec for the chosen format, e.g. zstd/snappy (parquet), lz4 (arrow), gzip (csv), 'none' to disable",
+        example="zstd"
+    )
+    
+    row_group_size: Optional[int] = Field(
+        default=None,
+        ge=1000,
+        description="Rows per Parquet row group / Arrow record batch",
+        example=100000
+    )
+    
     @validator('num_samples')
     def validate_num_samples(cls, v):
         if not 1 <= v <= 10000:
             raise ValueError('Number of samples must be between 1 and 10,000')
         return v
 
+class StreamingGenerationRequest(BaseModel):
+    """
+    Request for streamed synthetic data generation.
+    Patients are produced and sent batch by batch, so much larger cohorts
+    than DataGenerationRequest allows can be requested.
+    """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "num_samples": 1000000,
+                "diabetes_ratio": 0.5,
+                "hypertension_ratio": 0.7,
+                "format": "ndjson",
+                "batch_size": 1000
+            }
+        }
+    )
+    
+    num_samples: int = Field(
+        default=10000,
+        ge=1,
+        le=10000000,
+        description="Number of synthetic patients to stream (1-10,000,000)",
+        example=1000000
+    )
+    
+    diabetes_ratio: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Ratio of diabetic patients (0.0-1.0)",
+        example=0.5
+    )
+    
+    hypertension_ratio: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Ratio of hypertensive patients (0.0-1.0)",
+        example=0.7
+    )
+    
+    seed: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Random seed for reproducible generation (omit for a fresh cohort)",
+        example=42
+    )
+    
+    format: StreamFormatEnum = Field(
+        default=StreamFormatEnum.ndjson,
+        description="ndjson: one patient (tabular fields + time series) per line; csv: one table",
+        example="ndjson"
+    )
+    
+    table: StreamTableEnum = Field(
+        default=StreamTableEnum.tabular,
+        description="Table to stream when format is csv (ignored for ndjson)",
+        example="tabular"
+    )
+    
+    batch_size: int = Field(
+        default=1000,
+        ge=100,
+        le=10000,
+        description="Patients generated per batch (100-10,000); bounds service memory",
+        example=1000
+    )
+
 # ==================== RESPONSE SCHEMAS ====================
 class GANTrainingResponse(BaseModel):
     """Response after GAN training completion."""
@@ -476,13 +640,35 @@ class GANTrainingResponse(BaseModel):
     training_metrics: Optional[Dict[str, List[float]]] = Field(None, description="GAN training history")
     model_timestamp: Optional[str] = Field(None, description="Model training timestamp")
 
+class TrainingJobResponse(BaseModel):
+    """State of a queued or running GAN training job."""
+    job_id: str = Field(..., description="Training job identifier")
+    status: TrainingJobStatusEnum = Field(..., description="Job status", example="queued")
+    epochs: Optional[int] = Field(None, description="Requested number of epochs")
+    epochs_completed: int = Field(default=0, description="Epochs finished so far")
+    queue_position: Optional[int] = Field(None, description="Position in the queue while waiting")
+    latest_metrics: Optional[Dict[str, float]] = Field(None, description="Losses of the most recent epoch")
+    training_metrics: Optional[Dict[str, List[float]]] = Field(None, description="GAN training history once finished")
+    error: Optional[str] = Field(None, description="Failure reason")
+    created_at: str = Field(..., description="Submission timestamp")
+    started_at: Optional[str] = Field(None, description="Start timestamp")
+    finished_at: Optional[str] = Field(None, description="Completion timestamp")
+
+class TrainingJobMetricsResponse(BaseModel):
+    """Per-epoch losses reported by a training job."""
+    job_id: str = Field(..., description="Training job identifier")
+    status: TrainingJobStatusEnum = Field(..., description="Job status")
+    epochs_completed: int = Field(..., description="Epochs finished so far")
+    metrics: List[Dict[str, float]] = Field(..., description="Per-epoch losses, oldest first")
+
 class GenerationResponse(BaseModel):
     """Response after synthetic data generation."""
     status: str = Field(..., description="Generation status", example="success")
     message: str = Field(..., description="Generation completion message")
     num_generated: int = Field(..., description="Number of samples generated")
-    timeseries_file: str = Field(..., description="Path to generated time series CSV file")
-    tabular_file: str = Field(..., description="Path to generated tabular CSV file")
+    timeseries_file: str = Field(..., description="Path to generated time series file")
+    tabular_file: str = Field(..., description="Path to generated tabular file")
+    output_format: str = Field(default="csv", description="Format the files were written in")
     preview: Dict[str, Any] = Field(..., description="Preview of generated data")
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import torch
+
+from config import TENSOR_CACHE_DIR, SEQ_LENGTH, TABULAR_FEATURES, COND_FEATURES, TARGET_VARIABLES
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever preprocessing changes the produced tensors, so stale bundles are ignored
+PREPROCESS_VERSION = 2
+
+TENSOR_NAMES = ("time_series", "tabular", "conditions", "targets")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class TensorCache:
+    """
+    Cache of preprocessed training tensors.
+
+    Each bundle is a directory of plain `.npy` files (one per tensor) plus the
+    fitted scaler parameters, keyed by a hash of the source dataset contents and
+    the preprocessing config (SEQ_LENGTH, feature lists, PREPROCESS_VERSION).
+    Bundles are opened with np.load(mmap_mode='c'), so a warm start maps the
+    arrays instead of rebuilding them with pandas. A change to either dataset or
+    to the config produces a new key; old bundles are pruned.
+    """
+
+    def __init__(self, cache_dir: str = TENSOR_CACHE_DIR, max_bundles: int = 4):
+        """
+        Args:
+            cache_dir: Directory holding one sub-directory per bundle
+            max_bundles: Number of most recently written bundles to keep
+        """
+        self.cache_dir = cache_dir
+        self.max_bundles = max_bundles
+
+    @staticmethod
+    def key(source_files: Iterable[str]) -> str:
+        """Cache key for the given local dataset files under the current config."""
+        fingerprint = {
+            "sources": [file_digest(path) for path in source_files],
+            "seq_length": SEQ_LENGTH,
+            "tabular_features": TABULAR_FEATURES,
+            "cond_features": COND_FEATURES,
+            "target_variables": TARGET_VARIABLES,
+            "version": PREPROCESS_VERSION
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[Tuple[Tuple[torch.Tensor, ...], Dict[str, Any]]]:
+        """Memory-map a bundle. Returns ((time_series, tabular, conditions, targets), scaler_params) or None."""
+        bundle_dir = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(bundle_dir):
+            return None
+
+        try:
+            # Copy-on-write maps give writable tensors without reading the files up front
+            tensors = tuple(
+                torch.from_numpy(np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode="c"))
+                for name in TENSOR_NAMES
+            )
+            with open(os.path.join(bundle_dir, "scalers.json"), "r", encoding="utf-8") as f:
+                scaler_params = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] Ignoring unreadable tensor cache bundle {key}: {str(e)}")
+            return None
+
+        logger.info(f"[OK] Loaded preprocessed tensors from cache: {bundle_dir}")
+        return tensors, scaler_params
+
+    def store(self, key: str, tensors: Tuple[torch.Tensor, ...], scaler_params: Dict[str, Any]) -> None:
+        """Write a bundle atomically (temp directory, then rename)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        bundle_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+
+        try:
+            for name, tensor in zip(TENSOR_NAMES, tensors):
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), tensor.numpy())
+            with open(os.path.join(tmp_dir, "scalers.json"), "w", encoding="utf-8") as f:
+                json.dump(scaler_params, f)
+
+            if os.path.isdir(bundle_dir):
+                shutil.rmtree(bundle_dir)
+            os.replace(tmp_dir, bundle_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"[OK] Cached preprocessed tensors: {bundle_dir}")
+        self._prune()
+
+    def _prune(self) -> None:
+        bundles = [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.cache_dir, name))
+        ]
+        bundles.sort(key=os.path.getmtime, reverse=True)
+        for stale in bundles[self.max_bundles:]:
+            shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,10 @@
+"""
+Tests for the ML service. Run from server/ml_service with:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+# The service modules import each other by flat name (as uvicorn runs them from this directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,188 @@
+"""
+Reference implementations the tests and benchmark.py check against.
+
+Each is the per-patient loop a vectorized hot path replaced, kept verbatim so
+the equivalence tests pin the current behaviour to the original one. The
+benchmarks import them from here to time the same loops; nothing in the
+service imports this module.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import torch
+
+from config import SEQ_LENGTH, COND_FEATURES, TABULAR_FEATURES, TARGET_VARIABLES
+
+
+# ==================== DENORMALIZATION ====================
+def _reference_denormalize_row(normalized_data, condition):
+    """Per-patient tabular denormalization (pre-vectorization reference)."""
+    age = max(30, min(55, int(condition[0] * 25 + 30)))
+    bmi = max(18.5, min(45.0, condition[1] * 26.5 + 18.5))
+    hba1c = max(5.72, min(7.0, condition[2] * 1.28 + 5.72))
+    is_likely_diabetic = (hba1c >= 6.5 or bmi > 30)
+
+    if is_likely_diabetic:
+        average_rbs = np.random.normal(190, 35) + (normalized_data[0] - 0.5) * 60
+        average_rbs = max(140.0, min(280.0, average_rbs))
+    else:
+        average_rbs = np.random.normal(100, 12) + (normalized_data[0] - 0.5) * 24
+        average_rbs = max(80.0, min(125.0, average_rbs))
+
+    respiratory_rate = int(np.clip(14 + (normalized_data[1] - 0.5) * 6, 12, 18))
+    heart_rate = int(np.clip(75 + (normalized_data[2] - 0.5) * 30, 60, 100))
+    spo2 = np.clip(97 + (normalized_data[3] - 0.5) * 6, 93.0, 100.0)
+
+    if is_likely_diabetic or age > 45:
+        systolic_base = 135 + (normalized_data[4] - 0.5) * 40
+        diastolic_base = 85 + (normalized_data[5] - 0.5) * 30
+    else:
+        systolic_base = 115 + (normalized_data[4] - 0.5) * 30
+        diastolic_base = 75 + (normalized_data[5] - 0.5) * 20
+
+    systolic = int(np.clip(systolic_base, 100, 180))
+    diastolic = int(np.clip(diastolic_base, 60, 120))
+    pulse_pressure = systolic - diastolic
+    if pulse_pressure < 25:
+        diastolic = max(60, systolic - 35)
+    elif pulse_pressure > 70:
+        systolic = min(180, diastolic + 55)
+
+    return {
+        'age': age,
+        'bmi': round(float(bmi), 1),
+        'average_rbs': round(float(average_rbs), 1),
+        'hba1c': round(float(hba1c), 2),
+        'hypertension': f"{systolic}/{diastolic}",
+        'respiratory_rate': respiratory_rate,
+        'heart_rate': heart_rate,
+        'spo2': round(float(spo2), 1)
+    }
+
+
+def _reference_denormalize_sequence(normalized_sequence, patient_id, avg_rbs, is_diabetic):
+    """Per-patient time series denormalization (pre-vectorization reference)."""
+    base_date = datetime.now().date()
+    variation_range = 40 if is_diabetic else 20
+    samples = []
+    for hour_offset in range(min(SEQ_LENGTH, len(normalized_sequence))):
+        current_hour = 6 + hour_offset
+        timestamp = datetime.combine(base_date, datetime.min.time().replace(hour=current_hour))
+        rbs_variation = (float(normalized_sequence[hour_offset][0]) - 0.5) * 2 * variation_range
+        if 6 <= current_hour <= 8:
+            time_adjustment = -10 if is_diabetic else -5
+        elif 11 <= current_hour <= 13:
+            time_adjustment = 20 if is_diabetic else 10
+        elif 17 <= current_hour <= 19:
+            time_adjustment = 15 if is_diabetic else 8
+        else:
+            time_adjustment = 0
+        rbs_value = avg_rbs + rbs_variation + time_adjustment
+        if is_diabetic:
+            rbs_value = max(110.0, min(320.0, rbs_value))
+        else:
+            rbs_value = max(70.0, min(140.0, rbs_value))
+        samples.append({'patient_id': patient_id, 'timestamp': timestamp, 'rbs_value': round(rbs_value, 1)})
+    return samples
+
+
+def reference_denormalize(tabular, timeseries, conditions):
+    """Per-patient loop as it ran inside _generate_with_gan before vectorization."""
+    all_tabular, all_timeseries = [], []
+    for i in range(len(tabular)):
+        patient_id = f'P{i + 1:05d}'
+        row = _reference_denormalize_row(tabular[i], conditions[i])
+        row['patient_id'] = patient_id
+        row['diabetes'] = 1 if row['hba1c'] >= 6.5 or row['average_rbs'] >= 140 else 0
+        systolic, diastolic = map(int, row['hypertension'].split('/'))
+        row['bp_status'] = 1 if systolic > 130 or diastolic > 85 else 0
+        all_tabular.append(row)
+        all_timeseries.extend(
+            _reference_denormalize_sequence(timeseries[i], patient_id, row['average_rbs'], row['diabetes'])
+        )
+    return pd.DataFrame(all_tabular), pd.DataFrame(all_timeseries)
+
+
+def vectorized_denormalize(generator, tabular, timeseries, conditions):
+    """Whole-batch path used by DiabetesDataGenerator._generate_with_gan."""
+    patient_ids = generator._patient_ids(0, len(tabular))
+    columns = generator._denormalize_tabular(tabular, conditions)
+    ts_columns = generator._denormalize_timeseries(
+        timeseries, patient_ids, columns['average_rbs'], columns['diabetes']
+    )
+    return generator._tabular_frame(columns, patient_ids), pd.DataFrame(ts_columns)
+
+
+# ==================== CONDITION SAMPLING ====================
+def reference_conditions(num_samples, diabetes_ratio):
+    """Per-row condition sampling copied into a FloatTensor (pre-vectorization reference)."""
+    conditions = []
+    for _ in range(num_samples):
+        if np.random.random() < diabetes_ratio:
+            conditions.append([np.random.uniform(0.6, 1.0), np.random.uniform(0.65, 0.95), np.random.uniform(0.85, 1.0)])
+        else:
+            conditions.append([np.random.uniform(0.0, 0.5), np.random.uniform(0.1, 0.5), np.random.uniform(0.0, 0.5)])
+    return torch.FloatTensor(conditions)
+
+
+# ==================== TRAINING PREPROCESSING ====================
+def reference_preprocess(data):
+    """Per-patient groupby loop building the training arrays (pre-vectorization reference)."""
+    unique_patients = data['patient_id'].unique()
+    num_patients = len(unique_patients)
+    modified_tabular_features = [f for f in TABULAR_FEATURES if f != 'hypertension'] + ['hypertension_systolic', 'hypertension_diastolic']
+
+    sequences = np.zeros((num_patients, SEQ_LENGTH, 1))
+    tabular_data_array = np.zeros((num_patients, len(modified_tabular_features)))
+    conditions = np.zeros((num_patients, len(COND_FEATURES)))
+    targets = np.zeros((num_patients, len(TARGET_VARIABLES)))
+    patient_to_idx = {pid: i for i, pid in enumerate(unique_patients)}
+
+    for patient_id, group in data.groupby('patient_id'):
+        idx = patient_to_idx[patient_id]
+        rbs_sequence = group['rbs_value'].values
+        seq_len = min(SEQ_LENGTH, len(rbs_sequence))
+        sequences[idx, :seq_len, 0] = rbs_sequence[:seq_len]
+
+        first_row = group.iloc[0]
+        tabular_values = []
+        for feature in TABULAR_FEATURES:
+            if feature == 'hypertension':
+                tabular_values.extend([first_row['hypertension_systolic'], first_row['hypertension_diastolic']])
+            else:
+                tabular_values.append(first_row[feature])
+
+        tabular_data_array[idx] = tabular_values
+        conditions[idx] = first_row[COND_FEATURES].values
+        targets[idx] = first_row[TARGET_VARIABLES].values
+
+    return (torch.from_numpy(sequences).float(),
+            torch.from_numpy(tabular_data_array).float(),
+            torch.from_numpy(conditions).float(),
+            torch.from_numpy(targets).float())
+
+
+def merged_training_frame(num_patients, seed: int = 0):
+    """Scaled, merged frame shaped like load_and_preprocess_data output.
+
+    Patients get between SEQ_LENGTH - 3 and SEQ_LENGTH + 3 readings (exercising
+    padding and truncation) and rows are shuffled across patients.
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(SEQ_LENGTH - 3, SEQ_LENGTH + 4, num_patients)
+    patient_ids = np.char.add('P', np.arange(num_patients).astype(str))
+
+    per_patient = {col: rng.random(num_patients) for col in
+                   ['age', 'bmi', 'average_rbs', 'hba1c', 'respiratory_rate', 'heart_rate', 'spo2',
+                    'hypertension_systolic', 'hypertension_diastolic']}
+    per_patient['hypertension'] = np.full(num_patients, '120/80')
+    per_patient['diabetes'] = rng.integers(0, 2, num_patients)
+    per_patient['bp_status'] = rng.integers(0, 2, num_patients)
+
+    rows = np.repeat(np.arange(num_patients), counts)
+    frame = pd.DataFrame({col: values[rows] for col, values in per_patient.items()})
+    frame.insert(0, 'patient_id', patient_ids[rows])
+    frame['rbs_value'] = rng.random(len(rows))
+    # Interleave patients the way a merged, unsorted export would
+    return frame.iloc[rng.permutation(len(frame))].reset_index(drop=True)
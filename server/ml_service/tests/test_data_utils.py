@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import torch
+
+from config import SEQ_LENGTH
+from data_utils import DiabetesDataPreprocessor
+from tests.reference import merged_training_frame, reference_preprocess
+
+
+def _preprocess(data):
+    # preprocess_for_model only reads the frame; no dataset download needed
+    return DiabetesDataPreprocessor.__new__(DiabetesDataPreprocessor).preprocess_for_model(data)
+
+
+def _assert_identical(actual, expected):
+    for a, e in zip(actual, expected):
+        torch.testing.assert_close(a, e, rtol=0, atol=0, equal_nan=True)
+
+
+def test_vectorized_preprocess_matches_groupby_loop():
+    # Shuffled patients with short (padded) and long (truncated) sequences
+    data = merged_training_frame(300, seed=1)
+    _assert_identical(_preprocess(data), reference_preprocess(data))
+
+
+def test_tabular_values_come_from_each_patients_first_row():
+    data = merged_training_frame(50, seed=2)
+    # Later readings of a patient disagree with the first one; only the first counts
+    later = data.duplicated('patient_id')
+    data.loc[later, ['age', 'bmi', 'diabetes']] = [99.0, 99.0, 1]
+
+    _assert_identical(_preprocess(data), reference_preprocess(data))
+    assert not (_preprocess(data)[1] == 99.0).any()
+
+
+def test_rows_without_patient_id_form_one_all_zero_patient():
+    data = merged_training_frame(20, seed=3)
+    data.loc[data['patient_id'] == 'P5', 'patient_id'] = np.nan
+    # NaN readings stay NaN; they are not confused with padding
+    data.loc[data['patient_id'].notna().idxmax(), 'rbs_value'] = np.nan
+
+    actual = _preprocess(data)
+    expected = reference_preprocess(data)
+    assert len(actual[0]) == len(expected[0]) == 20
+    _assert_identical(actual, expected)
+    missing = int(pd.isna(pd.unique(data['patient_id'])).argmax())
+    assert all((tensor[missing] == 0).all() for tensor in actual)
@@ -0,0 +1,41 @@
+import pytest
+
+from gan_trainer import GANTrainer
+from training_checkpoint import CheckpointWriter, load_checkpoint
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    """A trainer plus the resumable state it wrote at epoch 5 (1,000 samples, batch 32, fp32)."""
+    trainer = GANTrainer()
+    monkeypatch.setattr(trainer, "checkpoint_path", lambda: str(tmp_path / "training_state.pt"))
+    optimizers = trainer.make_optimizers()
+    history = {name: [0.0] * 5 for name in GANTrainer.LOSS_NAMES}
+
+    writer = CheckpointWriter()
+    trainer._submit_checkpoint(writer, 5, optimizers, history, 0.0, num_samples=1000, batch_size=32)
+    writer.close()
+    return trainer, optimizers, load_checkpoint(trainer.checkpoint_path())
+
+
+def test_resumes_a_matching_run(checkpoint):
+    trainer, optimizers, state = checkpoint
+    assert trainer._restore_training_state(state, optimizers, 1000, batch_size=32, epochs=10)
+
+
+@pytest.mark.parametrize("num_samples, batch_size, world_size", [(999, 32, 1), (1000, 64, 1), (1000, 32, 2)])
+def test_does_not_resume_a_different_run(checkpoint, num_samples, batch_size, world_size):
+    trainer, optimizers, state = checkpoint
+    assert not trainer._restore_training_state(state, optimizers, num_samples, batch_size, 10, world_size)
+
+
+def test_does_not_resume_in_a_different_precision(checkpoint):
+    trainer, optimizers, state = checkpoint
+    trainer.precision = 'bf16'
+    assert not trainer._restore_training_state(state, optimizers, 1000, batch_size=32, epochs=10)
+
+
+@pytest.mark.parametrize("epochs", [3, 5])
+def test_does_not_resume_a_run_with_no_epochs_left(checkpoint, epochs):
+    trainer, optimizers, state = checkpoint
+    assert not trainer._restore_training_state(state, optimizers, 1000, batch_size=32, epochs=epochs)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import SEQ_LENGTH
+from generate import DiabetesDataGenerator, get_writer, to_columnar
+from tests.reference import reference_denormalize, vectorized_denormalize
+
+
+def _raw_outputs(num_patients, seed=0):
+    """Generator-shaped outputs and conditions, as _generate_with_gan collects them."""
+    rng = np.random.default_rng(seed)
+    return (rng.random((num_patients, 9), dtype=np.float32),
+            rng.random((num_patients, SEQ_LENGTH, 1), dtype=np.float32),
+            rng.random((num_patients, 3)))
+
+
+@pytest.fixture
+def generator():
+    # Denormalization and writing do not touch the networks, so skip model loading
+    return DiabetesDataGenerator.__new__(DiabetesDataGenerator)
+
+
+@pytest.fixture
+def cohort(generator):
+    return vectorized_denormalize(generator, *_raw_outputs(500))
+
+
+def test_vectorized_denormalization_matches_per_patient_loop(generator):
+    tabular, timeseries, conditions = _raw_outputs(2000)
+
+    np.random.seed(0)
+    expected_tab, expected_ts = reference_denormalize(tabular, timeseries, conditions)
+    np.random.seed(0)
+    actual_tab, actual_ts = vectorized_denormalize(generator, tabular, timeseries, conditions)
+
+    assert sorted(actual_tab.columns) == sorted(expected_tab.columns)
+    pd.testing.assert_frame_equal(actual_tab[expected_tab.columns], expected_tab, check_dtype=False)
+    pd.testing.assert_frame_equal(actual_ts[expected_ts.columns], expected_ts, check_dtype=False)
+
+
+@pytest.mark.parametrize("output_format, compression", [
+    ('csv', None), ('csv', 'gzip'), ('parquet', 'zstd'), ('feather', 'lz4'), ('npz', 'zip'), ('npz', 'none')
+])
+def test_writer_round_trip(cohort, tmp_path, output_format, compression):
+    if output_format in ('parquet', 'feather'):
+        pytest.importorskip("pyarrow")
+    writer = get_writer(output_format, compression)
+
+    for df in cohort:
+        path = str(tmp_path / f"data{writer.suffix}")
+        writer.write(df, path)
+
+        if output_format == 'csv':
+            # The legacy text layout: same columns and values, timestamps as text
+            expected = df.assign(timestamp=df['timestamp'].astype(str)) if 'timestamp' in df else df
+            pd.testing.assert_frame_equal(pd.read_csv(path), expected, check_dtype=False)
+            continue
+
+        expected = to_columnar(df)
+        if output_format == 'parquet':
+            actual = pd.read_parquet(path)
+        elif output_format == 'feather':
+            actual = pd.read_feather(path)
+        else:
+            with np.load(path) as archive:
+                actual = pd.DataFrame({col: archive[col] for col in archive.files})
+            expected = expected.astype({col: str for col in expected.columns if expected[col].dtype == object})
+        # Parquet and Arrow keep the narrow storage types exactly; npz stores strings as unicode arrays
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=output_format != 'npz')
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from transformer_insight_helper import InsightCache
+
+
+def test_cache_persists_and_reloads(tmp_path):
+    path = str(tmp_path / "insights.json")
+    cache = InsightCache(max_entries=3, path=path)
+    for i in range(5):
+        cache.put(f"key{i}", f"insight {i}")
+    cache.flush()
+
+    reloaded = InsightCache(max_entries=3, path=path)
+    assert reloaded.get("key1") is None
+    assert [reloaded.get(f"key{i}") for i in (2, 3, 4)] == ["insight 2", "insight 3", "insight 4"]
+
+
+def test_put_does_not_wait_for_the_file_write(tmp_path, monkeypatch):
+    cache = InsightCache(path=str(tmp_path / "insights.json"))
+    release = threading.Event()
+    saved = []
+
+    def slow_save(entries):
+        release.wait(5)
+        saved.append(len(entries))
+
+    monkeypatch.setattr(cache, "_save", slow_save)
+
+    start = time.perf_counter()
+    for i in range(10):
+        cache.put(f"key{i}", "insight")
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    cache.flush()
+    # Puts made while a write was running are coalesced into the next one
+    assert saved[-1] == 10 and len(saved) <= 2
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import torch
+
+import gan_trainer
+import generate
+import onnx_backend
+from config import ONNX_PARITY_ATOL
+from gan_trainer import GANTrainer
+from generate import DiabetesDataGenerator
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    """An empty models directory used by both the trainer (writes) and the generator (reads)."""
+    monkeypatch.setattr(gan_trainer, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(generate, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(onnx_backend, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(onnx_backend, "ONNX_MODEL_DIR", str(tmp_path / "onnx"))
+    return tmp_path
+
+
+def publish(seed):
+    """Publish a model set of randomly initialized models (as a finished training job does)."""
+    torch.manual_seed(seed)
+    GANTrainer().save_models()
+
+
+def test_reload_only_bumps_the_version_for_a_new_model_set(model_dir):
+    publish(seed=0)
+    generator = DiabetesDataGenerator()
+    assert generator.models_loaded and generator.models_current
+    first_set = generator.model_set
+
+    # Nothing new on disk: no hot-swap, same version
+    assert generator.reload_models()
+    assert generator.model_version == 1 and generator.model_set == first_set
+
+    publish(seed=1)
+    assert not generator.models_current
+    assert generator.reload_models()
+    assert generator.model_version == 2 and generator.model_set != first_set
+    assert generator.models_current
+
+
+def test_onnx_reload_serves_the_newly_published_model_set(model_dir):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+
+    def outputs(generator):
+        conditions = torch.full((8, 3), 0.5)
+        return generator._run_generators(conditions, z_generator=torch.Generator().manual_seed(0))
+
+    publish(seed=0)
+    generator = DiabetesDataGenerator(backend='onnx')
+    assert generator.models_loaded and generator.models_current
+    before = outputs(generator)
+
+    publish(seed=1)
+    assert generator.reload_models()
+    assert generator.model_version == 2 and generator.models_current
+    after = outputs(generator)
+    assert not np.allclose(before[0], after[0])
+
+    # The served graph matches PyTorch on the new set
+    trainer = GANTrainer(serving=True)
+    assert trainer.load_models()
+    assert max(onnx_backend.check_parity(trainer, generator.gan_trainer).values()) <= ONNX_PARITY_ATOL
+
+
+def test_onnx_backend_refuses_an_export_of_an_older_model_set(model_dir):
+    pytest.importorskip("onnx")
+
+    publish(seed=0)
+    trainer = GANTrainer(serving=True)
+    assert trainer.load_models()
+    onnx_backend.export_generators(trainer, str(model_dir / "onnx"))
+
+    publish(seed=1)
+    assert not onnx_backend.OnnxGeneratorBackend().load_models()
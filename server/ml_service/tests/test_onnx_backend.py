@@ -0,0 +1,25 @@
+import pytest
+import torch
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from config import ONNX_PARITY_ATOL
+from gan_trainer import GANTrainer
+import onnx_backend
+from onnx_backend import OnnxGeneratorBackend, check_parity, export_generators
+
+
+def test_onnx_generators_match_pytorch(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_backend, "MODEL_DIR", str(tmp_path))  # no published sets: flat layout
+    torch.manual_seed(0)
+    trainer = GANTrainer()  # randomly initialized generators; no trained weights needed
+    for model in (trainer.tab_gen, trainer.ts_gen):
+        model.eval()
+
+    export_generators(trainer, str(tmp_path))
+    backend = OnnxGeneratorBackend(str(tmp_path))
+    assert backend.load_models()
+
+    errors = check_parity(trainer, backend)
+    assert max(errors.values()) <= ONNX_PARITY_ATOL, errors
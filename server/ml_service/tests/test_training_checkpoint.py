@@ -0,0 +1,80 @@
+import os
+import shutil
+
+import pytest
+import torch
+
+import gan_trainer
+from gan_trainer import GANTrainer
+from training_checkpoint import MODEL_SETS_DIR, current_model_dir, publish_model_set
+
+
+def _write_marker(value):
+    def write(directory):
+        with open(os.path.join(directory, "marker.txt"), "w") as f:
+            f.write(value)
+    return write
+
+
+def _read_marker(directory):
+    with open(os.path.join(directory, "marker.txt")) as f:
+        return f.read()
+
+
+def test_flat_layout_without_a_published_set(tmp_path):
+    assert current_model_dir(str(tmp_path)) == str(tmp_path)
+
+
+def test_publish_switches_to_the_new_set_and_keeps_the_newest(tmp_path):
+    root = str(tmp_path)
+    for i in range(5):
+        path = publish_model_set(root, _write_marker(str(i)), keep=3)
+        assert current_model_dir(root) == path
+        assert _read_marker(current_model_dir(root)) == str(i)
+
+    assert len(os.listdir(tmp_path / MODEL_SETS_DIR)) == 3
+
+
+def test_failed_write_leaves_the_current_set_in_place(tmp_path):
+    root = str(tmp_path)
+    path = publish_model_set(root, _write_marker("good"))
+
+    def fail(directory):
+        _write_marker("partial")(directory)
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        publish_model_set(root, fail)
+    assert current_model_dir(root) == path
+    assert os.listdir(tmp_path / MODEL_SETS_DIR) == [os.path.basename(path)]
+
+
+def test_saved_models_and_scalers_load_as_one_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(gan_trainer, "MODEL_DIR", str(tmp_path))
+    trainer = GANTrainer()
+    trainer._set_scaler_params({"tabular": {"min": [0.0], "max": [1.0]}})
+    trainer.save_models()
+
+    serving = GANTrainer(serving=True)
+    assert serving.load_models()
+    assert serving.scaler_params == trainer.scaler_params
+    for name in GANTrainer.SERVING_MODELS:
+        for key, value in getattr(trainer, name).state_dict().items():
+            assert torch.equal(getattr(serving, name).state_dict()[key], value)
+
+
+def test_sets_that_cannot_be_removed_yet_are_pruned_later(tmp_path, monkeypatch):
+    # On Windows a set the service still has memory-mapped cannot be deleted
+    root = str(tmp_path)
+    first = publish_model_set(root, _write_marker("0"), keep=1)
+
+    def locked(path, *args, **kwargs):
+        raise PermissionError(f"mapped: {path}")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(shutil, "rmtree", locked)
+        second = publish_model_set(root, _write_marker("1"), keep=1)
+    assert current_model_dir(root) == second and os.path.isdir(first)
+
+    third = publish_model_set(root, _write_marker("2"), keep=1)
+    assert os.listdir(tmp_path / MODEL_SETS_DIR) == [os.path.basename(third)]
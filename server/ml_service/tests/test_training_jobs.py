@@ -0,0 +1,22 @@
+import pytest
+
+from training_jobs import CANCELLED, QUEUED, TrainingJobManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    # No dispatcher: jobs stay queued until cancelled, and no worker process is started
+    monkeypatch.setattr(TrainingJobManager, "_ensure_dispatcher", lambda self: None)
+    return TrainingJobManager(max_pending=10, max_finished=3)
+
+
+def test_only_the_newest_finished_jobs_are_kept(manager):
+    jobs = [manager.submit({"epochs": 1})["job_id"] for _ in range(6)]
+    for job_id in jobs[:5]:
+        assert manager.cancel(job_id)["status"] == CANCELLED
+
+    assert [job["job_id"] for job in manager.list_jobs()] == jobs[2:]
+    assert manager.get(jobs[0]) is None
+    # Unfinished jobs are never dropped
+    assert manager.get(jobs[5])["status"] == QUEUED
+
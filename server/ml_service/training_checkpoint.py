@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_torch_save(obj: Any, path: str) -> None:
+    """torch.save to a temp file in the target directory, then rename it into place."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(obj: Any, path: str) -> None:
+    """json.dump to a temp file in the target directory, then rename it into place."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ==================== PUBLISHED MODEL SETS ====================
+# Trained weights are published as whole sets: each save writes every file into
+# a new directory under <model dir>/releases, then switches the CURRENT pointer
+# file to it. Readers resolve the pointer once, so they load one consistent set
+# even while a newer one is being written.
+MODEL_SETS_DIR = "releases"
+MODEL_SET_POINTER = "CURRENT"
+
+
+def current_model_set(root: str) -> Optional[str]:
+    """Name of the current published model set, or None for the flat pre-release layout."""
+    try:
+        with open(os.path.join(root, MODEL_SET_POINTER), "r", encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return name if name and os.path.isdir(os.path.join(root, MODEL_SETS_DIR, name)) else None
+
+
+def model_set_dir(root: str, name: Optional[str]) -> str:
+    """Directory of the model set `name` (see current_model_set); `root` itself for None."""
+    return os.path.join(root, MODEL_SETS_DIR, name) if name else root
+
+
+def current_model_dir(root: str) -> str:
+    """Directory of the current model set; `root` itself for the flat pre-release layout."""
+    return model_set_dir(root, current_model_set(root))
+
+
+def publish_model_set(root: str, write: Callable[[str], None], keep: int = 3) -> str:
+    """
+    Publish a new model set: write(directory) fills a fresh directory, which is
+    then renamed into <root>/releases and made current. Sets beyond the newest
+    `keep` are removed afterwards. Returns the published directory.
+    """
+    sets_dir = os.path.join(root, MODEL_SETS_DIR)
+    os.makedirs(sets_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=sets_dir, prefix=".tmp-")
+    try:
+        write(tmp_dir)
+        name = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(sets_dir, name)
+        os.replace(tmp_dir, path)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Single atomic switch: readers see the previous set or this one, never a mix
+    tmp_pointer = os.path.join(root, f".{MODEL_SET_POINTER}.tmp")
+    with open(tmp_pointer, "w", encoding="utf-8") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_pointer, os.path.join(root, MODEL_SET_POINTER))
+
+    _prune_model_sets(sets_dir, keep, current=name)
+    return path
+
+
+def _prune_model_sets(sets_dir: str, keep: int, current: str) -> None:
+    """
+    Remove all but the newest `keep` published sets (names sort by publish time).
+
+    A set a running service still has memory-mapped (see load_weights) cannot be
+    deleted on Windows; it is skipped and removed by a later publish instead.
+    """
+    names = sorted(name for name in os.listdir(sets_dir) if not name.startswith("."))
+    for name in names[:-keep] if keep > 0 else names:
+        if name == current:
+            continue
+        try:
+            shutil.rmtree(os.path.join(sets_dir, name))
+        except OSError as e:
+            logger.warning(f"[WARNING] Could not remove old model set {name} (still in use?): {str(e)}")
+
+
+def cpu_copy(obj: Any) -> Any:
+    """
+    Deep copy of a (nested) state dict with every tensor cloned to the CPU.
+
+    Taken on the training thread so the background writer serializes a frozen
+    snapshot while the optimizers keep updating the live tensors.
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {key: cpu_copy(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(cpu_copy(value) for value in obj)
+    return obj
+
+
+def capture_rng_state() -> Dict[str, Any]:
+    """RNG states of python, numpy, torch (CPU) and, if present, CUDA."""
+    state = {
+        "python": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def restore_rng_state(state: Dict[str, Any]) -> None:
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def load_weights(path: str, device: torch.device) -> Dict[str, torch.Tensor]:
+    """
+    Load a state dict with weights_only=True, memory-mapped where the file allows.
+
+    With mmap the tensors are paged in from the file on first use instead of
+    being read into a private copy up front, and the file stays mapped for as
+    long as they are alive. That is safe because published model files are
+    never rewritten in place: each save publishes a new set (see
+    publish_model_set), which also works on Windows, where a mapped file
+    cannot be replaced.
+    """
+    try:
+        return torch.load(path, map_location=device, weights_only=True, mmap=True)
+    except RuntimeError as e:
+        if "mmap" not in str(e):
+            raise
+        # Legacy (pre-zipfile) checkpoints cannot be memory-mapped
+        return torch.load(path, map_location=device, weights_only=True)
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Load a training checkpoint onto the CPU, or None if it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        # Checkpoints hold RNG states (numpy arrays, python tuples) besides tensors
+        return torch.load(path, map_location="cpu", weights_only=False)
+    except Exception as e:
+        logger.warning(f"[WARNING] Ignoring unreadable training checkpoint {path}: {str(e)}")
+        return None
+
+
+class CheckpointWriter:
+    """
+    Background thread that performs checkpoint writes off the training loop.
+
+    Writes are submitted under a key; if a write for the same key is still
+    waiting when a newer one arrives, only the newer one is performed, so a slow
+    disk never builds up a backlog of stale snapshots. `flush()` blocks until
+    everything submitted so far is on disk.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self._order: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, write: Callable[[], None]) -> None:
+        """Queue `write` (a callable doing the actual I/O) under `key`."""
+        with self._lock:
+            replaced = key in self._pending
+            self._pending[key] = write
+            if not replaced:
+                self._in_flight += 1
+                self._order.put(key)
+
+    def flush(self) -> None:
+        """Wait for all submitted writes; re-raise the first write error, if any."""
+        with self._idle:
+            while self._in_flight:
+                self._idle.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush and stop the writer thread."""
+        try:
+            self.flush()
+        finally:
+            self._order.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            key = self._order.get()
+            if key is None:
+                return
+            with self._lock:
+                write = self._pending.pop(key)
+            try:
+                write()
+            except BaseException as e:
+                logger.error(f"Checkpoint write '{key}' failed: {str(e)}")
+                with self._lock:
+                    self._error = self._error or e
+            finally:
+                with self._idle:
+                    self._in_flight -= 1
+                    self._idle.notify_all()
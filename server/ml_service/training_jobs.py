@@ -0,0 +1,310 @@
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+CANCELLING = "cancelling"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class QueueFullError(RuntimeError):
+    """Raised by TrainingJobManager.submit when max_pending jobs are already waiting."""
+
+
+def _training_worker(job_id: str, params: Dict[str, Any], events, cancel_event) -> None:
+    """
+    Entry point of the training process.
+
+    Runs GANTrainer.train_gan and reports per-epoch losses and the final outcome
+    through `events`. Cancellation is cooperative: the epoch callback stops the
+    loop once `cancel_event` is set.
+    """
+    # Imported here so torch and the models are only loaded in the worker
+    from gan_trainer import GANTrainer
+
+    def on_epoch(epoch: int, losses: Dict[str, float]) -> bool:
+        events.put(("epoch", epoch, losses))
+        return not cancel_event.is_set()
+
+    try:
+        trainer = GANTrainer()
+        history = trainer.train_gan(epoch_callback=on_epoch, **params)
+        history = {name: [float(v) for v in values] for name, values in history.items()}
+        events.put(("cancelled" if cancel_event.is_set() else "completed", history))
+    except Exception as e:
+        events.put(("failed", str(e), traceback.format_exc()))
+
+
+class TrainingJobManager:
+    """
+    Queue of GAN training jobs executed one at a time in a dedicated worker process.
+
+    Submitting returns immediately with a job id; a dispatcher thread starts the
+    next queued job once the previous worker has exited, and relays its per-epoch
+    losses into the job record so the API can report progress without touching
+    the event loop.
+    """
+
+    def __init__(self, cancel_grace_seconds: float = 30.0, max_pending: Optional[int] = None,
+                 max_finished: Optional[int] = 50):
+        """
+        Args:
+            cancel_grace_seconds: How long a running job may take to reach the next
+                epoch boundary after cancellation before its process is terminated.
+            max_pending: Queued (not yet running) jobs beyond which submit() raises
+                QueueFullError; None for no limit.
+            max_finished: Finished jobs (with their metrics and history) kept for
+                the API; older ones are forgotten. None keeps all of them.
+        """
+        if max_finished is not None and max_finished < 1:
+            raise ValueError("max_finished must be at least 1")
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._ctx = mp.get_context("spawn")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._pending: Deque[str] = deque()
+        self._finished: Deque[str] = deque()
+        self._cancel_events: Dict[str, Any] = {}
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._process = None
+        self._shutting_down = False
+        self._completion_callbacks: List[Callable[[Dict[str, Any]], None]] = []
+
+    # ==================== PUBLIC API ====================
+    def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a training job. `params` are passed to GANTrainer.train_gan."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "params": dict(params),
+            "epochs": params.get("epochs"),
+            "epochs_completed": 0,
+            "metrics": [],
+            "history": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "cancel_requested_at": None,
+        }
+
+        with self._condition:
+            if self.max_pending is not None and len(self._pending) >= self.max_pending:
+                raise QueueFullError(f"{len(self._pending)} training jobs are already queued")
+            self._jobs[job_id] = job
+            self._pending.append(job_id)
+            self._ensure_dispatcher()
+            self._condition.notify()
+            logger.info(f"[OK] Training job {job_id} queued (position {len(self._pending)})")
+            return self._snapshot(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, or None if unknown."""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """All known jobs, oldest first."""
+        with self._condition:
+            return [self._snapshot(job) for job in self._jobs.values()]
+
+    def metrics(self, job_id: str, since_epoch: int = 0) -> Optional[List[Dict[str, float]]]:
+        """Per-epoch losses reported after `since_epoch`, or None if the job is unknown."""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return [dict(m) for m in job["metrics"] if m["epoch"] > since_epoch]
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job. Queued jobs are dropped immediately; a running job stops at
+        its next epoch boundary (or is terminated after the grace period).
+        Finished jobs are returned unchanged.
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            if job["status"] == QUEUED:
+                self._pending.remove(job_id)
+                job["status"] = CANCELLED
+                job["finished_at"] = datetime.now().isoformat()
+                self._retire(job_id)
+                logger.info(f"Training job {job_id} cancelled before start")
+            elif job["status"] == RUNNING:
+                job["status"] = CANCELLING
+                job["cancel_requested_at"] = time.monotonic()
+                self._cancel_events[job_id].set()
+                logger.info(f"Cancellation requested for running training job {job_id}")
+
+            return self._snapshot(job)
+
+    def add_completion_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback invoked (in the dispatcher thread) with each successfully
+        completed job. The next job starts only after it returns, so hand slow work
+        off to another thread.
+        """
+        self._completion_callbacks.append(callback)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop dispatching and terminate a running worker (used on service shutdown)."""
+        with self._condition:
+            self._shutting_down = True
+            for event in self._cancel_events.values():
+                event.set()
+            self._condition.notify_all()
+            process = self._process
+
+        if process is not None and process.is_alive():
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning("Terminating training worker on shutdown")
+                process.terminate()
+
+    # ==================== DISPATCHER ====================
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="gan-training-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._shutting_down:
+                    self._condition.wait()
+                if self._shutting_down:
+                    return
+                job_id = self._pending.popleft()
+                job = self._jobs[job_id]
+                job["status"] = RUNNING
+                job["started_at"] = datetime.now().isoformat()
+                cancel_event = self._ctx.Event()
+                self._cancel_events[job_id] = cancel_event
+
+            try:
+                self._run_job(job_id, job["params"], cancel_event)
+            except Exception as e:
+                logger.error(f"Training job {job_id} dispatcher error: {str(e)}")
+                logger.error(traceback.format_exc())
+                self._finish(job_id, FAILED, error=str(e))
+            finally:
+                with self._condition:
+                    self._cancel_events.pop(job_id, None)
+                    self._process = None
+
+    def _run_job(self, job_id: str, params: Dict[str, Any], cancel_event) -> None:
+        events = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_training_worker,
+            args=(job_id, params, events, cancel_event),
+            name=f"gan-training-{job_id[:8]}"
+        )
+        process.start()
+        with self._condition:
+            self._process = process
+        logger.info(f"[OK] Training job {job_id} started in worker process {process.pid}")
+
+        while True:
+            try:
+                event = events.get(timeout=0.5)
+            except queue.Empty:
+                if not process.is_alive():
+                    break
+                if cancel_event.is_set() and self._cancel_overdue(job_id):
+                    logger.warning(f"Training job {job_id} did not stop in time; terminating worker")
+                    process.terminate()
+                    break
+                continue
+
+            kind = event[0]
+            if kind == "epoch":
+                self._record_epoch(job_id, event[1], event[2])
+            elif kind == "completed":
+                self._finish(job_id, COMPLETED, history=event[1])
+                break
+            elif kind == "cancelled":
+                self._finish(job_id, CANCELLED, history=event[1])
+                break
+            elif kind == "failed":
+                logger.error(f"Training job {job_id} failed: {event[1]}\n{event[2]}")
+                self._finish(job_id, FAILED, error=event[1])
+                break
+
+        process.join(timeout=10)
+
+        # Worker died or was terminated without reporting an outcome
+        with self._condition:
+            job = self._jobs.get(job_id)
+        if job is not None and job["status"] not in FINISHED_STATES:
+            if cancel_event.is_set():
+                self._finish(job_id, CANCELLED)
+            else:
+                self._finish(job_id, FAILED, error=f"Training worker exited with code {process.exitcode}")
+
+    def _cancel_overdue(self, job_id: str) -> bool:
+        with self._condition:
+            requested_at = self._jobs[job_id]["cancel_requested_at"]
+        return requested_at is None or time.monotonic() - requested_at > self.cancel_grace_seconds
+
+    def _record_epoch(self, job_id: str, epoch: int, losses: Dict[str, float]) -> None:
+        with self._condition:
+            job = self._jobs[job_id]
+            job["epochs_completed"] = epoch
+            job["metrics"].append({"epoch": epoch, **losses})
+
+    def _finish(self, job_id: str, status: str, history: Optional[Dict] = None,
+                error: Optional[str] = None) -> None:
+        with self._condition:
+            job = self._jobs[job_id]
+            job["status"] = status
+            job["history"] = history
+            job["error"] = error
+            job["finished_at"] = datetime.now().isoformat()
+            snapshot = self._snapshot(job)
+            self._retire(job_id)
+        logger.info(f"[OK] Training job {job_id} finished with status: {status}")
+
+        if status == COMPLETED:
+            for callback in self._completion_callbacks:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.error(f"Training completion callback failed: {str(e)}")
+
+    def _retire(self, job_id: str) -> None:
+        """Record a job as finished and forget the oldest finished jobs beyond max_finished (caller holds the lock)."""
+        self._finished.append(job_id)
+        while self.max_finished is not None and len(self._finished) > self.max_finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    def _snapshot(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a job record for API responses (caller holds the lock)."""
+        snapshot = {k: v for k, v in job.items() if k not in ("params", "metrics", "cancel_requested_at")}
+        snapshot["latest_metrics"] = dict(job["metrics"][-1]) if job["metrics"] else None
+        snapshot["queue_position"] = (
+            list(self._pending).index(job["job_id"]) + 1 if job["status"] == QUEUED else None
+        )
+        return snapshot
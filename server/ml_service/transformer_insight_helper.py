@@ -1,28 +1,43 @@
 """
 Transformer-based Dataset Insight Generator
 
-This module loads a HuggingFace transformer model (google/flan-t5-base) once at startup
-and provides functionality to generate natural-language explanations of dataset patterns
-from statistical summaries produced by the GAN service.
+This module loads a HuggingFace transformer model (google/flan-t5-base) once, on
+first use or during the service's background warm-up (see lifecycle), and provides
+functionality to generate natural-language explanations of dataset patterns
+from statistical summaries produced by the GAN service. Generated insights are
+cached (LRU, optionally persisted to disk) by a hash of the prompt fields, and
+concurrent requests are micro-batched into one `generate` call.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+import lifecycle
+from micro_batching import MicroBatcher
+from executors import insight_executor
+from config import INSIGHT_CACHE_SIZE, INSIGHT_CACHE_PATH, INSIGHT_BATCH_SIZE, INSIGHT_BATCH_WAIT_MS
 
 logger = logging.getLogger(__name__)
 
-# Global model and tokenizer - loaded once at module import
+MODEL_NAME = "google/flan-t5-base"
+
+# Global model and tokenizer - loaded once, lazily
 _model = None
 _tokenizer = None
 _device = None
 
 
-def initialize_model(model_name: str = "google/flan-t5-base") -> None:
+def initialize_model(model_name: str = MODEL_NAME) -> None:
     """
     Initialize the transformer model and tokenizer for insight generation.
-    Called once at module startup to load model into memory.
+    Called once (through the lifecycle component) to load model into memory.
     
     Args:
         model_name: HuggingFace model identifier (default: google/flan-t5-base)
@@ -34,6 +49,10 @@ def initialize_model(model_name: str = "google/flan-t5-base") -> None:
         return
     
     try:
+        # Imported here: torch and transformers dominate import time
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
         logger.info(f"Loading transformer model: {model_name}")
         
         # Determine device
@@ -54,10 +73,8 @@ def initialize_model(model_name: str = "google/flan-t5-base") -> None:
 
 
 def _ensure_model_loaded() -> None:
-    """Ensure the model is loaded before use."""
-    global _model
-    if _model is None:
-        initialize_model()
+    """Ensure the model is loaded before use (waits for a load already in progress)."""
+    insight_model.get()
 
 
 def _format_stats_for_prompt(stats: Dict[str, Any]) -> str:
@@ -154,8 +171,19 @@ def generate_dataset_insight(stats: Dict[str, Any]) -> str:
         return "No dataset statistics provided for analysis."
     
     try:
-        # Create prompt for the transformer
-        prompt = f"""
+        insight = _generate_insights([_build_prompt(stats)])[0]
+        logger.info(f"✓ Generated insight successfully ({len(insight)} characters)")
+        
+        return insight
+    
+    except Exception as e:
+        logger.error(f"Error generating dataset insight: {str(e)}", exc_info=True)
+        raise
+
+
+def _build_prompt(stats: Dict[str, Any]) -> str:
+    """Prompt for one set of statistics (reads only PROMPT_FIELDS)."""
+    return f"""
 You are an AI healthcare data analyst.
 
 The following statistics are from a GAN-generated synthetic healthcare dataset:
@@ -180,38 +208,41 @@ Write a detailed explanation describing:
 Write a professional paragraph (5–7 sentences).
 Do NOT repeat numbers directly unless necessary.
 """
-        
-        logger.debug(f"Generated prompt for insight generation")
-        
-        # Tokenize input
-        inputs = _tokenizer(
-            prompt,
-            return_tensors="pt",
-            max_length=512,
-            truncation=True
-        ).to(_device)
-        
-        # Generate insight using the model
-        with torch.no_grad():
-            outputs = _model.generate(
-                inputs["input_ids"],
-                max_length=300,
-                num_beams=3,
-                early_stopping=True,
-                temperature=0.8,
-                do_sample=True
-            )
-        
-        # Decode the generated text
-        insight = _tokenizer.decode(outputs[0], skip_special_tokens=True).strip()
-        
-        logger.info(f"✓ Generated insight successfully ({len(insight)} characters)")
-        
-        return insight
-    
-    except Exception as e:
-        logger.error(f"Error generating dataset insight: {str(e)}", exc_info=True)
-        raise
+
+
+def _generate_insights(prompts: List[str]) -> List[str]:
+    """
+    Run the transformer on a batch of prompts with one `generate` call.
+
+    Prompts are padded to the longest in the batch; the attention mask keeps
+    padding out of the encoder, so each output depends only on its own prompt.
+    """
+    _ensure_model_loaded()
+    import torch
+
+    # Tokenize input
+    inputs = _tokenizer(
+        prompts,
+        return_tensors="pt",
+        max_length=512,
+        truncation=True,
+        padding=True
+    ).to(_device)
+
+    # Generate insights using the model
+    with torch.no_grad():
+        outputs = _model.generate(
+            input_ids=inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            max_length=300,
+            num_beams=3,
+            early_stopping=True,
+            temperature=0.8,
+            do_sample=True
+        )
+
+    # Decode the generated text
+    return [text.strip() for text in _tokenizer.batch_decode(outputs, skip_special_tokens=True)]
 
 
 def get_model_info() -> Dict[str, Any]:
@@ -224,7 +255,7 @@ def get_model_info() -> Dict[str, Any]:
     _ensure_model_loaded()
     
     return {
-        "model_name": "google/flan-t5-base",
+        "model_name": MODEL_NAME,
         "device": str(_device),
         "model_loaded": _model is not None,
         "tokenizer_loaded": _tokenizer is not None,
@@ -232,8 +263,178 @@ def get_model_info() -> Dict[str, Any]:
     }
 
 
-# Initialize model on module import
-try:
-    initialize_model()
-except Exception as e:
-    logger.warning(f"Model initialization deferred: {str(e)}")
+# ==================== INSIGHT CACHE ====================
+# Stats fields interpolated into the prompt; only these affect the generated insight
+PROMPT_FIELDS = ("age_range", "bmi_range", "diabetes_distribution",
+                 "diabetic_rbs_mean", "non_diabetic_rbs_mean", "hba1c_range")
+# Bump when the prompt template changes, so insights persisted for the old prompt are not served
+PROMPT_VERSION = 1
+
+
+def insight_cache_key(stats: Dict[str, Any]) -> str:
+    """
+    Canonical hash of the statistics that go into the prompt.
+
+    Key order, fields the prompt ignores and absent-vs-None fields do not
+    change the key; the model name and PROMPT_VERSION do.
+    """
+    fields = {field: stats.get(field) for field in PROMPT_FIELDS}
+    canonical = json.dumps({"model": MODEL_NAME, "prompt": PROMPT_VERSION, "stats": fields},
+                           sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class InsightCache:
+    """
+    Bounded LRU cache of generated insights, optionally persisted to a JSON file.
+
+    The file is read once on construction and rewritten atomically after new
+    insights, so cached insights survive restarts. Rewrites happen on a
+    background thread (put() never waits on disk, so it is safe to call on the
+    event loop); back-to-back puts coalesce into one write. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = INSIGHT_CACHE_SIZE, path: Optional[str] = INSIGHT_CACHE_PATH):
+        """
+        Args:
+            max_entries: Insights kept before the least recently used is evicted (0 disables caching).
+            path: JSON file to persist the cache to, or None to keep it in memory only.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._writer: Optional[threading.Thread] = None
+        if path:
+            self._load()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            insight = self._entries.get(key)
+            if insight is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return insight
+
+    def put(self, key: str, insight: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = insight
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self._schedule_save()
+
+    def flush(self) -> None:
+        """Wait until pending changes are written (on shutdown)."""
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                    "max_entries": self.max_entries}
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            # Stored least recently used first
+            for key, insight in entries[-self.max_entries:] if self.max_entries > 0 else []:
+                self._entries[key] = insight
+            logger.info(f"[OK] Loaded {len(self._entries)} cached insights from {self.path}")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[WARNING] Ignoring unreadable insight cache {self.path}: {str(e)}")
+
+    def _schedule_save(self) -> None:
+        """Mark the cache dirty and make sure a writer thread is running (caller holds the lock)."""
+        self._dirty = True
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_pending, name="insight-cache-writer", daemon=True)
+            self._writer.start()
+
+    def _write_pending(self) -> None:
+        # Writes snapshots until no put() arrived during the last write
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._writer = None
+                    return
+                self._dirty = False
+                entries = list(self._entries.items())
+            self._save(entries)
+
+    def _save(self, entries: list) -> None:
+        """Rewrite the cache file with `entries`; persistence is best-effort."""
+        directory = os.path.dirname(self.path) or "."
+        tmp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"[WARNING] Could not persist insight cache to {self.path}: {str(e)}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+insight_cache = InsightCache()
+
+# Prompts from concurrent requests are generated together (see micro_batching)
+insight_batcher = MicroBatcher(_generate_insights, INSIGHT_BATCH_SIZE, INSIGHT_BATCH_WAIT_MS, name="insight",
+                               executor=insight_executor)
+
+# Cache key -> generation in progress, so identical concurrent requests share one
+_in_flight: Dict[str, "asyncio.Future[str]"] = {}
+
+
+async def explain_dataset_insight(stats: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    generate_dataset_insight for async callers: cached and micro-batched.
+
+    A cache hit never touches the transformer (it need not even be loaded yet).
+    A miss joins the next batch, or the pending generation for the same
+    statistics if one is already running.
+
+    Returns:
+        (insight, whether it came from the cache)
+    """
+    if not stats:
+        logger.warning("Empty statistics provided to explain_dataset_insight")
+        return "No dataset statistics provided for analysis.", False
+
+    key = insight_cache_key(stats)
+    insight = insight_cache.get(key)
+    if insight is not None:
+        return insight, True
+
+    pending = _in_flight.get(key)
+    if pending is None:
+        def finish(future: "asyncio.Future[str]") -> None:
+            _in_flight.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                insight_cache.put(key, future.result())
+
+        pending = asyncio.ensure_future(insight_batcher.submit(_build_prompt(stats)))
+        _in_flight[key] = pending
+        pending.add_done_callback(finish)
+
+    # Shielded: one caller disconnecting must not cancel the generation others wait on
+    return await asyncio.shield(pending), False
+
+
+# Loaded on first use or by the background warm-up; /explain-stats is optional,
+# so the service is ready without it
+insight_model = lifecycle.register("insight_model", initialize_model, required=False)